@@ -1,28 +1,45 @@
 from SEC.sec import SEC
+from SEC.Periphery.statement_store import get_statement_store
 
-import pandas as pd
+# Periphery
+from AssetCompare.Periphery.fiscal_calendar import (
+    FiscalCalendar,
+    derive_fourth_quarters,
+    get_fiscal_calendar,
+)
 
-import datetime as dt
+import pandas as pd
 
 
 class Asset:
     def __init__(
-        self, ticker: str, annual: bool = False, quarter: bool = False
+        self,
+        ticker: str,
+        annual: bool = False,
+        quarter: bool = False,
+        store=None,
+        fiscal_calendar: FiscalCalendar = None,
     ) -> None:
         self.ticker = ticker.upper()
+        # Statements are read from the same store 'SEC' writes them to.
+        self.store = store if store is not None else get_statement_store()
+        # Fiscal quarter ends of every ticker, shared unless a calendar is passed.
+        self.fiscal_calendar = (
+            fiscal_calendar if fiscal_calendar is not None else get_fiscal_calendar()
+        )
 
         self.annual = annual
         self.quarter = quarter
 
         if annual:
             self.period = "A"
-            self.filings_path = f"Filings\\Companies\\{self.ticker}\\10-K"
+            self.form_type = "10-K"
         elif quarter:
             self.period = "Q"
-            self.filings_path = f"Filings\\Companies\\{self.ticker}\\10-Q"
+            self.form_type = "10-Q"
 
-        self.annual_data = SEC(self.ticker, "10-K")
-        self.quarter_data = SEC(self.ticker, "10-Q")
+        self.annual_data = SEC(self.ticker, "10-K", store=self.store)
+        self.quarter_data = SEC(self.ticker, "10-Q", store=self.store)
         # Financial Statements
         self.income_statement = pd.DataFrame()
         self.balance_sheet = pd.DataFrame()
@@ -34,19 +51,21 @@ class Asset:
     =====================================================
     """
 
-    def set_income_statement(self):
-        path = f"{self.filings_path}\\{self.ticker}_{self.period}_income_statement.csv"
+    def _read_statement(self, form_type: str, statement: str) -> pd.DataFrame:
+        """
+        Reads a statement from the store, processing the filings first if it was never saved.
+        """
         try:
-            df = pd.read_csv(path)
+            return self.store.read(self.ticker, form_type, statement)
         except FileNotFoundError:
-            if self.quarter:
+            if form_type == "10-Q":
                 self.quarter_data.process_all_statements()
-                df = pd.read_csv(path)
-            elif self.annual:
+            else:
                 self.annual_data.process_all_statements()
-                df = pd.read_csv(path)
-        df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
-        df.set_index("index", inplace=True)
+            return self.store.read(self.ticker, form_type, statement)
+
+    def set_income_statement(self):
+        df = self._read_statement(self.form_type, "income_statement")
 
         print(f"DF: {df}")
         index = self._index_keyword_search("Revenue", 0, df.index.to_list())
@@ -54,28 +73,16 @@ class Asset:
 
         # Add Q4 data.
         if self.quarter:
-            annual_path = f"Filings\\Companies\\{self.ticker}\\10-K\\{self.ticker}_A_income_statement.csv"
-            try:
-                annual_data = pd.read_csv(annual_path)
-            except FileNotFoundError:
-                self.annual_data.process_all_statements()
-                annual_data = pd.read_csv(annual_path)
-            # Fix index names.
-            annual_data.rename(columns={"Unnamed: 0": "index"}, inplace=True)
-            annual_data.set_index("index", inplace=True)
-            merge = pd.concat([df, annual_data], axis=1)
-
-            merge = self._sort_df_by_date(merge)
-
-            fiscal_period = self.get_fiscal_periods()
-
-            print(f"Fiscal: {fiscal_period}")
-
-            if fiscal_period.empty:
-                quarters = self._organize_quarters(annual_data.columns[-1], df.columns)
-                self.write_fiscal_period(quarters)
-                fiscal_period = self.get_fiscal_periods()
-            # print(f"Quarters: {quarters}")
+            annual_data = self._read_statement("10-K", "income_statement")
+            fiscal_year_end = self.fiscal_year_end(annual_data)
+            # Without a fiscal year end the quarters can't be labelled, Q4 is left out.
+            if fiscal_year_end is not None:
+                fourth = derive_fourth_quarters(df, annual_data, fiscal_year_end)
+                fourth = fourth.loc[:, fourth.notna().any() & ~fourth.columns.isin(df.columns)]
+                df = self._sort_df_by_date(pd.concat([df, fourth], axis=1))
+
+        self.income_statement = df
+        return df
 
     """
     =====================================================
@@ -83,52 +90,28 @@ class Asset:
     =====================================================
     """
 
-    def _organize_quarters(self, annual_anchor: str, fiscal_periods: list):
+    def fiscal_year_end(self, annual_data: pd.DataFrame = None) -> str:
         """
-        annual_anchor: str
-            Date of the most recent Q4.
-
-        fiscal_periods: list
-            List of fiscal periods for the company. NOTE: Assumes that dates are in 'str' type.
+        Fiscal year end ('MMDD') from the submissions JSON, stored in the fiscal calendar on first
+        use. When the submissions don't list one, the last 10-K period end is used; None when there
+        is neither.
         """
-        less_than = []
-        annual_anchor_dt = dt.datetime.strptime(annual_anchor, "%Y-%m-%d")
-        annual_anchor_str = annual_anchor.split("-")
-        annual_anchor_str = f"{annual_anchor_str[1]}-{annual_anchor_str[2]}"
-        # Iterate in reverse so recent dates come first in the loop.
-        for f in fiscal_periods[::-1]:
-            f_dt = dt.datetime.strptime(f, "%Y-%m-%d")
-            if f_dt < annual_anchor_dt:
-                year, month, day = f.split("-")
-                f = f"{month}-{day}"
-                less_than.append(f)
-
-        quarters = less_than[:3]
-
-        return {
-            "Q1": quarters[2],
-            "Q2": quarters[1],
-            "Q3": quarters[0],
-            "Q4": annual_anchor_str,
-        }
 
-    def get_fiscal_periods(self):
-        path = f"Filings\\FiscalPeriods\\fiscal_periods.csv"
+        def fetch():
+            fiscal_year_end = self.quarter_data.filing_history.fiscal_year_end
+            if not fiscal_year_end and annual_data is not None and len(annual_data.columns):
+                fiscal_year_end = pd.Timestamp(annual_data.columns[-1]).strftime("%m%d")
+            return fiscal_year_end
 
-        try:
-            df = pd.read_csv(path)
-            df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
-            df.set_index("index", inplace=True)
-            print(f"NEW: {df}")
-            data = df.loc[self.ticker]
-            return data
-        except FileNotFoundError:
-            return pd.DataFrame()
+        return self.fiscal_calendar.fiscal_year_end(self.ticker, fetch)
 
-    def write_fiscal_period(self, quarters: dict):
-        path = f"Filings\\FiscalPeriods\\fiscal_periods.csv"
-        df = pd.DataFrame({f"{self.ticker}": quarters}).T
-        df.to_csv(path)
+    def get_fiscal_periods(self):
+        """
+        Returns:
+            pd.Series: 'fiscal_year_end' and the 'MM-DD' end of 'Q1'-'Q4'.
+        """
+        self.fiscal_year_end()
+        return self.fiscal_calendar.get(self.ticker)
 
     def _sort_df_by_date(self, df: pd.DataFrame):
 
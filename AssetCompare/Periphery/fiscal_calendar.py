@@ -0,0 +1,233 @@
+import os
+import calendar
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.cik_resolver import atomic_write
+from SEC.Periphery.registry import process_wide
+
+
+default_fiscal_periods_path = os.path.join("Filings", "FiscalPeriods", "fiscal_periods.csv")
+
+QUARTERS = ("Q1", "Q2", "Q3", "Q4")
+
+
+"""
+=====================================================
+Fiscal quarters
+=====================================================
+"""
+
+
+def _nearest_month(months, days):
+    # 52/53 week years end on a weekday near the month end, sometimes a few days into the next
+    # month ('0102'). Dates in the first half of a month belong to the month before.
+    early = np.asarray(days) <= 15
+    return np.where(early, (np.asarray(months) - 2) % 12 + 1, months), early
+
+
+def quarter_ends(fiscal_year_end: str) -> dict:
+    """
+    Month and day each fiscal quarter ends on, given the fiscal year end from the submissions JSON.
+
+    Args:
+        fiscal_year_end (str): 'MMDD'. Ex: '0930'
+
+    Returns:
+        dict: Quarter -> 'MM-DD'. Ex: {'Q1': '12-31', 'Q2': '03-31', 'Q3': '06-30', 'Q4': '09-30'}
+    """
+    month, day = int(fiscal_year_end[:2]), int(fiscal_year_end[2:])
+    month = int(_nearest_month([month], [day])[0][0])
+    ends = {}
+    for i, quarter in enumerate(QUARTERS):
+        quarter_month = (month + 3 * (i + 1) - 1) % 12 + 1
+        if quarter == "Q4":
+            ends[quarter] = f"{int(fiscal_year_end[:2]):02d}-{day:02d}"
+        else:
+            last_day = calendar.monthrange(2001, quarter_month)[1]
+            ends[quarter] = f"{quarter_month:02d}-{last_day:02d}"
+    return ends
+
+
+def label_periods(dates, fiscal_year_end: str) -> pd.DataFrame:
+    """
+    Fiscal year and quarter of each period end date, computed for all dates at once.
+
+    The fiscal year is the calendar year the fiscal year ends in, so a September year end labels
+    December 2023 as Q1 of fiscal 2024. Dates that don't fall on a quarter end get quarter 0.
+
+    Args:
+        dates (iterable): Period end dates.
+        fiscal_year_end (str): 'MMDD'. Ex: '0930'
+
+    Returns:
+        pd.DataFrame: 'fiscal_year' and 'fiscal_quarter' (1-4) indexed by the dates.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    end_month, _ = _nearest_month([int(fiscal_year_end[:2])], [int(fiscal_year_end[2:])])
+    end_month = int(end_month[0])
+
+    months, early = _nearest_month(dates.month, dates.day)
+    years = np.where(early & (dates.month == 1), dates.year - 1, dates.year)
+    offset = (months - end_month) % 12
+    quarter = np.where(offset % 3 == 0, (offset // 3 - 1) % 4 + 1, 0)
+    fiscal_year = years + (months > end_month)
+    return pd.DataFrame(
+        {"fiscal_year": fiscal_year, "fiscal_quarter": quarter}, index=dates
+    )
+
+
+def derive_fourth_quarters(
+    quarterly: pd.DataFrame, annual: pd.DataFrame, fiscal_year_end: str
+) -> pd.DataFrame:
+    """
+    Q4 = FY - (Q1 + Q2 + Q3) for every fiscal year with all three quarters filed.
+
+    Works on whole arrays: the quarterly columns are summed into one row per fiscal year, which is
+    subtracted from the aligned annual columns. Only meaningful for flow statements (income, cash
+    flow) whose 10-Q columns hold three month values.
+
+    Args:
+        quarterly (pd.DataFrame): Line items x 10-Q period end dates.
+        annual (pd.DataFrame): Line items x 10-K period end dates.
+        fiscal_year_end (str): 'MMDD'. Ex: '1231'
+
+    Returns:
+        pd.DataFrame: Line items of 'annual' x the fiscal year end dates of the derived quarters.
+    """
+    quarter_labels = label_periods(quarterly.columns, fiscal_year_end)
+    annual_years = label_periods(annual.columns, fiscal_year_end)["fiscal_year"].to_numpy()
+    years = quarter_labels["fiscal_year"].to_numpy()
+    quarters = quarter_labels["fiscal_quarter"].to_numpy()
+
+    # One column per fiscal year and quarter (the last, in case a period was filed twice), and
+    # only the years that have a 10-K.
+    slots = pd.Index(list(zip(years, quarters)))
+    use = (
+        np.isin(quarters, (1, 2, 3))
+        & np.isin(years, annual_years)
+        & ~slots.duplicated(keep="last")
+    )
+
+    # Line items are matched by label and occurrence, so a label repeated in both statements (ex:
+    # two 'Total' rows) lines up in order instead of making the reindex fail.
+    values = _numeric(
+        quarterly.set_axis(_occurrences(quarterly.index)).reindex(_occurrences(annual.index))
+    ).T[use]
+    rows = np.searchsorted(np.unique(annual_years), years[use])
+    year_index = np.searchsorted(np.unique(annual_years), annual_years)
+
+    sums = np.zeros((len(np.unique(annual_years)), len(annual.index)))
+    filed = np.zeros_like(sums)
+    np.add.at(sums, rows, np.nan_to_num(values))
+    np.add.at(filed, rows, ~np.isnan(values))
+
+    fourth = _numeric(annual).T - sums[year_index]
+    fourth[filed[year_index] != 3] = np.nan
+    return pd.DataFrame(fourth.T, index=annual.index, columns=annual.columns)
+
+
+def _occurrences(index: pd.Index) -> pd.MultiIndex:
+    # (label, n) for the n-th row carrying each label.
+    counts = index.to_series().groupby(index, dropna=False, sort=False).cumcount()
+    return pd.MultiIndex.from_arrays([index, counts.to_numpy()])
+
+
+def _numeric(df: pd.DataFrame) -> np.ndarray:
+    try:
+        return df.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        return df.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+"""
+=====================================================
+Fiscal periods table
+=====================================================
+"""
+
+
+class FiscalCalendar:
+    """
+    Fiscal quarter ends of every ticker, kept in one CSV indexed by ticker.
+
+    The table is read once and held in memory; 'upsert' replaces or adds one ticker's row and
+    rewrites the file atomically, so the other tickers are never lost.
+    """
+
+    columns = ["fiscal_year_end", *QUARTERS]
+
+    def __init__(self, path: str = default_fiscal_periods_path) -> None:
+        self.path = path
+        self._table = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> pd.DataFrame:
+        if self._table is None:
+            try:
+                table = pd.read_csv(self.path, index_col=0, dtype=str)
+            except FileNotFoundError:
+                table = pd.DataFrame(columns=self.columns, dtype=str)
+            table.index.name = "ticker"
+            self._table = table.reindex(columns=self.columns).astype(object)
+            # Rows written before the fiscal year end was stored carry it as the Q4 end.
+            missing = self._table["fiscal_year_end"].isna() & self._table["Q4"].notna()
+            self._table.loc[missing, "fiscal_year_end"] = (
+                self._table.loc[missing, "Q4"].str.replace("-", "")
+            )
+        return self._table
+
+    def get(self, ticker: str):
+        """
+        Returns:
+            pd.Series | None: 'fiscal_year_end' and 'Q1'-'Q4' ends of the ticker, None if unknown.
+        """
+        with self._lock:
+            table = self._load()
+            if ticker.upper() not in table.index:
+                return None
+            return table.loc[ticker.upper()].copy()
+
+    def upsert(self, ticker: str, fiscal_year_end: str) -> pd.Series:
+        """
+        Stores the quarter ends derived from 'fiscal_year_end' for 'ticker'.
+
+        Returns:
+            pd.Series: The ticker's row.
+        """
+        row = {"fiscal_year_end": fiscal_year_end, **quarter_ends(fiscal_year_end)}
+        with self._lock:
+            table = self._load()
+            table.loc[ticker.upper()] = pd.Series(row)[self.columns]
+            table.sort_index(inplace=True)
+            atomic_write(self.path, table.to_csv)
+            return table.loc[ticker.upper()].copy()
+
+    def fiscal_year_end(self, ticker: str, fetch) -> str:
+        """
+        Args:
+            ticker (str): The ticker symbol of the company.
+            fetch (callable): Returns the 'MMDD' fiscal year end, or None when it can't be found.
+                Only called for unknown tickers.
+
+        Returns:
+            str | None: 'MMDD', ex: '0930'. None, and nothing stored, when 'fetch' found none.
+        """
+        row = self.get(ticker)
+        if row is not None and isinstance(row["fiscal_year_end"], str):
+            return row["fiscal_year_end"]
+        fiscal_year_end = fetch()
+        if not fiscal_year_end:
+            return None
+        return self.upsert(ticker, fiscal_year_end)["fiscal_year_end"]
+
+
+@process_wide(lambda path: os.path.abspath(path))
+def get_fiscal_calendar(path: str = default_fiscal_periods_path) -> FiscalCalendar:
+    """
+    Fiscal calendar kept in 'path', shared by every Asset so the CSV is read once.
+    """
+    return FiscalCalendar(path)
@@ -0,0 +1,1860 @@
+import os
+import re
+import json
+import time
+import asyncio
+import binascii
+import shutil
+import zipfile
+import tempfile
+import contextlib
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import requests
+
+# Periphery
+from SEC.Periphery.cik_resolver import CIKResolver, build_cik_table
+from SEC.Periphery.statement_merge import StatementAccumulator
+from SEC.Periphery.http_cache import ResponseCache, default_cache_dir
+from SEC.Periphery.edgar import Edgar
+from SEC.Periphery import statement_parser
+from SEC.Periphery.facts_loader import load_facts_frame
+from SEC.Periphery.facts_store import FactsStore
+from SEC.Periphery.frames_store import FramesStore
+from SEC.Periphery import statement_store
+from SEC.Periphery import daily_index
+from SEC.Periphery import submission_archive
+from SEC.Periphery.filing_index import FilingIndex, Report
+from SEC.Periphery.filing_history import FilingHistory
+from SEC.Periphery.statement_matcher import StatementMatcher, TIERS
+from SEC.Periphery.statement_memo import StatementMemo
+from SEC.Periphery.transport import RateLimiter, Transport
+from SEC.Periphery.async_edgar import AsyncTransport, SyncEdgar
+from SEC.Periphery.parse_pipeline import ParsePipeline
+from SEC.Periphery.metrics import Metrics, metrics, print_report
+from SEC.sec import SEC
+from SEC.batch import BatchRunner
+from SEC.watcher import FilingWatcher
+from AssetCompare.Periphery import fiscal_calendar
+from Benchmarks.fixtures import FixtureServer, ReplayTransport, synthesize, write_fixture
+
+
+cik_path = os.path.join("SEC", "Periphery", "Storage", "cik.csv")
+
+
+def _time_calls(func, args_list: list) -> float:
+    start = time.perf_counter()
+    for args in args_list:
+        func(*args)
+    return time.perf_counter() - start
+
+
+def _print_comparison(title: str, baseline: float, candidate: float, calls: int):
+    print(f"[{title}]")
+    print(f"    Baseline:  {baseline:.4f}s  ({baseline / calls * 1e6:,.1f} us/call)")
+    print(f"    Candidate: {candidate:.4f}s  ({candidate / calls * 1e6:,.1f} us/call)")
+    if candidate > 0:
+        print(f"    Speedup:   {baseline / candidate:,.1f}x")
+
+
+"""
+=====================================================
+CIK
+=====================================================
+"""
+
+
+def _read_csv_lookup(path: str, ticker: str):
+    # Mirrors the per-call parse 'Edgar.get_cik' used before the resolver.
+    df = pd.read_csv(path, dtype={"cik": str})
+    df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
+    df.set_index("index", inplace=True)
+    return df.loc[ticker, "cik"]
+
+
+def benchmark_cik_lookup(path: str = cik_path, calls: int = 50):
+    """
+    Compares parsing the cik csv on every lookup against the in-memory 'CIKResolver'.
+
+    Args:
+        path (str): Path to the cik csv.
+        calls (int): Number of lookups timed for each approach.
+    """
+    tickers = pd.read_csv(path, usecols=[0]).iloc[:, 0].sample(
+        calls, replace=True, random_state=0
+    )
+    args_list = [(t,) for t in tickers]
+
+    baseline = _time_calls(lambda t: _read_csv_lookup(path, t), args_list)
+    resolver = CIKResolver(path)
+    # Include the initial load in the timing.
+    candidate = _time_calls(resolver.get_cik, args_list)
+    _print_comparison("CIK lookup", baseline, candidate, calls)
+    return baseline, candidate
+
+
+def _loop_cik_table(ticker_json: dict) -> pd.DataFrame:
+    # Mirrors the cell-by-cell fill '_query_cik_data' used before 'build_cik_table'.
+    cik_df = pd.DataFrame(columns=["cik", "name"])
+    for k, v in ticker_json.items():
+        cik_df.loc[v["ticker"], "cik"] = str(v["cik_str"]).zfill(10)
+        cik_df.loc[v["ticker"], "name"] = v["title"]
+    return cik_df.sort_index()
+
+
+def benchmark_cik_rebuild(path: str = cik_path, rows: int = 2000):
+    """
+    Compares the cell-by-cell rebuild of the cik table against 'build_cik_table'.
+
+    Args:
+        path (str): cik csv used to synthesize a 'company_tickers.json' payload.
+        rows (int): Number of entries in the payload. The loop is quadratic so keep this modest.
+    """
+    df = pd.read_csv(path, dtype={"cik": str}, keep_default_na=False).head(rows)
+    ticker_json = {
+        str(i): {"cik_str": int(cik), "ticker": ticker, "title": name}
+        for i, (ticker, cik, name) in enumerate(df.itertuples(index=False))
+    }
+    baseline = _time_calls(_loop_cik_table, [(ticker_json,)])
+    candidate = _time_calls(build_cik_table, [(ticker_json,)])
+    _print_comparison("CIK rebuild", baseline, candidate, 1)
+    return baseline, candidate
+
+
+"""
+=====================================================
+Statement Merge
+=====================================================
+"""
+
+
+def synthetic_quarterly_history(quarters: int = 40, items: int = 80, seed: int = 0) -> list:
+    """
+    Builds 'quarters' 10-Q style statements, newest first. Each has a 3 month and a year-to-date
+    column, a few line items that come and go between filings and an occasional duplicate row.
+    """
+    rng = np.random.default_rng(seed)
+    ends = pd.date_range(end="2024-06-30", periods=quarters + 1, freq="QE")[::-1]
+    statements = []
+    for q in range(quarters):
+        names = [f"us-gaap_Item{i}" for i in range(items) if rng.random() > 0.05]
+        names.append(f"us-gaap_Extra{q % 7}")
+        if q % 5 == 4:
+            names.append(names[0])
+        values = rng.normal(1000, 250, size=(len(names), 2)).round()
+        statements.append(
+            pd.DataFrame(values, index=names, columns=[ends[q], ends[q + 1]])
+        )
+    return statements
+
+
+def _legacy_merge_quarterly(statement: pd.DataFrame, new_statement: pd.DataFrame):
+    # Mirrors the 10-Q branch of 'SEC.process_statement' before 'StatementAccumulator'.
+    if statement.empty:
+        statement = new_statement.copy()
+        statement.columns = [ts.strftime("%Y-%m-%d") for ts in statement.columns]
+        return statement
+    new_statement = new_statement.copy()
+    new_statement.columns = [ts.strftime("%Y-%m-%d") for ts in new_statement.columns]
+    new_cols = new_statement.columns
+    prev_cols = statement.columns.to_list()
+    if len(new_cols) > 2:
+        new_statement = new_statement.iloc[:, :2]
+        new_cols = new_statement.columns
+    for c in new_cols:
+        if c not in prev_cols:
+            new_slice = new_statement[c].to_frame(name=c)
+            try:
+                statement = pd.concat([statement, new_slice], axis=1)
+            except pd.errors.InvalidIndexError:
+                diff_index = [
+                    item
+                    for item in new_statement.index.to_list()
+                    if item not in statement.index.to_list()
+                ]
+                for p in prev_cols:
+                    for d in diff_index:
+                        statement.loc[d, p] = np.nan
+                new_indexes = set(new_statement.index.to_list())
+                new_statement = new_statement.loc[list(new_indexes)]
+                consolidated_df = new_statement.groupby(new_statement.index).sum()
+                statement = pd.concat([statement, consolidated_df[c]], axis=1)
+    return statement
+
+
+def benchmark_statement_merge(quarters: int = 40, items: int = 80):
+    """
+    Compares the per-column 'pd.concat' merge against 'StatementAccumulator' on a 'quarters' long 10-Q history.
+    """
+    statements = synthetic_quarterly_history(quarters, items)
+
+    def legacy():
+        statement = pd.DataFrame()
+        for new_statement in statements:
+            statement = _legacy_merge_quarterly(statement, new_statement)
+        return statement
+
+    def accumulated():
+        accumulator = StatementAccumulator(max_new_columns=2)
+        for new_statement in statements:
+            accumulator.add(new_statement)
+        return accumulator.result()
+
+    baseline = _time_calls(legacy, [()])
+    candidate = _time_calls(accumulated, [()])
+    _print_comparison(f"Statement merge ({quarters} quarters)", baseline, candidate, 1)
+    return baseline, candidate
+
+
+def check_statement_merge(quarters: int = 20, items: int = 30, seeds: int = 5) -> bool:
+    """
+    Checks that 'StatementAccumulator' gives the frame of the per-column 'pd.concat' merge,
+    duplicate line items included: summed when a filing's line items differ from the collected
+    ones, kept as separate rows when every filing lists the same line items.
+
+    Returns:
+        bool: Whether every history merged the same both ways.
+    """
+
+    def merged(statements):
+        legacy = pd.DataFrame()
+        accumulator = StatementAccumulator(max_new_columns=2)
+        for statement in statements:
+            legacy = _legacy_merge_quarterly(legacy, statement)
+            accumulator.add(statement)
+        return legacy, accumulator.result()
+
+    histories = [synthetic_quarterly_history(quarters, items, seed) for seed in range(seeds)]
+    rng = np.random.default_rng(0)
+    ends = pd.date_range(end="2024-06-30", periods=quarters + 1, freq="QE")[::-1]
+    names = ["us-gaap_Revenue", "Total", "us-gaap_Cost", "Total"]
+    histories.append(
+        [
+            pd.DataFrame(rng.normal(size=(4, 2)).round(2), index=names, columns=ends[q : q + 2])
+            for q in range(quarters)
+        ]
+    )
+    ok = True
+    for statements in histories:
+        legacy, accumulated = merged(statements)
+        ok = ok and legacy.equals(accumulated) and legacy.index.equals(accumulated.index)
+    print(f"[Statement Merge] {'OK' if ok else 'MISMATCH'} ({len(histories)} histories)")
+    return ok
+
+
+"""
+=====================================================
+Statement Parsers
+=====================================================
+"""
+
+
+def _iter_cached_bodies(url_pattern):
+    """Yields (url, body) for responses in the default cache whose URL matches 'url_pattern'."""
+    if not os.path.isdir(default_cache_dir):
+        return
+    for folder in sorted(os.listdir(default_cache_dir)):
+        folder_path = os.path.join(default_cache_dir, folder)
+        for name in sorted(os.listdir(folder_path)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(folder_path, name), "r", encoding="utf-8") as f:
+                url = json.load(f)["url"]
+            if url_pattern.search(url):
+                with open(os.path.join(folder_path, name[: -len(".json")] + ".body"), "rb") as f:
+                    yield url, f.read()
+
+
+# Saved R pages, each '<name>.htm' next to '<name>.json', the output it must parse to.
+default_corpus_dir = os.path.join("Benchmarks", "corpus")
+
+
+def iter_statement_pages(corpus_dir: str = default_corpus_dir):
+    """
+    Yields (name, content) for the R*.htm pages of 'corpus_dir'.
+    """
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(".htm"):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                yield name, f.read()
+
+
+def _golden_path(corpus_dir: str, name: str) -> str:
+    return os.path.join(corpus_dir, os.path.splitext(name)[0] + ".json")
+
+
+def _to_golden(extraction) -> dict:
+    columns, values, dates = extraction
+    return {
+        "columns": list(columns),
+        "dates": [date.strftime("%Y-%m-%d") for date in dates],
+        "values": [[None if np.isnan(v) else float(v) for v in row] for row in values],
+    }
+
+
+def write_parser_goldens(corpus_dir: str = default_corpus_dir):
+    """
+    Saves what the BeautifulSoup engine parses every page of 'corpus_dir' to, as the output both
+    engines are checked against. Run it after adding a page and check the values by hand.
+    """
+    edgar = Edgar({}, parser=statement_parser.BS4)
+    for name, content in iter_statement_pages(corpus_dir):
+        with open(_golden_path(corpus_dir, name), "w") as f:
+            json.dump(_to_golden(edgar.extract_statement(name, content)), f, indent=1)
+
+
+def check_parser_equivalence(corpus_dir: str = default_corpus_dir) -> bool:
+    """
+    Golden check: both parser engines must parse every page of the corpus to its saved output. A
+    corpus without pages, or a page without saved output, fails.
+    """
+    engines = {
+        engine: Edgar({}, parser=engine) for engine in (statement_parser.BS4, statement_parser.LXML)
+    }
+    pages = 0
+    mismatches = []
+    for name, content in iter_statement_pages(corpus_dir):
+        pages += 1
+        try:
+            with open(_golden_path(corpus_dir, name)) as f:
+                expected = json.load(f)
+        except FileNotFoundError:
+            mismatches.append(f"{name} (no golden)")
+            continue
+        for engine, edgar in engines.items():
+            if _to_golden(edgar.extract_statement(name, content)) != expected:
+                mismatches.append(f"{name} ({engine})")
+
+    ok = pages > 0 and not mismatches
+    print(
+        f"[Parser Equivalence] {pages} pages: {'OK' if ok else 'MISMATCH'}"
+        + (f" {mismatches}" if mismatches else "")
+        + ("" if pages else f" (no pages in {corpus_dir})")
+    )
+    return ok
+
+
+def benchmark_statement_parsers(corpus_dir: str = default_corpus_dir, repeat: int = 5):
+    """
+    Times both parser engines over every page of the corpus.
+    """
+    if not check_parser_equivalence(corpus_dir):
+        return None
+    pages = list(iter_statement_pages(corpus_dir))
+
+    bs4_edgar = Edgar({}, parser=statement_parser.BS4)
+    lxml_edgar = Edgar({}, parser=statement_parser.LXML)
+    args_list = pages * repeat
+    baseline = _time_calls(bs4_edgar.extract_statement, args_list)
+    candidate = _time_calls(lxml_edgar.extract_statement, args_list)
+    _print_comparison(
+        f"Statement parsers ({len(pages)} pages)", baseline, candidate, len(args_list)
+    )
+    return baseline, candidate
+
+
+"""
+=====================================================
+Company Facts
+=====================================================
+"""
+
+
+def synthetic_company_facts(concepts: int = 1500, items: int = 120, seed: int = 0) -> dict:
+    """
+    Builds a companyfacts JSON shaped like a large filer's: 'concepts' us-gaap facts plus a few dei
+    facts, each with 'items' reported values.
+    """
+    rng = np.random.default_rng(seed)
+    ends = pd.date_range("1995-03-31", periods=items, freq="QE").strftime("%Y-%m-%d")
+    accns = [f"0000320193-{y % 100:02d}-{q:06d}" for y in range(items) for q in range(1, 4)]
+
+    def fact_items(count):
+        return [
+            {
+                "start": ends[max(i - 1, 0)],
+                "end": ends[i],
+                "val": int(rng.integers(-(10**9), 10**9)),
+                "accn": accns[i],
+                "fy": 1995 + i // 4,
+                "fp": f"Q{i % 4 + 1}",
+                "form": "10-Q" if i % 4 else "10-K",
+                "filed": ends[i],
+                "frame": f"CY{1995 + i // 4}Q{i % 4 + 1}",
+            }
+            for i in range(count)
+        ]
+
+    us_gaap = {
+        f"Concept{c}": {"label": f"Concept {c}", "units": {"USD": fact_items(items)}}
+        for c in range(concepts)
+    }
+    dei = {
+        "EntityCommonStockSharesOutstanding": {
+            "label": "Entity Common Stock, Shares Outstanding",
+            "units": {"shares": fact_items(items)},
+        }
+    }
+    return {"cik": 320193, "entityName": "Synthetic", "facts": {"us-gaap": us_gaap, "dei": dei}}
+
+
+def _legacy_facts_frame(facts: dict):
+    # Mirrors 'Edgar.facts_DF' before 'load_facts_frame'.
+    us_gaap_data = facts["facts"]["us-gaap"]
+    df_data = []
+    for fact, details in us_gaap_data.items():
+        for unit in details["units"]:
+            for item in details["units"][unit]:
+                row = item.copy()
+                row["fact"] = fact
+                df_data.append(row)
+    df = pd.DataFrame(df_data)
+    df["end"] = pd.to_datetime(df["end"])
+    df["start"] = pd.to_datetime(df["start"])
+    df = df.drop_duplicates(subset=["fact", "end", "val"])
+    df.set_index("end", inplace=True)
+    labels_dict = {fact: details["label"] for fact, details in us_gaap_data.items()}
+    return df, labels_dict
+
+
+def _columnar_facts_frame(facts: dict):
+    df, labels_dict = load_facts_frame(facts, ("us-gaap",))
+    df = df.drop_duplicates(subset=["fact", "end", "val"])
+    df.set_index("end", inplace=True)
+    return df, labels_dict
+
+
+def _measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def check_facts_frame(ticker: str = "AAPL", concepts: int = 50, items: int = 20) -> bool:
+    """
+    Checks that 'Edgar.facts_DF' has the columns and values of the row-dict frame it replaced, with
+    string columns as categoricals, and that callers get a copy they can change.
+    """
+    facts = synthetic_company_facts(concepts, items)
+    legacy, legacy_labels = _legacy_facts_frame(facts)
+    edgar = Edgar({"User-Agent": "benchmark"}, facts_store=FactsStore())
+    edgar.facts_store.get(edgar.get_cik(ticker), lambda: facts)
+    df, labels = edgar.facts_DF(ticker)
+    strings = df.astype(
+        {c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}
+    )
+    ok = list(df.columns) == list(legacy.columns) and labels == legacy_labels
+    ok = ok and strings.index.equals(legacy.index)
+    ok = ok and all(
+        np.array_equal(strings[c].to_numpy(dtype=object), legacy[c].to_numpy(dtype=object))
+        for c in legacy.columns
+        if c != "start"
+    )
+    ok = ok and np.array_equal(df["start"].to_numpy(), legacy["start"].to_numpy())
+    df.drop(columns="val", inplace=True)
+    ok = ok and "val" in edgar.facts_DF(ticker)[0].columns
+    print(f"[Facts Frame] {'OK' if ok else 'MISMATCH'} ({len(legacy):,} rows)")
+    return ok
+
+
+def benchmark_facts_loader(concepts: int = 1500, items: int = 120):
+    """
+    Compares time and peak memory of the row-dict facts loader against 'load_facts_frame'.
+    """
+    facts = synthetic_company_facts(concepts, items)
+    (legacy_df, _), baseline, baseline_peak = _measure(_legacy_facts_frame, facts)
+    (columnar_df, _), candidate, candidate_peak = _measure(_columnar_facts_frame, facts)
+    _print_comparison(f"Facts loader ({len(legacy_df):,} rows)", baseline, candidate, 1)
+    print(f"    Peak memory: {baseline_peak / 1e6:,.1f} MB -> {candidate_peak / 1e6:,.1f} MB")
+    print(
+        f"    Frame memory: {legacy_df.memory_usage(deep=True).sum() / 1e6:,.1f} MB -> "
+        f"{columnar_df.memory_usage(deep=True).sum() / 1e6:,.1f} MB"
+    )
+    return baseline, candidate
+
+
+"""
+=====================================================
+Frames
+=====================================================
+"""
+
+
+def synthetic_companyfacts_zip(path: str, companies: int = 50, concepts: int = 200, items: int = 40):
+    """
+    Writes a small 'companyfacts.zip' with one CIK##########.json member per synthetic company.
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for c in range(companies):
+            facts = synthetic_company_facts(concepts, items, seed=c)
+            facts["cik"] = 1000 + c
+            facts["entityName"] = f"Synthetic {c}"
+            archive.writestr(f"CIK{facts['cik']:010d}.json", json.dumps(facts))
+    return path
+
+
+def _per_company_cross_section(archive_path: str, concept: str, period: str) -> pd.DataFrame:
+    # What a peer comparison costs without the store: one companyfacts JSON per company.
+    rows = []
+    with zipfile.ZipFile(archive_path) as archive:
+        for name in archive.namelist():
+            facts = json.loads(archive.read(name))
+            df = FramesStore.company_frame(facts)
+            rows.append(df[(df["fact"] == concept) & (df["frame"] == period)])
+    return pd.concat(rows, ignore_index=True).set_index("cik").sort_index()
+
+
+def check_frames_store(companies: int = 5) -> bool:
+    """
+    Ingests a small synthetic zip and checks a cross section against the per-company answer, as
+    stored, once compacted and served by 'Edgar.cross_section'.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        archive_path = synthetic_companyfacts_zip(
+            os.path.join(directory, "companyfacts.zip"), companies, concepts=20, items=12
+        )
+        store = FramesStore(os.path.join(directory, "frames"))
+        summary = store.ingest(archive_path, flush_rows=500)
+        expected = _per_company_cross_section(archive_path, "Concept3", "CY1996Q2")
+        actual = store.cross_section("Concept3", "CY1996Q2", unit="USD")
+        same = (
+            summary["companies"] == companies
+            and store.concepts("CY1996Q2") == sorted(f"Concept{c}" for c in range(20))
+            and len(store.periods()) == 12
+            and actual.index.tolist() == expected.index.tolist()
+            and np.array_equal(actual["val"].to_numpy(), expected["val"].to_numpy())
+            and actual["entity"].tolist() == expected["entity"].tolist()
+        )
+        path = store._partition("CY1996Q2")
+        several = len(os.listdir(path)) > 1
+        store.compact()
+        edgar = Edgar({"User-Agent": "benchmark"}, frames_store=store)
+        compacted = edgar.cross_section("Concept3", "CY1996Q2", unit="USD")
+        same = same and several and len(os.listdir(path)) == 1
+        same = same and compacted.equals(actual)
+        print(f"[Frames Store] {'OK' if same else 'MISMATCH'} ({summary})")
+        return same
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def benchmark_frames_store(companies: int = 50, concepts: int = 200, items: int = 40, calls: int = 5):
+    """
+    Compares cross-sectional lookups served from the frames store against reading every company's
+    facts. The per-company side excludes the network, so with 'get_facts' it is only slower.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        archive_path = synthetic_companyfacts_zip(
+            os.path.join(directory, "companyfacts.zip"), companies, concepts, items
+        )
+        store = FramesStore(os.path.join(directory, "frames"))
+        start = time.perf_counter()
+        summary = store.ingest(archive_path)
+        print(f"[Frames Store] Ingested {summary} in {time.perf_counter() - start:.2f}s")
+
+        queries = [
+            (f"Concept{c % concepts}", f"CY{1995 + c % (items // 4)}Q{c % 4 + 1}")
+            for c in range(calls)
+        ]
+        baseline = _time_calls(
+            _per_company_cross_section, [(archive_path,) + query for query in queries]
+        )
+        candidate = _time_calls(store.cross_section, queries)
+        _print_comparison(f"Cross section ({companies} companies)", baseline, candidate, calls)
+        return baseline, candidate
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+"""
+=====================================================
+Statement Store
+=====================================================
+"""
+
+
+def synthetic_statement(items: int = 60, periods: int = 40, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a line items x quarter ends statement with some missing values and a repeated line item.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.integers(-(10**9), 10**9, size=(items, periods)).astype(float)
+    values[rng.random((items, periods)) < 0.2] = np.nan
+    names = [f"Line Item {i}" for i in range(items)]
+    names[-1] = names[0]
+    return pd.DataFrame(
+        values, index=names, columns=pd.date_range("2014-03-31", periods=periods, freq="QE")
+    )
+
+
+def _legacy_read_statement(directory: str, ticker: str, statement: str) -> pd.DataFrame:
+    # Mirrors 'Asset.set_income_statement' before the statement store.
+    df = pd.read_csv(os.path.join(directory, ticker, "10-Q", f"{ticker}_Q_{statement}.csv"))
+    df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
+    df.set_index("index", inplace=True)
+    df.columns = pd.to_datetime(df.columns)
+    return df.reindex(sorted(df.columns), axis=1)
+
+
+def check_statement_store() -> bool:
+    """
+    Round trips a statement through every backend, appends new periods and migrates a csv tree.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        statement = synthetic_statement()
+        ok = True
+        for format in statement_store.STORES:
+            store = statement_store.STORES[format](os.path.join(directory, format))
+            store.write("TEST", "10-Q", "income_statement", statement.iloc[:, :30])
+            store.append("TEST", "10-Q", "income_statement", statement.iloc[:, 25:])
+            store.append("TEST", "10-Q", "income_statement", statement.iloc[:, 25:])
+            read = store.read("TEST", "10-Q", "income_statement")
+            same = read.index.tolist() == statement.index.tolist() and np.array_equal(
+                read.to_numpy(), statement.to_numpy(), equal_nan=True
+            )
+            same = same and store.latest_period("TEST", "10-Q", "income_statement") == statement.columns[-1]
+            print(f"[Statement Store] {format}: {'OK' if same else 'MISMATCH'}")
+            ok = ok and same
+
+        csv_dir = os.path.join(directory, statement_store.CSV)
+        target = statement_store.ParquetStatementStore(os.path.join(directory, "migrated"))
+        summary = statement_store.migrate_csv_tree(target, csv_dir)
+        migrated = target.read("TEST", "10-Q", "income_statement")
+        same = summary["migrated"] == 1 and np.array_equal(
+            migrated.to_numpy(), statement.to_numpy(), equal_nan=True
+        )
+        print(f"[Statement Store] migration: {'OK' if same else 'MISMATCH'} ({summary})")
+        ok = ok and same
+
+        # A csv tree nobody migrated is still read, and carried over by the first append.
+        store = statement_store.ParquetStatementStore(csv_dir)
+        same = np.array_equal(
+            store.read("TEST", "10-Q", "income_statement").to_numpy(),
+            statement.to_numpy(),
+            equal_nan=True,
+        )
+        extra = statement.iloc[:, -1:].copy()
+        extra.columns = [statement.columns[-1] + pd.DateOffset(months=3)]
+        store.append("TEST", "10-Q", "income_statement", extra)
+        appended = store.read("TEST", "10-Q", "income_statement")
+        same = same and list(appended.columns) == list(statement.columns) + list(extra.columns)
+        print(f"[Statement Store] csv fallback: {'OK' if same else 'MISMATCH'}")
+        ok = ok and same
+
+        # A write that dies after adding its part, before removing the parts it replaces, leaves the
+        # new statement alone readable. The next append removes the old parts.
+        store = statement_store.ParquetStatementStore(os.path.join(directory, "crash"))
+        key = ("TEST", "10-Q", "income_statement")
+        store.write(*key, statement.iloc[:, :30])
+        store.append(*key, statement.iloc[:, 25:])
+
+        def die(folder):
+            raise _Killed()
+
+        store._remove_superseded = die
+        try:
+            store.write(*key, statement.iloc[:, :10])
+        except _Killed:
+            pass
+        del store._remove_superseded
+        same = store.read(*key).equals(statement.iloc[:, :10])
+        store.append(*key, statement.iloc[:, 10:])
+        same = same and len(os.listdir(store.statement_path(*key))) == 2
+        same = same and np.array_equal(
+            store.read(*key).to_numpy(), statement.to_numpy(), equal_nan=True
+        )
+        print(f"[Statement Store] interrupted write: {'OK' if same else 'MISMATCH'}")
+        return ok and same
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def benchmark_statement_store(tickers: int = 300, items: int = 60, periods: int = 40):
+    """
+    Compares opening every statement of 'tickers' companies from the csv tree against the columnar
+    backends, the work an 'Asset' comparison does per ticker.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        csv_dir = os.path.join(directory, "csv")
+        csv_store = statement_store.CSVStatementStore(csv_dir)
+        names = [f"T{t:04d}" for t in range(tickers)]
+        for t, ticker in enumerate(names):
+            for statement in statement_store.STATEMENTS:
+                csv_store.write(ticker, "10-Q", statement, synthetic_statement(items, periods, seed=t))
+        calls = [(csv_dir, ticker, statement) for ticker in names for statement in statement_store.STATEMENTS]
+        baseline = _time_calls(_legacy_read_statement, calls)
+
+        for format in (statement_store.PARQUET, statement_store.FEATHER):
+            store = statement_store.STORES[format](os.path.join(directory, format))
+            statement_store.migrate_csv_tree(store, csv_dir)
+            candidate = _time_calls(
+                store.read, [(ticker, "10-Q", statement) for _, ticker, statement in calls]
+            )
+            _print_comparison(f"Statement load, {format} ({tickers} tickers)", baseline, candidate, len(calls))
+            size = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(os.path.join(directory, format))
+                for name in files
+            )
+            csv_size = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, files in os.walk(csv_dir)
+                for name in files
+            )
+            print(f"    Size: {csv_size / 1e6:,.1f} MB -> {size / 1e6:,.1f} MB")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+"""
+=====================================================
+Daily Index
+=====================================================
+"""
+
+# Recorded shape of EDGAR's daily indexes, trimmed to a few filings.
+recorded_master_index = """Description:           Daily Index of EDGAR Dissemination Feed by Company Name
+Last Data Received:    Aug 1, 2024
+Comments:              webmaster@sec.gov
+Anonymous FTP:         ftp://ftp.sec.gov/edgar/
+
+CIK|Company Name|Form Type|Date Filed|Filename
+--------------------------------------------------------------------------------
+320193|Apple Inc.|10-Q|20240802|edgar/data/320193/0000320193-24-000081.txt
+320193|Apple Inc.|4|20240802|edgar/data/320193/0000320193-24-000082.txt
+320193|Apple Inc.|10-K/A|20240802|edgar/data/320193/0000320193-24-000083.txt
+789019|MICROSOFT CORP|10-K|20240802|edgar/data/789019/0000950170-24-087843.txt
+1652044|Alphabet Inc.|10-Q|20240802|edgar/data/1652044/0001652044-24-000079.txt
+9999999|Unlisted Co|10-Q|20240802|edgar/data/9999999/0009999999-24-000001.txt
+"""
+
+recorded_form_index = """Description:           Daily Index of EDGAR Dissemination Feed by Form Type
+Last Data Received:    Aug 1, 2024
+Comments:              webmaster@sec.gov
+Anonymous FTP:         ftp://ftp.sec.gov/edgar/
+
+Form Type   Company Name                                                  CIK         Date Filed  File Name
+---------------------------------------------------------------------------------------------------------------------------------------------
+10-K        MICROSOFT CORP                                                789019      20240802    edgar/data/789019/0000950170-24-087843.txt
+10-K/A      Apple Inc.                                                    320193      20240802    edgar/data/320193/0000320193-24-000083.txt
+10-Q        Alphabet Inc.                                                 1652044     20240802    edgar/data/1652044/0001652044-24-000079.txt
+10-Q        Apple Inc.                                                    320193      20240802    edgar/data/320193/0000320193-24-000081.txt
+10-Q        Unlisted Co                                                   9999999     20240802    edgar/data/9999999/0009999999-24-000001.txt
+4           Apple Inc.                                                    320193      20240802    edgar/data/320193/0000320193-24-000082.txt
+"""
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve_directory(directory: str):
+    handler = partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_filing_watcher() -> bool:
+    """
+    Serves recorded daily indexes locally and checks which jobs the watcher finds in them, and that
+    amendments are only picked up when listed, as jobs of their base form.
+    """
+    directory = tempfile.mkdtemp()
+    date = dt.date(2024, 8, 2)
+    for kind, content in (
+        (daily_index.MASTER, recorded_master_index),
+        (daily_index.FORM, recorded_form_index),
+    ):
+        path = os.path.join(directory, *daily_index.index_path(date, kind).split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="latin-1") as f:
+            f.write(content)
+    server = _serve_directory(directory)
+    try:
+        expected = {
+            "AAPL|10-Q": ["0000320193-24-000081"],
+            "MSFT|10-K": ["0000950170-24-087843"],
+            "GOOG|10-Q": ["0001652044-24-000079"],
+        }
+        ok = True
+        for kind in daily_index.INDEX_KINDS:
+            edgar = Edgar(
+                {"User-Agent": "benchmark"}, cache=ResponseCache(os.path.join(directory, "cache"))
+            )
+            edgar.daily_index_url = f"http://127.0.0.1:{server.server_port}"
+            watcher = FilingWatcher(
+                kind=kind, edgar=edgar, state_path=os.path.join(directory, kind, "state.json")
+            )
+            # The days around the recorded one have no index, like weekends.
+            jobs = watcher.poll(until=date + dt.timedelta(days=2), run=False)["jobs"]
+            same = jobs == expected
+            watchlist = FilingWatcher(
+                tickers=["GOOGL"], kind=kind, edgar=edgar, state_path=os.path.join(directory, "w.json")
+            )
+            same = same and watchlist.scan(until=date)[0] == {
+                ("GOOGL", "10-Q"): ["0001652044-24-000079"]
+            }
+            # Listed amendments re-scrape their base form.
+            amended = FilingWatcher(
+                form_types=["10-K", "10-K/A"],
+                tickers=["AAPL"],
+                kind=kind,
+                edgar=edgar,
+                state_path=os.path.join(directory, "a.json"),
+            )
+            same = same and amended.scan(until=date)[0] == {
+                ("AAPL", "10-K"): ["0000320193-24-000083"]
+            }
+            print(f"[Filing Watcher] {kind}: {'OK' if same else f'MISMATCH {jobs}'}")
+            ok = ok and same
+        return ok
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class _CountingTransport(ReplayTransport):
+    """Replay transport remembering (url, conditional headers, status) of every request."""
+
+    def __init__(self, server: FixtureServer) -> None:
+        super().__init__(server)
+        self.requests = []
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        response = super().get(url, headers=headers, stream=stream)
+        self.requests.append((url, headers or {}, response.status_code))
+        return response
+
+
+def check_response_cache() -> bool:
+    """
+    Serves EDGAR responses from a local fixture server and checks the response cache policy:
+    immutable Archives hits, TTL expiry answered by a conditional GET and a 304, URLs that are
+    never cached and least recently used eviction at 'max_bytes'.
+
+    Returns:
+        bool: Whether every case behaved as expected.
+    """
+    directory = tempfile.mkdtemp()
+    archive = "https://www.sec.gov/Archives/edgar/data/0000320193/000032019324000081"
+    pages = [f"{archive}/R{i}.htm" for i in (2, 4, 8)]
+    submissions = "https://data.sec.gov/submissions/CIK0000320193.json"
+    tickers = "https://www.sec.gov/files/company_tickers.json"
+    index = "https://www.sec.gov/Archives/edgar/daily-index/2024/QTR3/master.20240802.idx"
+    fixtures = os.path.join(directory, "fixtures")
+    for url in pages:
+        write_fixture(fixtures, url, url.encode() * 40)
+    write_fixture(fixtures, submissions, b'{"cik": "320193"}')
+    write_fixture(fixtures, tickers, b'{"0": {"ticker": "AAPL"}}')
+    write_fixture(fixtures, index, recorded_master_index.encode("latin-1"))
+
+    results = {}
+    with FixtureServer(fixtures) as server:
+
+        def new_edgar(**cache_args):
+            transport = _CountingTransport(server)
+            cache = ResponseCache(tempfile.mkdtemp(dir=directory), **cache_args)
+            return Edgar({"User-Agent": "benchmark"}, cache=cache, transport=transport)
+
+        try:
+            # Filed documents are requested once and then always served from disk.
+            edgar = new_edgar()
+            first, second = edgar._get(pages[0]), edgar._get(pages[0])
+            results["immutable hit"] = (
+                first == second == pages[0].encode() * 40 and len(edgar.transport.requests) == 1
+            )
+
+            # An expired entry is checked with If-Modified-Since, the 304 refreshes it.
+            edgar = new_edgar(ttl=0.05)
+            body = edgar._get(submissions)
+            time.sleep(0.1)
+            expired = edgar.cache.get(submissions) is None
+            revalidated = edgar._get(submissions)
+            (_, _, status), (_, conditional, status_304) = edgar.transport.requests
+            _, meta = edgar.cache.lookup(submissions)
+            results["ttl revalidation"] = (
+                expired
+                and revalidated == body
+                and status == 200
+                and status_304 == 304
+                and "If-Modified-Since" in conditional
+                and meta["stored"] > time.time() - 1
+                and meta["expires"] > time.time()
+            )
+
+            # The ticker table and daily indexes are fetched every time, nothing is stored.
+            edgar = new_edgar()
+            for url in (tickers, index, tickers, index):
+                edgar._get(url)
+            results["never cached"] = (
+                len(edgar.transport.requests) == 4
+                and edgar.cache.lookup(tickers) == (None, None)
+                and edgar.cache.lookup(index) == (None, None)
+                and edgar.cache.size() == 0
+            )
+
+            # Room for two pages: using the first again makes the second the one evicted.
+            size = len(pages[0].encode() * 40)
+            edgar = new_edgar(max_bytes=int(size * 2.5))
+            edgar._get(pages[0])
+            time.sleep(0.02)
+            edgar._get(pages[1])
+            time.sleep(0.02)
+            edgar._get(pages[0])
+            time.sleep(0.02)
+            edgar._get(pages[2])
+            kept = [edgar.cache.lookup(url)[0] is not None for url in pages]
+            results["lru eviction"] = (
+                kept == [True, False, True] and edgar.cache.size() <= edgar.cache.max_bytes
+            )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    print("[Response Cache]")
+    for case, ok in results.items():
+        print(f"    {case}: {'OK' if ok else 'FAILED'}")
+    return all(results.values())
+
+
+"""
+=====================================================
+Batch
+=====================================================
+"""
+
+
+class _Killed(BaseException):
+    """Stands in for the process dying. Not an 'Exception', so no job error handling catches it."""
+
+
+class _KillingTransport(ReplayTransport):
+    """Replay transport that raises '_Killed' for every request after the first 'after'."""
+
+    def __init__(self, server: FixtureServer, after: int = None) -> None:
+        super().__init__(server)
+        self.after = after
+        self.requests = 0
+        self._count_lock = threading.Lock()
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        with self._count_lock:
+            self.requests += 1
+            killed = self.after is not None and self.requests > self.after
+        if killed:
+            raise _Killed(url)
+        return super().get(url, headers=headers, stream=stream)
+
+
+def _stored_statements(store, jobs) -> dict:
+    return {
+        (ticker, form_type, kind): store.read(ticker, form_type, kind)
+        for ticker, form_type in jobs
+        for kind in SEC.statement_kinds
+    }
+
+
+def check_batch_runner(tickers=("SPIR", "ETSY"), quarters: int = 8, items: int = 20) -> bool:
+    """
+    Kills a batch run of synthetic filers partway, starts it again with the same checkpoint, store
+    and response cache, and checks that only the unfinished jobs ran again and that the statements
+    equal those of an uninterrupted run.
+    """
+    directory = tempfile.mkdtemp()
+    headers = {"User-Agent": "benchmark"}
+    jobs = [(ticker, form_type) for ticker in tickers for form_type in ("10-Q", "10-K")]
+    try:
+        fixtures = os.path.join(directory, "fixtures")
+        resolver = Edgar(headers, cache=ResponseCache(os.path.join(directory, "cik")))
+        for ticker in tickers:
+            synthesize(fixtures, ticker, resolver.get_cik(ticker), quarters, items, concepts=10)
+
+        with FixtureServer(fixtures) as server:
+
+            def new_runner(name: str, after: int = None):
+                folder = os.path.join(directory, name)
+                transport = _KillingTransport(server, after)
+                edgar = Edgar(
+                    headers,
+                    cache=ResponseCache(os.path.join(folder, "cache")),
+                    transport=transport,
+                    memo=StatementMemo("benchmark", None, 0),
+                )
+                runner = BatchRunner(
+                    [],
+                    jobs=jobs,
+                    workers=1,
+                    depth=quarters,
+                    checkpoint_path=os.path.join(folder, "checkpoint.json"),
+                    edgar=edgar,
+                    store=statement_store.ParquetStatementStore(os.path.join(folder, "store")),
+                )
+                return runner, transport
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                clean, transport = new_runner("clean")
+                clean.run()
+                expected = _stored_statements(clean.store, jobs)
+                # Dies in the middle of the jobs, after half of the requests of a full run.
+                killed, _ = new_runner("resumed", after=transport.requests // 2)
+                try:
+                    killed.run()
+                except _Killed:
+                    pass
+                done = [k for k, job in killed.progress.items() if job.get("status") == "done"]
+                resumed, _ = new_runner("resumed")
+                pending = resumed.pending_jobs()
+                summary = resumed.run()
+            actual = _stored_statements(resumed.store, jobs)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    ok = 0 < len(done) < len(jobs)
+    ok = ok and len(pending) == len(jobs) - len(done) and summary["skipped"] == len(done)
+    ok = ok and summary["succeeded"] == len(pending)
+    ok = ok and all(expected[key].equals(actual[key]) for key in expected)
+    print(
+        f"[Batch Runner] {'OK' if ok else 'MISMATCH'} ({len(done)} of {len(jobs)} jobs done when "
+        f"killed, {summary['succeeded']} resumed)"
+    )
+    return ok
+
+
+def check_parallel_merge(
+    ticker: str = "SPIR", quarters: int = 8, items: int = 20, workers: int = 4
+) -> bool:
+    """
+    Processes a synthetic filer served with latency once serially and once with 'workers' threads,
+    each from an empty cache, and checks that the stored statements and the order 'on_accession'
+    reports the filings in are the same.
+    """
+    directory = tempfile.mkdtemp()
+    headers = {"User-Agent": "benchmark"}
+    try:
+        fixtures = os.path.join(directory, "fixtures")
+        resolver = Edgar(headers, cache=ResponseCache(os.path.join(directory, "cik")))
+        synthesize(fixtures, ticker, resolver.get_cik(ticker), quarters, items, concepts=10)
+
+        runs = {}
+        with FixtureServer(fixtures, latency=0.01) as server:
+            for count in (1, workers):
+                folder = os.path.join(directory, str(count))
+                edgar = Edgar(
+                    headers,
+                    cache=ResponseCache(os.path.join(folder, "cache")),
+                    transport=ReplayTransport(server),
+                    memo=StatementMemo("benchmark", None, 0),
+                )
+                store = statement_store.ParquetStatementStore(os.path.join(folder, "store"))
+                merged = []
+                with contextlib.redirect_stdout(io.StringIO()):
+                    SEC(ticker, "10-Q", store=store, edgar=edgar).process_all_statements(
+                        depth=quarters, workers=count, on_accession=merged.append
+                    )
+                runs[count] = (_stored_statements(store, [(ticker, "10-Q")]), merged)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    (serial, serial_order), (parallel, parallel_order) = runs[1], runs[workers]
+    ok = len(serial_order) > 1 and serial_order == parallel_order
+    ok = ok and all(serial[key].equals(parallel[key]) for key in serial)
+    print(f"[Parallel Merge] {'OK' if ok else 'MISMATCH'} ({workers} workers vs serial)")
+    return ok
+
+
+def check_incremental_update(ticker: str = "SPIR", quarters: int = 8, items: int = 20) -> bool:
+    """
+    Processes a synthetic filer, then updates it with nothing new filed and checks that the update
+    costs one conditional request for the submissions JSON and fetches no statement.
+    """
+    directory = tempfile.mkdtemp()
+    headers = {"User-Agent": "benchmark"}
+    try:
+        fixtures = os.path.join(directory, "fixtures")
+        resolver = Edgar(headers, cache=ResponseCache(os.path.join(directory, "cik")))
+        synthesize(fixtures, ticker, resolver.get_cik(ticker), quarters, items, concepts=10)
+
+        with FixtureServer(fixtures) as server:
+            transport = _CountingTransport(server)
+            edgar = Edgar(
+                headers,
+                cache=ResponseCache(os.path.join(directory, "cache")),
+                transport=transport,
+                memo=StatementMemo("benchmark", None, 0),
+            )
+            store = statement_store.ParquetStatementStore(os.path.join(directory, "store"))
+            sec = SEC(ticker, "10-Q", store=store, edgar=edgar)
+            with contextlib.redirect_stdout(io.StringIO()):
+                sec.process_all_statements(depth=quarters)
+                transport.requests.clear()
+                processed = sec.update_statements()
+            made = list(transport.requests)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    ok = processed == [] and len(made) == 1
+    if ok:
+        url, conditional, status = made[0]
+        ok = "/submissions/" in url and status == 304
+        ok = ok and ("If-None-Match" in conditional or "If-Modified-Since" in conditional)
+    print(f"[Incremental Update] {'OK' if ok else f'MISMATCH {made}'} (up to date: 1 request)")
+    return ok
+
+
+def check_filing_history_refresh(readers: int = 4, refreshes: int = 300) -> bool:
+    """
+    Refreshes a filing history over and over, alternating between two submissions JSONs, while
+    other threads query it, and checks that every query saw one complete history.
+    """
+
+    def submissions(count: int) -> dict:
+        dates = pd.date_range(end="2024-06-30", periods=count, freq="QE")[::-1]
+        recent = {
+            "accessionNumber": [f"0000000001-24-{i:06d}" for i in range(count)],
+            "form": ["10-K" if i % 4 == 0 else "10-Q" for i in range(count)],
+            "reportDate": list(dates.strftime("%Y-%m-%d")),
+            "filingDate": list((dates + pd.Timedelta(days=40)).strftime("%Y-%m-%d")),
+        }
+        return {"filings": {"recent": recent, "files": []}}
+
+    versions = [submissions(8), submissions(12)]
+    downloads = []
+
+    def get_json(url: str, revalidate: bool = False) -> dict:
+        downloads.append(url)
+        return versions[len(downloads) % 2]
+
+    history = FilingHistory(get_json, "0000000001")
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                # 2 10-Ks among 8 filings, 3 among 12; 6 or 9 10-Qs.
+                counts = (len(history.get("10-K")), len(history.get("10-Q")))
+                if counts[0] not in (2, 3) or counts[1] not in (6, 9):
+                    errors.append(counts)
+            except Exception as e:
+                errors.append(repr(e))
+
+    threads = [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for _ in range(refreshes):
+        history.refresh()
+        history.filings
+    done.set()
+    for thread in threads:
+        thread.join()
+    ok = not errors
+    print(f"[Filing History] {'OK' if ok else f'MISMATCH {errors[:3]}'} ({refreshes} refreshes)")
+    return ok
+
+
+"""
+=====================================================
+Submission Archive
+=====================================================
+"""
+
+
+def synthetic_submission_lines(documents: dict, filler_mb: int = 0, binary: bytes = b""):
+    """
+    Yields the lines of a complete submission '.txt' holding 'documents', an exhibit of 'filler_mb'
+    megabytes that no one wants and, when given, a uuencoded 'R99.htm' made of 'binary'.
+    """
+    yield b"<SEC-DOCUMENT>0000000001-24-000001.txt : 20240801\n"
+    yield b"<SEC-HEADER>0000000001-24-000001.hdr.sgml : 20240801\n"
+    yield b"</SEC-HEADER>\n"
+    for name, content in documents.items():
+        yield from (b"<DOCUMENT>\n", b"<TYPE>XML\n", b"<FILENAME>" + name.encode() + b"\n", b"<TEXT>\n")
+        yield from content.splitlines(True)
+        yield from (b"</TEXT>\n", b"</DOCUMENT>\n")
+    yield from (b"<DOCUMENT>\n", b"<TYPE>EX-99\n", b"<FILENAME>ex99.htm\n", b"<TEXT>\n")
+    line = b"<p>" + b"x" * 1020 + b"</p>\n"
+    for _ in range(filler_mb * 1024):
+        yield line
+    yield from (b"</TEXT>\n", b"</DOCUMENT>\n")
+    if binary:
+        yield from (b"<DOCUMENT>\n", b"<TYPE>GRAPHIC\n", b"<FILENAME>R99.htm\n", b"<TEXT>\n")
+        yield b"begin 644 R99.htm\n"
+        for i in range(0, len(binary), 45):
+            yield binascii.b2a_uu(binary[i : i + 45])
+        yield from (b"`\n", b"end\n", b"</TEXT>\n", b"</DOCUMENT>\n")
+    yield b"</SEC-DOCUMENT>\n"
+
+
+def check_submission_archive(filler_mb: int = 64) -> bool:
+    """
+    Splits a synthetic submission with a large unwanted exhibit and checks the documents kept and
+    that peak memory stays far below the submission size.
+    """
+    documents = {
+        "FilingSummary.xml": b"<FilingSummary><MyReports></MyReports></FilingSummary>\n",
+        "R2.htm": b"<html><body><table><tr><td>1</td></tr></table></body></html>\n",
+    }
+    binary = bytes(range(256)) * 4
+    (split, elapsed, peak) = _measure(
+        lambda: dict(
+            submission_archive.iter_sgml_documents(
+                synthetic_submission_lines(documents, filler_mb, binary)
+            )
+        )
+    )
+    same = (
+        split.keys() == {"FilingSummary.xml", "R2.htm", "R99.htm"}
+        and all(split[name] == content for name, content in documents.items())
+        and split["R99.htm"] == binary
+        and peak < 8 * 1024**2
+    )
+    print(
+        f"[Submission Archive] {'OK' if same else 'MISMATCH'} "
+        f"({filler_mb} MB split in {elapsed:.2f}s, peak {peak / 1e6:,.2f} MB)"
+    )
+    return same
+
+
+"""
+=====================================================
+Statement Matcher
+=====================================================
+"""
+
+# Short names seen in filing summaries, as (short name, menu category). Each tuple is one filing.
+statement_name_fixtures = [
+    (
+        ("Cover", "Cover"),
+        ("CONSOLIDATED BALANCE SHEETS", "Statements"),
+        ("CONSOLIDATED BALANCE SHEETS (Parenthetical)", "Statements"),
+        ("CONSOLIDATED STATEMENTS OF OPERATIONS", "Statements"),
+        ("CONSOLIDATED STATEMENTS OF CASH FLOWS", "Statements"),
+    ),
+    (
+        ("Cover Page", "Cover"),
+        ("Condensed Consolidated Balance Sheets (Unaudited)", "Statements"),
+        ("Condensed Consolidated Statements of Income (Unaudited)", "Statements"),
+        ("Condensed Consolidated Statements of Comprehensive Income (Unaudited)", "Statements"),
+        ("Condensed Consolidated Statements of Cash Flows (Unaudited)", "Statements"),
+    ),
+    (
+        ("Document and Entity Information", "Cover"),
+        ("Consolidated Statement of Financial Position - Alabama Power", "Statements"),
+        ("Consolidated Statements of Income - Alabama Power", "Statements"),
+        ("Consolidated Statements of Cash Flows - Alabama Power", "Statements"),
+    ),
+    (
+        ("Cover", "Cover"),
+        ("Statements of Consolidated Operations", "Statements"),
+        ("Statements of Consolidated Comprehensive Income", "Statements"),
+        ("Consolidated Balance Sheets & Supplemental Data", "Statements"),
+        ("Statements of Consolidated Changes in Equity", "Statements"),
+        ("Statements of Consolidated Cash Flow", "Statements"),
+    ),
+    (
+        ("Cover", "Cover"),
+        ("CONDENSED CONSOLIDATED BALANCE SHEET", "Statements"),
+        ("CONDENSED CONSOLIDATED STATEMENT OF EARNINGS", "Statements"),
+        ("CONDENSED CONSOLIDATED STATEMENT OF CASH FLOWS", "Statements"),
+    ),
+    (
+        ("Cover", "Cover"),
+        ("Balance Sheet", "Statements"),
+        ("Statement of Loss", "Statements"),
+        ("Statement of Shareholders' Deficit", "Statements"),
+        ("Statement of Cash Flows", "Statements"),
+    ),
+]
+
+
+def _fixture_reports(names) -> list:
+    return [
+        Report(position, short_name, f"{position} - Statement - {short_name}", f"R{position + 1}.htm", category)
+        for position, (short_name, category) in enumerate(names)
+    ]
+
+
+def iter_filing_summaries(corpus_dir: str = None):
+    """
+    Yields (name, reports) for the fixture filings plus every FilingSummary.xml in 'corpus_dir' or,
+    without it, in the response cache.
+    """
+    for i, names in enumerate(statement_name_fixtures):
+        yield f"fixture {i}", _fixture_reports(names)
+    if corpus_dir is not None:
+        for name in sorted(os.listdir(corpus_dir)):
+            if name.endswith(".xml"):
+                with open(os.path.join(corpus_dir, name), "rb") as f:
+                    yield name, FilingIndex.from_xml("", f.read()).reports
+        return
+    for url, content in _iter_cached_bodies(re.compile(r"/FilingSummary\.xml$")):
+        yield url, FilingIndex.from_xml("", content).reports
+
+
+def statement_match_report(corpus_dir: str = None) -> dict:
+    """
+    Prints how many filings resolve each statement, by tier, against the exact lookup used before.
+
+    Returns:
+        dict: Statement name -> {'filings', 'legacy', tier -> count}.
+    """
+    matcher = StatementMatcher()
+    statements = ("balance_sheet", "income_statement", "cash_flow")
+    report = {s: dict({"filings": 0, "legacy": 0}, **{tier: 0 for tier in TIERS}) for s in statements}
+    for _, reports in iter_filing_summaries(corpus_dir):
+        for statement in statements:
+            counts = report[statement]
+            counts["filings"] += 1
+            match = matcher.match(statement, reports)
+            if match is not None:
+                counts[match.tier] += 1
+                # Before, only exact names were found, and 'cash_flow' wasn't a key of the map at all.
+                if match.tier == "exact" and statement != "cash_flow":
+                    counts["legacy"] += 1
+
+    print("[Statement Matcher]")
+    for statement, counts in report.items():
+        matched = sum(counts[tier] for tier in TIERS)
+        tiers = "  ".join(f"{tier}: {counts[tier]}" for tier in TIERS)
+        print(
+            f"    {statement}: {matched}/{counts['filings']} matched "
+            f"(legacy {counts['legacy']}/{counts['filings']})  {tiers}"
+        )
+    return report
+
+
+"""
+=====================================================
+Statement Memo
+=====================================================
+"""
+
+
+def benchmark_statement_memo(ticker: str = "AAPL", filings: int = 4, items: int = 200) -> bool:
+    """
+    Processes the statements of synthetic filings served from a response cache with an empty memo,
+    again from the memory tier and again from the disk tier, and checks all three give the same
+    frames. Raw pages come from the cache, so only parsing is timed.
+
+    Returns:
+        bool: Whether every memoized frame equals the parsed one.
+    """
+    directory = tempfile.mkdtemp()
+    cache = ResponseCache(os.path.join(directory, "cache"))
+    memo_dir = os.path.join(directory, "memo")
+    edgar = Edgar({"User-Agent": "benchmark"}, cache=cache)
+    accession_numbers = seed_synthetic_filings(cache, edgar.get_cik(ticker), filings, items)
+    calls = [(a, s) for a in accession_numbers for s in SEC.statement_kinds]
+    shared_memo = edgar.memo
+    try:
+
+        def run(memo):
+            edgar.memo = memo
+            start = time.perf_counter()
+            frames = [edgar.process_one_statement(ticker, a, s) for a, s in calls]
+            return frames, time.perf_counter() - start
+
+        memo = StatementMemo(shared_memo.version, memo_dir)
+        # Warm up once so the timed runs only measure parsing and the memo.
+        run(StatementMemo(shared_memo.version, None, max_entries=0))
+        parsed, cold = run(memo)
+        from_memory, memory = run(memo)
+        from_disk, disk = run(StatementMemo(shared_memo.version, memo_dir))
+        stale, _ = run(StatementMemo("other", memo_dir, max_entries=0))
+
+        def same(frames):
+            return all(
+                (a is None and b is None) or (a is not None and b is not None and a.equals(b))
+                for a, b in zip(parsed, frames)
+            )
+
+        ok = all(frame is not None for frame in parsed)
+        ok = ok and same(from_memory) and same(from_disk) and same(stale)
+        ok = ok and not os.path.isdir(os.path.join(memo_dir, shared_memo.version))
+    finally:
+        edgar.memo = shared_memo
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"[Statement Memo] {'OK' if ok else 'MISMATCH'} ({len(calls)} statements)")
+    _print_comparison("Parse vs memory tier", cold, memory, len(calls))
+    _print_comparison("Parse vs disk tier", cold, disk, len(calls))
+    return ok
+
+
+"""
+=====================================================
+Fiscal Calendar
+=====================================================
+"""
+
+
+def synthetic_fiscal_history(
+    years: int = 40, items: int = 60, fiscal_year_end: str = "0928", seed: int = 0
+):
+    """
+    Quarterly and annual flow statements of a 52/53 week filer whose quarter ends drift by days.
+
+    Returns:
+        tuple: (quarterly, annual, expected Q4) frames of line items x period end dates.
+    """
+    rng = np.random.default_rng(seed)
+    month, day = int(fiscal_year_end[:2]), int(fiscal_year_end[2:])
+    index = [f"Item {i}" for i in range(items)]
+    quarterly, annual, fourth = {}, {}, {}
+    for year in range(2000, 2000 + years):
+        year_end = pd.Timestamp(year, month, day) - pd.Timedelta(days=int(rng.integers(0, 6)))
+        values = rng.integers(1, 10_000, size=(4, items)).astype(float)
+        for q in range(3):
+            quarterly[year_end - pd.DateOffset(months=9 - 3 * q)] = values[q]
+        annual[year_end] = values.sum(axis=0)
+        fourth[year_end] = values[3]
+    frame = lambda columns: pd.DataFrame(columns, index=index)
+    return frame(quarterly), frame(annual), frame(fourth)
+
+
+def _loop_fourth_quarters(quarterly: pd.DataFrame, annual: pd.DataFrame) -> pd.DataFrame:
+    # Per year: pick the three quarters that ended in the twelve months before the 10-K.
+    fourth = {}
+    for year_end in annual.columns:
+        start = year_end - pd.DateOffset(months=11, days=20)
+        columns = [c for c in quarterly.columns if start < c < year_end]
+        if len(columns) == 3:
+            fourth[year_end] = annual[year_end] - quarterly[columns].sum(axis=1)
+    return pd.DataFrame(fourth, index=annual.index)
+
+
+def benchmark_fiscal_calendar(years: int = 40, items: int = 60, repeat: int = 20) -> bool:
+    """
+    Derives Q4 for a long 52/53 week history with the vectorized engine and with a per-year loop.
+
+    Returns:
+        bool: Whether the engine reproduces every expected Q4.
+    """
+    quarterly, annual, expected = synthetic_fiscal_history(years, items)
+    labels = fiscal_calendar.label_periods(quarterly.columns, "0928")
+    derived = fiscal_calendar.derive_fourth_quarters(quarterly, annual, "0928")
+    # Repeated line item labels line up by occurrence.
+    repeated = ["Total"] * 2 + list(quarterly.index[2:])
+    derived_repeated = fiscal_calendar.derive_fourth_quarters(
+        quarterly.set_axis(repeated), annual.set_axis(repeated), "0928"
+    )
+    # An unknown fiscal year end is returned as None and not stored.
+    directory = tempfile.mkdtemp()
+    try:
+        calendar = fiscal_calendar.FiscalCalendar(os.path.join(directory, "fiscal_periods.csv"))
+        unknown = calendar.fiscal_year_end("NONE", lambda: None) is None
+        unknown = unknown and calendar.get("NONE") is None
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    ok = (
+        set(labels["fiscal_quarter"]) == {1, 2, 3}
+        and derived.equals(expected)
+        and derived_repeated.equals(expected.set_axis(repeated))
+        and unknown
+        and _loop_fourth_quarters(quarterly, annual).equals(expected)
+    )
+    print(f"[Fiscal Calendar] {'OK' if ok else 'MISMATCH'} ({years} years, {items} items)")
+    loop = _time_calls(_loop_fourth_quarters, [(quarterly, annual)] * repeat)
+    engine = _time_calls(
+        fiscal_calendar.derive_fourth_quarters, [(quarterly, annual, "0928")] * repeat
+    )
+    _print_comparison("Q4 derivation", loop, engine, repeat)
+    return ok
+
+
+"""
+=====================================================
+Async Edgar
+=====================================================
+"""
+
+
+class _BurstServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections opened at once, which then retry after a second.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class _SlowHandler(_QuietHandler):
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+        body = self.path.encode() * 64
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def benchmark_async_edgar(calls: int = 40, latency: float = 0.05, per_host: int = 8) -> bool:
+    """
+    Requests 'calls' pages from a local server that answers after 'latency' seconds, one at a time
+    with 'Transport' and concurrently with 'AsyncTransport'. The rate limit is lifted so only the
+    waiting on sockets is compared. Also checks 'SyncEdgar' bodies and errors match 'Edgar'.
+
+    Returns:
+        bool: Whether both clients got the same bodies and errors.
+    """
+    handler = type("Handler", (_SlowHandler,), {"latency": latency})
+    server = _BurstServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base}/page/{i}" for i in range(calls)]
+    limiter = RateLimiter(10_000)
+    headers = {"User-Agent": "benchmark"}
+    try:
+        transport = Transport(headers, rate_limiter=limiter)
+        start = time.perf_counter()
+        sync_bodies = [transport.get(url).content for url in urls]
+        sync = time.perf_counter() - start
+        transport.close()
+
+        async def fetch_all():
+            client = AsyncTransport(headers, rate_limiter=limiter, per_host=per_host)
+            try:
+                responses = await asyncio.gather(*(client.get(url) for url in urls))
+                return [r.content for r in responses]
+            finally:
+                await client.aclose()
+
+        start = time.perf_counter()
+        async_bodies = asyncio.run(fetch_all())
+        concurrent = time.perf_counter() - start
+
+        edgar = SyncEdgar(
+            headers,
+            cache=ResponseCache(tempfile.mkdtemp()),
+            transport=Transport(headers, rate_limiter=limiter),
+        )
+        ok = sync_bodies == async_bodies and edgar._get(urls[0]) == sync_bodies[0]
+        try:
+            edgar._get(f"{base}/missing")
+            ok = False
+        except requests.HTTPError as e:
+            ok = ok and e.response.status_code == 404
+        edgar.close()
+        # The parsing pool AsyncEdgar created is shut down with it.
+        try:
+            edgar.aio.executor.submit(int)
+            ok = False
+        except RuntimeError:
+            pass
+    finally:
+        server.shutdown()
+
+    print(
+        f"[Async Edgar] {'OK' if ok else 'MISMATCH'} "
+        f"({calls} requests, {latency * 1e3:.0f} ms each)"
+    )
+    _print_comparison(f"Sequential vs {per_host} per host", sync, concurrent, calls)
+    return ok
+
+
+"""
+=====================================================
+Parse Pipeline
+=====================================================
+"""
+
+_page_statements = {
+    "R2.htm": "CONSOLIDATED BALANCE SHEETS",
+    "R4.htm": "CONSOLIDATED STATEMENTS OF OPERATIONS",
+    "R8.htm": "CONSOLIDATED STATEMENTS OF CASH FLOWS",
+}
+
+
+def synthetic_statement_page(title: str, items: int = 200, periods: int = 4, seed: int = 0) -> bytes:
+    """
+    R page in the layout EDGAR renders: dated header cells and one row per line item.
+    """
+    rng = np.random.default_rng(seed)
+    ends = pd.date_range(end="2024-06-30", periods=periods, freq="QE")[::-1]
+    header = "".join(f'<th class="th"><div>{d:%b}. {d.day}, {d.year}</div></th>' for d in ends)
+    rows = []
+    for i in range(items):
+        cells = "".join(
+            f'<td class="nump">$ {v:,}<span></span></td>' for v in rng.integers(1, 10**6, periods)
+        )
+        rows.append(
+            f'<tr class="re"><td class="pl " valign="top"><a class="a" href="javascript:void(0);" '
+            f"onclick=\"top.Show.showAR( this, 'defref_us-gaap_Item{i}', window );\">Item {i}</a>"
+            f"</td>{cells}</tr>"
+        )
+    return (
+        '<html><body><table class="report">'
+        f'<tr><th class="tl"><div><strong>{title} - USD ($)</strong></div></th></tr>'
+        f"<tr>{header}</tr>{''.join(rows)}</table></body></html>"
+    ).encode()
+
+
+def synthetic_filing_summary() -> bytes:
+    reports = "".join(
+        f"<Report><HtmlFileName>{name}</HtmlFileName><ShortName>{title}</ShortName>"
+        f"<LongName>{i + 2} - Statement - {title}</LongName>"
+        f"<MenuCategory>Statements</MenuCategory></Report>"
+        for i, (name, title) in enumerate(_page_statements.items())
+    )
+    return f"<FilingSummary><MyReports>{reports}</MyReports></FilingSummary>".encode()
+
+
+def seed_synthetic_filings(cache: ResponseCache, cik: str, filings: int, items: int) -> list:
+    """
+    Stores 'filings' accessions of synthetic statements in 'cache'.
+
+    Returns:
+        list: Accession numbers without dashes.
+    """
+    accession_numbers = []
+    for f in range(filings):
+        accession_number = f"{int(cik):010d}24{f:06d}"
+        base = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
+        cache.put(f"{base}/FilingSummary.xml", synthetic_filing_summary())
+        for p, (name, title) in enumerate(_page_statements.items()):
+            cache.put(f"{base}/{name}", synthetic_statement_page(title, items, seed=f * 3 + p))
+        accession_numbers.append(accession_number)
+    return accession_numbers
+
+
+def benchmark_parse_pipeline(ticker: str = "AAPL", filings: int = 24, items: int = 200) -> bool:
+    """
+    Processes the statements of synthetic filings served from a response cache with the thread
+    pool, then with the parse pipeline for 1, 2, 4... processes, at least up to 4 and up to the
+    number of cores. Speedups are relative to 1 process; on fewer cores than processes they
+    measure the pipeline's overhead rather than its scaling.
+
+    Returns:
+        bool: Whether every pipeline run gave the frames of the thread pool.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        cache = ResponseCache(directory)
+        headers = {"User-Agent": "benchmark"}
+        cik = Edgar(headers, cache=cache).get_cik(ticker)
+        accession_numbers = seed_synthetic_filings(cache, cik, filings, items)
+        tasks = [(a, s) for a in accession_numbers for s in SEC.statement_kinds]
+
+        def new_edgar():
+            # No memo, every run parses every page.
+            return Edgar(headers, cache=cache, memo=StatementMemo("benchmark", None, 0))
+
+        edgar = new_edgar()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            expected = list(pool.map(lambda t: edgar.process_one_statement(ticker, *t), tasks))
+        threads = time.perf_counter() - start
+        print(f"[Parse Pipeline] {len(tasks)} pages of {items} items, {os.cpu_count()} cores")
+        print(f"    4 threads:     {threads:.3f}s  ({len(tasks) / threads:,.0f} pages/s)")
+
+        ok = True
+        single = None
+        processes = 1
+        while processes <= max(4, os.cpu_count() or 1):
+            start = time.perf_counter()
+            with ParsePipeline(new_edgar(), io_workers=4, processes=processes) as pipeline:
+                parsed = pipeline.run(ticker, tasks)
+            elapsed = time.perf_counter() - start
+            ok = ok and all(
+                df is not None and parsed[t].equals(df) for t, df in zip(tasks, expected)
+            )
+            single = single or elapsed
+            print(
+                f"    {processes} processes:  {elapsed:.3f}s  ({len(tasks) / elapsed:,.0f} pages/s,"
+                f" {single / elapsed:.2f}x)"
+            )
+            processes *= 2
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"    {'OK' if ok else 'MISMATCH'}")
+    return ok
+
+
+"""
+=====================================================
+Metrics
+=====================================================
+"""
+
+
+def benchmark_metrics(ticker: str = "AAPL", filings: int = 8, calls: int = 200_000) -> bool:
+    """
+    Cost of the instrumentation while disabled, then a metrics report of processing synthetic
+    filings served from a response cache.
+
+    Returns:
+        bool: Whether the report has every timed stage and counted every cache lookup.
+    """
+    disabled = Metrics(enabled=False)
+    start = time.perf_counter()
+    for _ in range(calls):
+        pass
+    empty = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        with disabled.stage("extract"):
+            pass
+        disabled.count("cache", result="hit")
+    instrumented = time.perf_counter() - start
+    print(f"[Metrics] Disabled overhead over {calls:,} events")
+    print(f"    {(instrumented - empty) / calls * 1e9:,.0f} ns/event")
+
+    directory = tempfile.mkdtemp()
+    was_enabled = metrics.enabled
+    metrics.enable()
+    try:
+        cache = ResponseCache(directory)
+        edgar = Edgar(
+            {"User-Agent": "benchmark"}, cache=cache, memo=StatementMemo("benchmark", None, 0)
+        )
+        cik = edgar.get_cik(ticker)
+        accession_numbers = seed_synthetic_filings(cache, cik, filings, 200)
+        since = metrics.snapshot()
+        for accession_number in accession_numbers:
+            for statement_name in SEC.statement_kinds:
+                edgar.process_one_statement(ticker, accession_number, statement_name)
+        report = metrics.report(since)
+    finally:
+        metrics.enabled = was_enabled
+        shutil.rmtree(directory, ignore_errors=True)
+    print_report(report, f"Metrics {filings} synthetic filings")
+
+    pages = filings * len(SEC.statement_kinds)
+    stages = report["stages"]
+    ok = (
+        all(stages.get(s, {}).get("count") == pages for s in ("statement_fetch", "extract"))
+        and report["cache"].get("hit", 0) == filings + pages
+        and json.loads(json.dumps(report)) == report
+        and "sec_stage_seconds_bucket" in metrics.to_prometheus()
+    )
+    print(f"    {'OK' if ok else 'MISSING'}")
+    return ok
+
+
+"""
+=====================================================
+Statement Matrix
+=====================================================
+"""
+
+
+def _legacy_statement_frame(columns: list, rows: list, dates: pd.DatetimeIndex):
+    # List of floats per line item, zipped into dates x items and transposed back.
+    values_set = []
+    for row in rows:
+        values = [np.nan] * len(dates)
+        for i, value in enumerate(row):
+            values[i] = value
+        values_set.append(values)
+    df = pd.DataFrame(list(zip(*values_set)), columns=columns, index=dates)
+    return None if df.empty else df.T.drop_duplicates()
+
+
+def _matrix_statement_frame(columns: list, rows: list, dates: pd.DatetimeIndex):
+    matrix = statement_parser.StatementMatrix(len(dates))
+    matrix.reserve(len(rows))
+    for column, row in zip(columns, rows):
+        values = matrix.add(column)
+        for i, value in enumerate(row):
+            values[i] = value
+    return statement_parser.statement_frame(*matrix.result(), dates)
+
+
+def benchmark_statement_matrix(pages: int = 40, items: int = 300, periods: int = 4) -> bool:
+    """
+    Builds statement frames from extracted values the old way (a list per line item, zipped and
+    transposed twice) and into a preallocated matrix, for synthetic pages and the corpus.
+
+    Returns:
+        bool: Whether both give the same frames.
+    """
+    edgar = Edgar({}, parser=statement_parser.LXML)
+    contents = [
+        ("R4.htm", synthetic_statement_page("X", items, periods, seed=seed))
+        for seed in range(pages)
+    ]
+    contents += list(iter_statement_pages())
+    extracted = []
+    for name, content in contents:
+        columns, values, dates = edgar.extract_statement(name, content)
+        extracted.append((list(columns), [list(row) for row in values], dates))
+
+    ok = True
+    for columns, rows, dates in extracted:
+        expected = _legacy_statement_frame(columns, rows, dates)
+        actual = _matrix_statement_frame(columns, rows, dates)
+        ok = ok and (
+            (expected is None and actual is None)
+            or (
+                actual is not None
+                and expected.equals(actual)
+                and expected.index.equals(actual.index)
+            )
+        )
+
+    def measure(build):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for args in extracted:
+            build(*args)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak
+
+    measure(_matrix_statement_frame)
+    baseline, baseline_peak = measure(_legacy_statement_frame)
+    candidate, candidate_peak = measure(_matrix_statement_frame)
+    _print_comparison(
+        f"Statement matrix ({len(extracted)} statements)", baseline, candidate, len(extracted)
+    )
+    print(f"    Peak memory: {baseline_peak / 1e6:,.2f} MB -> {candidate_peak / 1e6:,.2f} MB")
+    print(f"    {'OK' if ok else 'MISMATCH'}")
+    return ok
+
+
+if __name__ == "__main__":
+    benchmark_cik_lookup()
+    benchmark_cik_rebuild()
+    check_statement_merge()
+    benchmark_statement_merge()
+    benchmark_statement_parsers()
+    check_facts_frame()
+    benchmark_facts_loader()
+    check_frames_store()
+    benchmark_frames_store()
+    check_statement_store()
+    benchmark_statement_store()
+    check_filing_watcher()
+    check_response_cache()
+    check_batch_runner()
+    check_parallel_merge()
+    check_incremental_update()
+    check_filing_history_refresh()
+    check_submission_archive()
+    statement_match_report()
+    benchmark_statement_memo()
+    benchmark_fiscal_calendar()
+    benchmark_async_edgar()
+    benchmark_parse_pipeline()
+    benchmark_metrics()
+    benchmark_statement_matrix()
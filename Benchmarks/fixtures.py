@@ -0,0 +1,473 @@
+import os
+import re
+import json
+import time
+import threading
+from functools import partial
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.transport import RateLimiter, Transport
+from SEC.Periphery.statement_store import (
+    FILE_CODES,
+    STATEMENTS,
+    CSVStatementStore,
+    default_companies_dir,
+)
+
+
+# Recorded (or reconstructed) fixtures, one folder per scenario. Scenarios without any are
+# synthesized.
+default_fixtures_dir = os.path.join("Benchmarks", "fixtures")
+
+MANIFEST = "manifest.json"
+
+
+def fixture_path(directory: str, url: str) -> str:
+    """
+    Where the body of 'url' is kept: '<directory>/<host>/<path>'.
+    Ex: https://data.sec.gov/submissions/CIK1.json -> <directory>/data.sec.gov/submissions/CIK1.json
+    """
+    parts = urlsplit(url)
+    return os.path.join(directory, parts.netloc, *parts.path.lstrip("/").split("/"))
+
+
+def write_fixture(directory: str, url: str, content: bytes):
+    path = fixture_path(directory, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def read_manifest(directory: str):
+    """
+    Returns:
+        dict | None: 'ticker', 'cik', 'fiscal_year_end', 'forms' (form -> filings) and 'source' of
+            the fixtures in 'directory', None when there are none.
+    """
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_manifest(directory: str, manifest: dict):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+"""
+=====================================================
+Record
+=====================================================
+"""
+
+
+class RecordingTransport:
+    """
+    Wraps a transport and saves the body of every successful response under 'directory', in the
+    layout 'FixtureServer' replays. Streamed requests (filing archives) are passed through unsaved.
+    """
+
+    def __init__(self, transport: Transport, directory: str) -> None:
+        self.transport = transport
+        self.directory = directory
+        self.recorded = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        response = self.transport.get(url, headers=headers, stream=stream)
+        if not stream and response.status_code == 200:
+            write_fixture(self.directory, url, response.content)
+            with self._lock:
+                self.recorded.append(url)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+
+"""
+=====================================================
+Replay
+=====================================================
+"""
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """
+    Local stand-in for sec.gov. 'GET /<host>/<path>' answers with the recorded body of
+    'https://<host>/<path>' and 404 for anything that wasn't recorded.
+    """
+
+    def __init__(self, directory: str, latency: float = 0.0) -> None:
+        """
+        Args:
+            directory (str): Fixture folder of one scenario.
+            latency (float): Seconds added to every response, to mimic a network round trip.
+        """
+        handler = type("Handler", (_FixtureHandler,), {"latency": latency})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=directory))
+        self.server.request_queue_size = 128
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def rewrite(self, url: str) -> str:
+        """https://www.sec.gov/Archives/... -> http://127.0.0.1:<port>/www.sec.gov/Archives/..."""
+        parts = urlsplit(url)
+        return f"{self.url}/{parts.netloc}{parts.path}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Transport sending every request to a 'FixtureServer' instead of the host in the URL. Requests go
+    through the same pooled session, retries and metrics as a live run but aren't rate limited.
+    """
+
+    def __init__(self, server: FixtureServer, headers: dict = None, **kwargs) -> None:
+        kwargs.setdefault("rate_limiter", RateLimiter(1e9))
+        super().__init__(headers or {}, **kwargs)
+        self.server = server
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        return super().get(self.server.rewrite(url), headers=headers, stream=stream)
+
+
+"""
+=====================================================
+Synthesize
+=====================================================
+"""
+
+_statement_pages = {
+    "income_statement": ("R4.htm", "CONSOLIDATED STATEMENTS OF OPERATIONS"),
+    "balance_sheet": ("R2.htm", "CONSOLIDATED BALANCE SHEETS"),
+    "cash_flow": ("R8.htm", "CONSOLIDATED STATEMENTS OF CASH FLOWS"),
+}
+
+
+def _statement_page(title: str, ends: list, items: np.ndarray, rng) -> bytes:
+    header = "".join(f'<th class="th"><div>{d:%b}. {d.day}, {d.year}</div></th>' for d in ends)
+    rows = []
+    for i in items:
+        cells = "".join(
+            f'<td class="{"nump" if v > 0 else "num"}">$ {abs(v):,}<span></span></td>'
+            for v in rng.integers(-10**5, 10**7, len(ends))
+        )
+        rows.append(
+            f'<tr class="re"><td class="pl " valign="top"><a class="a" href="javascript:void(0);" '
+            f"onclick=\"top.Show.showAR( this, 'defref_us-gaap_Item{i}', window );\">Item {i}</a>"
+            f"</td>{cells}</tr>"
+        )
+    return (
+        '<html><body><table class="report">'
+        f'<tr><th class="tl"><div><strong>{title} - USD ($)<br/>$ in Thousands</strong></div></th>'
+        f"</tr><tr>{header}</tr>{''.join(rows)}</table></body></html>"
+    ).encode()
+
+
+def _filing_summary() -> bytes:
+    reports = "".join(
+        f"<Report><HtmlFileName>{name}</HtmlFileName><ShortName>{title}</ShortName>"
+        f"<LongName>{i + 2} - Statement - {title}</LongName>"
+        f"<MenuCategory>Statements</MenuCategory></Report>"
+        for i, (name, title) in enumerate(_statement_pages.values())
+    )
+    return f"<FilingSummary><MyReports>{reports}</MyReports></FilingSummary>".encode()
+
+
+def synthesize(
+    directory: str,
+    ticker: str,
+    cik: str,
+    quarters: int,
+    items: int,
+    concepts: int,
+    seed: int = 0,
+) -> dict:
+    """
+    Writes the fixtures of a filer with 'quarters' quarters of history: submissions, companyfacts
+    and, for every 10-Q and 10-K, a FilingSummary.xml and its three statement R pages.
+
+    Each filing reports 95% of 'items' line items, so the merge sees items come and go, and
+    companyfacts holds one value per filing for each of 'concepts' facts.
+
+    Returns:
+        dict: The manifest written to 'directory'.
+    """
+    rng = np.random.default_rng(seed)
+    cik = f"{int(cik):010d}"
+    ends = pd.date_range(end="2024-06-30", periods=quarters, freq="QE")[::-1]
+    accession_numbers, forms = [], []
+    for f, end in enumerate(ends):
+        form = "10-K" if end.month == 12 else "10-Q"
+        accession_number = f"{cik}-{(end.year % 100):02d}-{f + 1:06d}"
+        base = "https://www.sec.gov/Archives/edgar/data/{}/{}".format(
+            cik, accession_number.replace("-", "")
+        )
+        write_fixture(directory, f"{base}/FilingSummary.xml", _filing_summary())
+        periods = [end, end - pd.DateOffset(years=1) + pd.offsets.QuarterEnd(0)]
+        for name, title in _statement_pages.values():
+            reported = np.sort(rng.choice(items, int(items * 0.95), replace=False))
+            page = _statement_page(title, periods, reported, rng)
+            write_fixture(directory, f"{base}/{name}", page)
+        accession_numbers.append(accession_number)
+        forms.append(form)
+
+    filed = [(end + pd.Timedelta(days=35)).strftime("%Y-%m-%d") for end in ends]
+    submissions = {
+        "cik": cik.lstrip("0"),
+        "name": ticker,
+        "tickers": [ticker],
+        "fiscalYearEnd": "1231",
+        "filings": {
+            "recent": {
+                "accessionNumber": accession_numbers,
+                "filingDate": filed,
+                "reportDate": [end.strftime("%Y-%m-%d") for end in ends],
+                "form": forms,
+                "primaryDocument": [f"{ticker.lower()}.htm"] * len(ends),
+            },
+            "files": [],
+        },
+    }
+    write_fixture(
+        directory,
+        f"https://data.sec.gov/submissions/CIK{cik}.json",
+        json.dumps(submissions).encode(),
+    )
+
+    values = rng.integers(-10**6, 10**9, (concepts, len(ends)))
+    facts = {
+        f"Item{c}": {
+            "label": f"Item {c} label",
+            "description": f"Synthetic concept {c}.",
+            "units": {
+                "USD": [
+                    {
+                        "start": (end - pd.offsets.QuarterBegin(1, startingMonth=1)).strftime(
+                            "%Y-%m-%d"
+                        ),
+                        "end": end.strftime("%Y-%m-%d"),
+                        "val": int(values[c, f]),
+                        "accn": accession_numbers[f],
+                        "fy": int(end.year),
+                        "fp": "FY" if forms[f] == "10-K" else f"Q{end.quarter}",
+                        "form": forms[f],
+                        "filed": filed[f],
+                    }
+                    for f, end in enumerate(ends)
+                ]
+            },
+        }
+        for c in range(concepts)
+    }
+    write_fixture(
+        directory,
+        f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json",
+        json.dumps({"cik": int(cik), "entityName": ticker, "facts": {"us-gaap": facts}}).encode(),
+    )
+
+    manifest = {
+        "ticker": ticker,
+        "cik": cik,
+        "fiscal_year_end": "1231",
+        "forms": {form: forms.count(form) for form in ("10-K", "10-Q")},
+        "source": "synthetic",
+    }
+    write_manifest(directory, manifest)
+    return manifest
+
+
+"""
+=====================================================
+Reconstruct
+=====================================================
+"""
+
+
+def _concept(label: str) -> str:
+    """
+    Concept name of a saved line item. Items saved by label get the us-gaap name the label spells.
+    Ex: 'Cost of Revenue' -> 'us-gaap_CostOfRevenue', 'spir_Deorbit' -> 'spir_Deorbit'
+    """
+    if re.match(r"^[a-z][a-z0-9\-]*_", label):
+        return label
+    words = re.sub(r"[^A-Za-z0-9 ]", " ", label).split()
+    return "us-gaap_" + "".join(word[0].upper() + word[1:] for word in words)
+
+
+def _cell(value: float) -> str:
+    if pd.isna(value):
+        return '<td class="text">&#160;<span></span></td>'
+    text = f"{abs(value):,.0f}" if float(value).is_integer() else f"{abs(value):,.2f}"
+    if value < 0:
+        return f'<td class="num">({text})<span></span></td>'
+    return f'<td class="nump">{text}<span></span></td>'
+
+
+def _reconstructed_page(title: str, statement: pd.DataFrame, months: int) -> bytes:
+    ends = statement.columns
+    header = "".join(f'<th class="th"><div>{d:%b}. {d.day}, {d.year}</div></th>' for d in ends)
+    rows = []
+    for label, values in statement.iterrows():
+        concept = _concept(label)
+        name = label.split("_", 1)[1] if concept == label else label
+        if concept.endswith("Abstract"):
+            name, cells = f"<strong>{name}</strong>", _cell(np.nan) * len(ends)
+        else:
+            cells = "".join(_cell(v) for v in values)
+        rows.append(
+            f'<tr class="{"ro" if len(rows) % 2 else "re"}"><td class="pl " valign="top">'
+            f'<a class="a" href="javascript:void(0);" '
+            f"onclick=\"top.Show.showAR( this, 'defref_{concept}', window );\">{name}</a></td>"
+            f"{cells}</tr>"
+        )
+    groups = f'<th class="th" colspan="{len(ends)}">{months} Months Ended</th>' if months else ""
+    return (
+        '<html><body><table class="report" border="0" cellspacing="2">'
+        f'<tr><th class="tl" colspan="1" rowspan="{2 if months else 1}"><div style="width: 200px;">'
+        f"<strong>{title} - USD ($)<br> $ in Thousands</strong></div></th>{groups}"
+        + ("</tr><tr>" if months else "")
+        + f"{header}</tr>{''.join(rows)}</table></body></html>"
+    ).encode()
+
+
+def reconstruct(
+    directory: str, ticker: str, cik: str, companies_dir: str = default_companies_dir
+) -> dict:
+    """
+    Writes fixtures in the layout of a recording from the statements of 'ticker' saved in the csv
+    tree under 'companies_dir', for when sec.gov can't be reached to record them.
+
+    Every saved period becomes a filing whose R pages show it next to the period a year earlier,
+    and companyfacts holds one fact per line item and period. Accession numbers and filing dates
+    are made up.
+
+    Returns:
+        dict: The manifest written to 'directory'.
+    """
+    ticker = ticker.upper()
+    cik = f"{int(cik):010d}"
+    store = CSVStatementStore(companies_dir)
+    statements = {
+        form_type: {statement: store.read(ticker, form_type, statement) for statement in STATEMENTS}
+        for form_type in FILE_CODES
+    }
+    filings = sorted(
+        (end, form_type)
+        for form_type, saved in statements.items()
+        for end in saved["income_statement"].columns
+    )[::-1]
+
+    accession_numbers, forms, ends, facts = [], [], [], {}
+    for f, (end, form_type) in enumerate(filings):
+        accession_number = f"{cik}-{(end.year % 100):02d}-{len(filings) - f:06d}"
+        base = "https://www.sec.gov/Archives/edgar/data/{}/{}".format(
+            cik, accession_number.replace("-", "")
+        )
+        write_fixture(directory, f"{base}/FilingSummary.xml", _filing_summary())
+        for statement, (name, title) in _statement_pages.items():
+            saved = statements[form_type][statement]
+            months = 0 if statement == "balance_sheet" else (12 if form_type == "10-K" else 3)
+            # Balance sheets compare with the last fiscal year end, flows with a year earlier.
+            if months:
+                earlier = end - pd.DateOffset(years=1)
+            else:
+                earlier = pd.Timestamp(end.year - 1, 12, 31)
+            if end in saved.columns:
+                periods = [p for p in (end, earlier) if p in saved.columns]
+                reported = saved[end].notna() | saved.index.str.endswith("Abstract")
+                shown = saved.loc[reported, periods]
+            else:
+                # Not saved for this period, the page lists no line items.
+                shown = saved.iloc[:0, :0]
+            write_fixture(directory, f"{base}/{name}", _reconstructed_page(title, shown, months))
+            for label, value in shown.get(end, pd.Series(dtype=float)).dropna().items():
+                fact = {
+                    "end": end.strftime("%Y-%m-%d"),
+                    "val": float(value),
+                    "accn": accession_number,
+                    "fy": int(end.year),
+                    "fp": "FY" if form_type == "10-K" else f"Q{end.quarter}",
+                    "form": form_type,
+                    "filed": (end + pd.Timedelta(days=45)).strftime("%Y-%m-%d"),
+                }
+                if months:
+                    fact["start"] = (end - pd.DateOffset(months=months) + pd.Timedelta(days=1))
+                    fact["start"] = fact["start"].strftime("%Y-%m-%d")
+                concept = _concept(label).split("_", 1)[1]
+                units = facts.setdefault(concept, {"label": label, "units": {"USD": []}})
+                units["units"]["USD"].append(fact)
+        accession_numbers.append(accession_number)
+        forms.append(form_type)
+        ends.append(end)
+
+    submissions = {
+        "cik": cik.lstrip("0"),
+        "name": ticker,
+        "tickers": [ticker],
+        "fiscalYearEnd": "1231",
+        "filings": {
+            "recent": {
+                "accessionNumber": accession_numbers,
+                "filingDate": [(end + pd.Timedelta(days=45)).strftime("%Y-%m-%d") for end in ends],
+                "reportDate": [end.strftime("%Y-%m-%d") for end in ends],
+                "form": forms,
+                "primaryDocument": [f"{ticker.lower()}.htm"] * len(ends),
+            },
+            "files": [],
+        },
+    }
+    write_fixture(
+        directory,
+        f"https://data.sec.gov/submissions/CIK{cik}.json",
+        json.dumps(submissions).encode(),
+    )
+    write_fixture(
+        directory,
+        f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json",
+        json.dumps({"cik": int(cik), "entityName": ticker, "facts": {"us-gaap": facts}}).encode(),
+    )
+
+    manifest = {
+        "ticker": ticker,
+        "cik": cik,
+        "fiscal_year_end": "1231",
+        "forms": {form: forms.count(form) for form in FILE_CODES},
+        "source": "reconstructed",
+    }
+    write_manifest(directory, manifest)
+    return manifest
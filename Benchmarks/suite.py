@@ -0,0 +1,468 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import datetime as dt
+from typing import NamedTuple
+
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.edgar import Edgar
+from SEC.Periphery.http_cache import ResponseCache
+from SEC.Periphery.facts_store import FactsStore
+from SEC.Periphery.statement_memo import StatementMemo
+from SEC.Periphery.statement_store import ParquetStatementStore, default_companies_dir
+from SEC.Periphery.transport import get_transport
+from SEC.sec import SEC, headers
+from AssetCompare.Periphery.asset import Asset
+from AssetCompare.Periphery.fiscal_calendar import FiscalCalendar
+from Benchmarks.fixtures import (
+    FixtureServer,
+    RecordingTransport,
+    ReplayTransport,
+    default_fixtures_dir,
+    read_manifest,
+    reconstruct,
+    synthesize,
+    write_manifest,
+)
+
+
+default_results_dir = os.path.join("Benchmarks", "results")
+
+
+class Scenario(NamedTuple):
+    ticker: str
+    # Size of the synthetic filer, used when the scenario has no recorded fixtures.
+    quarters: int
+    items: int
+    concepts: int
+
+
+SCENARIOS = {
+    "small": Scenario("SPIR", quarters=8, items=40, concepts=400),
+    "mid": Scenario("ETSY", quarters=24, items=120, concepts=1200),
+    "mega": Scenario("AAPL", quarters=44, items=250, concepts=3000),
+}
+
+OPERATIONS = (
+    "process_all_statements_10q",
+    "process_all_statements_10k",
+    "facts_DF",
+    "extract_columns_values_and_dates",
+    "process_statement",
+    "set_income_statement",
+)
+
+
+"""
+=====================================================
+Fixtures
+=====================================================
+"""
+
+
+def record(
+    name: str, ticker: str = None, depth: int = 11, fixtures_dir: str = default_fixtures_dir
+):
+    """
+    Records the sec.gov responses of one scenario: submissions, companyfacts and the filing
+    summaries and statement pages of the latest 'depth' 10-Qs and 10-Ks. Needs network access.
+
+    Returns:
+        dict: The manifest written next to the recordings.
+    """
+    ticker = (ticker or SCENARIOS[name].ticker).upper()
+    directory = os.path.join(fixtures_dir, name)
+    transport = RecordingTransport(get_transport(headers), directory)
+    edgar = _edgar(transport)
+    store = ParquetStatementStore(tempfile.mkdtemp())
+    forms = {}
+    try:
+        for form_type in ("10-Q", "10-K"):
+            sec = SEC(ticker, form_type, store=store, edgar=edgar)
+            forms[form_type] = len(sec.process_all_statements(depth=depth))
+        edgar.facts_DF(ticker)
+    finally:
+        shutil.rmtree(edgar.cache.directory, ignore_errors=True)
+        shutil.rmtree(store.directory, ignore_errors=True)
+    manifest = {
+        "ticker": ticker,
+        "cik": edgar.get_cik(ticker),
+        "fiscal_year_end": edgar.get_filing_history(ticker).fiscal_year_end,
+        "forms": forms,
+        "source": "recorded",
+    }
+    write_manifest(directory, manifest)
+    print(f"[Record {name}] {len(transport.recorded)} responses of {ticker} in {directory}")
+    return manifest
+
+
+def reconstruct_scenario(
+    name: str,
+    ticker: str = None,
+    companies_dir: str = default_companies_dir,
+    fixtures_dir: str = default_fixtures_dir,
+) -> dict:
+    """
+    Writes the fixtures of one scenario from the statements of its ticker saved under
+    'companies_dir', see 'fixtures.reconstruct'. Offline stand-in for 'record'.
+
+    Returns:
+        dict: The manifest written next to the fixtures.
+    """
+    ticker = (ticker or SCENARIOS[name].ticker).upper()
+    directory = os.path.join(fixtures_dir, name)
+    cik = Edgar(headers, cache=ResponseCache(tempfile.mkdtemp())).get_cik(ticker)
+    manifest = reconstruct(directory, ticker, cik, companies_dir)
+    print(f"[Reconstruct {name}] {ticker} from {companies_dir} in {directory}")
+    return manifest
+
+
+def _fixtures(name: str, fixtures_dir: str, scratch: str):
+    """
+    Returns:
+        tuple: (fixture folder, manifest). The fixtures of 'name' when there are some, otherwise a
+            synthetic filer of the scenario's size written under 'scratch'.
+    """
+    directory = os.path.join(fixtures_dir, name)
+    manifest = read_manifest(directory)
+    if manifest is not None:
+        return directory, manifest
+    print(f"[{name}] No fixtures in {directory}, timing a synthetic filer instead.")
+    scenario = SCENARIOS[name]
+    directory = os.path.join(scratch, "fixtures")
+    cik = Edgar(headers, cache=ResponseCache(os.path.join(scratch, "cik"))).get_cik(scenario.ticker)
+    manifest = synthesize(
+        directory, scenario.ticker, cik, scenario.quarters, scenario.items, scenario.concepts
+    )
+    return directory, manifest
+
+
+def _edgar(transport, cache_dir: str = None) -> Edgar:
+    # Nothing shared with other runs: own response cache and facts store, no statement memo.
+    return Edgar(
+        headers,
+        cache=ResponseCache(cache_dir or tempfile.mkdtemp()),
+        transport=transport,
+        facts_store=FactsStore(),
+        memo=StatementMemo("benchmark", None, 0),
+    )
+
+
+"""
+=====================================================
+Timing
+=====================================================
+"""
+
+
+def _time(func, setup=None, repeat: int = 3) -> dict:
+    """
+    Times 'func(setup())' 'repeat' times. Setup isn't timed and output is discarded.
+
+    Returns:
+        dict: 'median', 'min' and every run, in seconds.
+    """
+    runs = []
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(argument)
+            runs.append(time.perf_counter() - start)
+    return {"median": statistics.median(runs), "min": min(runs), "runs": runs}
+
+
+def run_scenario(
+    name: str,
+    repeat: int = 3,
+    workers: int = 4,
+    latency: float = 0.0,
+    fixtures_dir: str = default_fixtures_dir,
+) -> dict:
+    """
+    Times every operation of 'OPERATIONS' on one scenario, replayed from a local fixture server.
+
+    'process_all_statements' starts from an empty response cache each run, so it covers the HTTP
+    round trips, parsing, merging and export of every filing. The other operations start from a
+    warm cache and time only their own work.
+
+    Args:
+        name (str): Key of 'SCENARIOS'.
+        repeat (int): Runs per operation.
+        workers (int): 'process_all_statements' workers.
+        latency (float): Seconds the fixture server waits before each response.
+
+    Returns:
+        dict: Scenario details and 'operations', operation -> timings.
+    """
+    scratch = tempfile.mkdtemp()
+    try:
+        directory, manifest = _fixtures(name, fixtures_dir, scratch)
+        ticker = manifest["ticker"]
+        forms = manifest["forms"]
+        operations = {}
+        with FixtureServer(directory, latency) as server:
+            warm_cache = os.path.join(scratch, "cache")
+            warm = _edgar(ReplayTransport(server), warm_cache)
+            store = ParquetStatementStore(os.path.join(scratch, "store"))
+
+            for form_type in ("10-Q", "10-K"):
+
+                def process(sec):
+                    sec.process_all_statements(depth=forms[form_type], workers=workers)
+
+                def new_sec():
+                    edgar = _edgar(ReplayTransport(server), tempfile.mkdtemp(dir=scratch))
+                    return SEC(ticker, form_type, store=store, edgar=edgar)
+
+                key = f"process_all_statements_{form_type.replace('-', '').lower()}"
+                operations[key] = _time(process, new_sec, repeat)
+
+            # Fill the warm cache and the frames the merge and extraction timings start from.
+            with contextlib.redirect_stdout(io.StringIO()):
+                accession_numbers = list(
+                    warm.get_filtered_filings(ticker, ten_k=False, just_accession_numbers=True)
+                    .iloc[: forms["10-Q"]]
+                    .str.replace("-", "")
+                )
+                frames = [
+                    warm.process_one_statement(ticker, a, "income_statement")
+                    for a in accession_numbers
+                ]
+                links = [
+                    warm.get_statement_link(ticker, a, kind)
+                    for a in accession_numbers
+                    for kind in SEC.statement_kinds
+                ]
+                soups = [
+                    warm._make_soup(link, warm._get_content(link)) for link in links if link
+                ]
+                warm.get_facts(ticker)
+
+            operations["facts_DF"] = _time(
+                lambda edgar: edgar.facts_DF(ticker),
+                lambda: _edgar(ReplayTransport(server), warm_cache),
+                repeat,
+            )
+
+            def extract(_):
+                for soup in soups:
+                    warm.extract_columns_values_and_dates_from_statement(soup)
+
+            operations["extract_columns_values_and_dates"] = _time(extract, None, repeat)
+
+            def merge(sec):
+                statement = pd.DataFrame()
+                for a, frame in zip(accession_numbers, frames):
+                    if frame is not None:
+                        statement = sec.process_statement(
+                            statement, a, income_statement=True, fetched_statement=frame.copy()
+                        )
+
+            operations["process_statement"] = _time(
+                merge, lambda: SEC(ticker, "10-Q", store=store, edgar=warm), repeat
+            )
+
+            calendar_path = os.path.join(scratch, "fiscal_periods.csv")
+            FiscalCalendar(calendar_path).upsert(ticker, manifest["fiscal_year_end"] or "1231")
+
+            def new_asset():
+                return Asset(
+                    ticker, quarter=True, store=store, fiscal_calendar=FiscalCalendar(calendar_path)
+                )
+
+            operations["set_income_statement"] = _time(
+                lambda asset: asset.set_income_statement(), new_asset, repeat
+            )
+            warm.transport.close()
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "ticker": ticker,
+        "source": manifest["source"],
+        "forms": forms,
+        "pages": len(soups),
+        "fixture_bytes": _folder_size(directory) if manifest["source"] != "synthetic" else None,
+        "operations": operations,
+    }
+
+
+def _folder_size(directory: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+"""
+=====================================================
+Results
+=====================================================
+"""
+
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(
+    scenarios=("small", "mid", "mega"),
+    repeat: int = 3,
+    workers: int = 4,
+    latency: float = 0.0,
+    output: str = None,
+    fixtures_dir: str = default_fixtures_dir,
+) -> dict:
+    """
+    Runs 'scenarios' and saves the results as JSON, by default to
+    'Benchmarks/results/<commit>.json', to be compared with the results of another commit.
+
+    Returns:
+        dict: The results.
+    """
+    commit = _git("rev-parse", "--short", "HEAD")
+    results = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "workers": workers,
+        "latency": latency,
+        "scenarios": {},
+    }
+    for name in scenarios:
+        result = run_scenario(name, repeat, workers, latency, fixtures_dir)
+        results["scenarios"][name] = result
+        print_scenario(name, result)
+
+    output = output or os.path.join(default_results_dir, f"{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {output}")
+    return results
+
+
+def print_scenario(name: str, result: dict):
+    print(f"[{name}] {result['ticker']} ({result['source']}), {result['pages']} statement pages")
+    for operation, timing in result["operations"].items():
+        print(f"    {operation:<36} {timing['median']:9.4f}s  (min {timing['min']:.4f}s)")
+
+
+def compare(baseline: str, candidate: str, tolerance: float = 0.10) -> bool:
+    """
+    Prints the median of every operation in two result files side by side. Scenarios timed on
+    different fixtures, a synthetic filer against a recorded one for example, aren't comparable.
+
+    Args:
+        baseline (str): Results JSON of the reference commit.
+        candidate (str): Results JSON of the commit being checked.
+        tolerance (float): Slowdown ratio above which an operation is reported as a regression.
+
+    Returns:
+        bool: Whether no operation regressed. Raises 'ValueError' when a scenario was run on
+            fixtures of another source in each file.
+    """
+    with open(baseline) as f:
+        before = json.load(f)
+    with open(candidate) as f:
+        after = json.load(f)
+    mismatched = {
+        name: (before["scenarios"][name]["source"], scenario["source"])
+        for name, scenario in after["scenarios"].items()
+        if name in before["scenarios"] and before["scenarios"][name]["source"] != scenario["source"]
+    }
+    if mismatched:
+        raise ValueError(
+            "Results timed on different fixtures (baseline, candidate): "
+            + ", ".join(f"{name} {sources}" for name, sources in mismatched.items())
+        )
+    print(f"[Compare] {before['commit']} -> {after['commit']}")
+    ok = True
+    for name, scenario in after["scenarios"].items():
+        reference = before["scenarios"].get(name)
+        if reference is None:
+            continue
+        print(f"  {name}")
+        for operation, timing in scenario["operations"].items():
+            old = reference["operations"].get(operation)
+            if old is None:
+                continue
+            ratio = timing["median"] / old["median"] if old["median"] else float("inf")
+            regressed = ratio > 1 + tolerance
+            ok = ok and not regressed
+            print(
+                f"    {operation:<36} {old['median']:9.4f}s -> {timing['median']:9.4f}s  "
+                f"{ratio:5.2f}x{'  REGRESSION' if regressed else ''}"
+            )
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline SecScraper benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Time the scenarios and save the results.")
+    run_parser.add_argument(
+        "scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS)
+    )
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--workers", type=int, default=4)
+    run_parser.add_argument("--latency", type=float, default=0.0)
+    run_parser.add_argument("--output")
+
+    record_parser = commands.add_parser("record", help="Record a scenario from sec.gov.")
+    record_parser.add_argument("scenario", choices=list(SCENARIOS))
+    record_parser.add_argument("--ticker")
+    record_parser.add_argument("--depth", type=int, default=11)
+
+    reconstruct_parser = commands.add_parser(
+        "reconstruct", help="Rebuild a scenario's fixtures from saved statements, offline."
+    )
+    reconstruct_parser.add_argument("scenario", choices=list(SCENARIOS))
+    reconstruct_parser.add_argument("--ticker")
+
+    compare_parser = commands.add_parser("compare", help="Compare two results files.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--tolerance", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args.scenarios, args.repeat, args.workers, args.latency, args.output)
+    elif args.command == "record":
+        record(args.scenario, args.ticker, args.depth)
+    elif args.command == "reconstruct":
+        reconstruct_scenario(args.scenario, args.ticker)
+    elif args.command == "compare":
+        try:
+            return 0 if compare(args.baseline, args.candidate, args.tolerance) else 1
+        except ValueError as e:
+            print(f"[Compare] {e}")
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
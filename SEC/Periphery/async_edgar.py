@@ -0,0 +1,455 @@
+import json
+import time
+import asyncio
+import logging
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.edgar import Edgar
+from SEC.Periphery.filing_index import FilingIndex
+from SEC.Periphery.filing_history import FilingHistory
+from SEC.Periphery.transport import (
+    RETRY_STATUS_CODES,
+    RateLimiter,
+    backoff_delay,
+    sec_rate_limiter,
+)
+from SEC.Periphery import submission_archive
+from SEC.Periphery.metrics import metrics
+
+
+"""
+=====================================================
+Transport
+=====================================================
+"""
+
+
+class AsyncTransport:
+    """
+    Pooled keep-alive asyncio HTTP client for EDGAR.
+
+    At most 'per_host' requests are in flight per host. Every request takes a token from the same
+    rate limiter the synchronous 'Transport' uses, waiting with 'asyncio.sleep' so other requests
+    keep running, and 429/5xx responses or connection errors are retried with jittered backoff.
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        rate_limiter: RateLimiter = None,
+        per_host: int = 8,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.headers = {"Accept-Encoding": "gzip, deflate", **headers}
+        self.rate_limiter = rate_limiter if rate_limiter is not None else sec_rate_limiter
+        self.per_host = per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self._client = None
+        self._semaphores = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so it belongs to the running event loop.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=self.per_host * 2),
+            )
+        return self._client
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def get(self, url: str, headers: dict = None) -> httpx.Response:
+        """
+        Args:
+            url (str): URL to request.
+            headers (dict): Extra headers for this request only.
+
+        Returns:
+            httpx.Response: The final response, body read. Only 'httpx.TransportError' from the last
+            attempt is raised; retryable status codes are returned once retries are exhausted.
+        """
+        attempt = 0
+        async with self._semaphore(url):
+            while True:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                start = time.perf_counter()
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError:
+                    if attempt >= self.max_retries:
+                        raise
+                    await asyncio.sleep(
+                        backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                    )
+                    attempt += 1
+                    continue
+                if metrics.enabled:
+                    metrics.request(
+                        url,
+                        response.status_code,
+                        time.perf_counter() - start,
+                        len(response.content),
+                    )
+
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    await asyncio.sleep(
+                        backoff_delay(
+                            attempt,
+                            self.backoff_base,
+                            self.backoff_cap,
+                            response.headers.get("Retry-After"),
+                        )
+                    )
+                    attempt += 1
+                    continue
+                return response
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+"""
+=====================================================
+Edgar
+=====================================================
+"""
+
+
+class AsyncEdgar:
+    """
+    asyncio counterpart of 'Edgar' with the same I/O methods as coroutines.
+
+    Requests go through an 'AsyncTransport', so many filings download at once without going over
+    EDGAR's rate limit. Parsing (JSON, soups, statement frames) runs on 'executor' to keep the event
+    loop free. Everything else — CIK table, response cache, filing summaries, statement memo and the
+    parsing code — is shared with the wrapped synchronous 'edgar', so both see the same state.
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        edgar: Edgar = None,
+        transport: AsyncTransport = None,
+        executor=None,
+        per_host: int = 8,
+    ) -> None:
+        """
+        Args:
+            headers (dict): Request headers. EDGAR requires a 'User-Agent' with a contact.
+            edgar (Edgar): Supplies the cache, CIK table and parsing. A new one when None.
+            transport (AsyncTransport): HTTP client. A new one allowing 'per_host' requests per host
+                when None.
+            executor (concurrent.futures.Executor): Runs the parsing. A 4 thread pool, shut down by
+                'aclose', when None; an executor passed in is left to its owner.
+        """
+        self.headers = headers
+        self.edgar = edgar if edgar is not None else Edgar(headers)
+        self.cache = self.edgar.cache
+        self.transport = (
+            transport if transport is not None else AsyncTransport(headers, per_host=per_host)
+        )
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=4)
+        self._filing_histories = {}
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def aclose(self):
+        await self.transport.aclose()
+        if self._owns_executor:
+            # Not waited for, the pool's threads exit once their current call returns.
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    """
+    =====================================================
+    HTTP
+    =====================================================
+    """
+
+    async def _get(self, url: str, revalidate: bool = False) -> bytes:
+        """
+        Same as 'Edgar._get': cached bodies are served without a request and expired entries are
+        checked with a conditional request. Raises 'httpx.HTTPStatusError' for unsuccessful
+        responses, a '304 Not Modified' without a cached body included.
+
+        The cache reads and writes files, so they run on the executor, off the event loop.
+        """
+        if not revalidate:
+            content = await self._run(self.cache.get, url)
+            if content is not None:
+                metrics.count("cache", result="hit")
+                return content
+        stale, meta = await self._run(self.cache.lookup, url)
+        conditional = self.cache.validators(meta) if stale is not None else {}
+        response = await self.transport.get(url, headers=conditional or None)
+        if response.status_code == 304 and stale is not None:
+            metrics.count("cache", result="revalidated")
+            await self._run(self.cache.revalidate, url, response.headers)
+            return stale
+        metrics.count("cache", result="miss")
+        response.raise_for_status()
+        if response.status_code == 200:
+            await self._run(self.cache.put, url, response.content, response.headers)
+        return response.content
+
+    async def _get_json(self, url: str, revalidate: bool = False):
+        return await self._run(json.loads, await self._get(url, revalidate))
+
+    """
+    =====================================================
+    Company
+    =====================================================
+    """
+
+    async def get_cik(self, ticker: str):
+        # Normally a local lookup, but a missing CIK table is downloaded through 'edgar'.
+        return await self._run(self.edgar.get_cik, ticker)
+
+    async def get_facts(self, ticker):
+        cik = await self.get_cik(ticker)
+        return await self._get_json(f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json")
+
+    async def get_filing_history(self, ticker) -> FilingHistory:
+        """
+        Downloads the submissions JSON and its paginated shards concurrently and builds the
+        'FilingHistory' from them, so its queries don't do any I/O.
+        """
+        ticker = ticker.upper()
+        history = self._filing_histories.get(ticker)
+        if history is not None:
+            return history
+        cik = await self.get_cik(ticker)
+        base = FilingHistory.submissions_url
+        main_url = f"{base}/CIK{cik}.json"
+        documents = {main_url: await self._get_json(main_url)}
+        shard_urls = [
+            f"{base}/{shard['name']}" for shard in documents[main_url]["filings"].get("files", [])
+        ]
+        for url, shard in zip(
+            shard_urls, await asyncio.gather(*(self._get_json(url) for url in shard_urls))
+        ):
+            documents[url] = shard
+
+        history = FilingHistory(lambda url, revalidate=False: documents[url], cik)
+        await self._run(lambda: history.filings)
+        self._filing_histories[ticker] = history
+        return history
+
+    async def get_submission_data_for_ticker(self, ticker, only_filings_df=False):
+        """
+        Returns:
+            json | pd.DataFrame: The submissions for the company, or its recent filings.
+        """
+        cik = await self.get_cik(ticker)
+        submissions = await self._get_json(f"{FilingHistory.submissions_url}/CIK{cik}.json")
+        if only_filings_df:
+            return pd.DataFrame(submissions["filings"]["recent"])
+        return submissions
+
+    """
+    =====================================================
+    Filing Summary
+    =====================================================
+    """
+
+    async def get_filing_index(self, ticker, accession_number) -> FilingIndex:
+        """
+        Gets the parsed FilingSummary.xml of an accession, shared with the wrapped Edgar's filing
+        summaries so each accession is parsed once.
+        """
+        edgar = self.edgar
+        cik = await self.get_cik(ticker)
+        key = (cik, accession_number)
+        filing_index = edgar.cached_filing_index(key)
+        if filing_index is not None:
+            return filing_index
+
+        base_link = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
+        summary_link = f"{base_link}/FilingSummary.xml"
+        if (
+            edgar.retrieval == submission_archive.ARCHIVE
+            and await self._run(self.cache.get, summary_link) is None
+        ):
+            # Archives are streamed to disk, which the synchronous transport already does.
+            await self._run(edgar._load_archive, base_link, accession_number)
+        content = await self._get(summary_link)
+        filing_index = await self._run(FilingIndex.from_xml, base_link, content)
+
+        edgar.remember_filing_index(key, filing_index)
+        return filing_index
+
+    async def get_statement_file_names_in_filing_summary(
+        self, ticker, accession_number, external: bool = False
+    ):
+        try:
+            filing_index = await self.get_filing_index(ticker, accession_number)
+            return filing_index.statement_file_names(external=external)
+        except httpx.HTTPError as e:
+            print(f"An error occurred: {e}")
+            return {}
+
+    async def get_statement_link(
+        self, ticker, accession_number, statement_name, external: bool = False
+    ) -> str:
+        try:
+            filing_index = await self.get_filing_index(ticker, accession_number)
+        except httpx.HTTPError as e:
+            print(f"An error occurred: {e}")
+            raise ValueError(f"Could not find statement file name for {statement_name}")
+
+        statement_link = self.edgar._find_statement_link(
+            filing_index, statement_name.lower(), external=external
+        )
+        if not statement_link:
+            raise ValueError(f"Could not find statement file name for {statement_name}")
+        return statement_link
+
+    async def _get_content(self, statement_link: str) -> bytes:
+        try:
+            return await self._get(statement_link)
+        except httpx.HTTPError as e:
+            raise ValueError(f"Error fetching the statement: {e}")
+
+    async def get_statement_soup(self, ticker, accession_number, statement_name):
+        statement_link = await self.get_statement_link(ticker, accession_number, statement_name)
+        content = await self._get_content(statement_link)
+        return await self._run(self.edgar._make_soup, statement_link, content)
+
+    async def get_external_soup(self, ticker: str, accession_number: str, statement_name: str):
+        statement_link = await self.get_statement_link(
+            ticker, accession_number, statement_name, external=True
+        )
+        content = await self._get_content(statement_link)
+        return await self._run(self.edgar._make_soup, statement_link, content)
+
+    async def process_one_statement(self, ticker, accession_number, statement_name):
+        """
+        Same as 'Edgar.process_one_statement', sharing its statement memo.
+
+        Returns:
+            pd.DataFrame or None: DataFrame of the processed statement or None if an error occurs.
+        """
+        memo = self.edgar.memo
+        key = memo.key(accession_number, statement_name, self.edgar.parser)
+        df = await self._run(memo.get, key)
+        if df is not None:
+            return df
+        try:
+            statement_link = await self.get_statement_link(
+                ticker, accession_number, statement_name
+            )
+            content = await self._get_content(statement_link)
+        except Exception as e:
+            logging.error(
+                f"Failed to get statement soup: {e} for accession number: {accession_number}"
+            )
+            return None
+        df = await self._run(self.edgar.statement_frame, statement_link, content, accession_number)
+        if df is not None:
+            await self._run(memo.put, key, df)
+        return df
+
+    async def process_statements(self, ticker, accession_numbers: list, statement_names: list):
+        """
+        Processes every (accession number, statement) pair concurrently.
+
+        Returns:
+            dict: (accession number, statement name) -> DataFrame or None.
+        """
+        pairs = [(a, s) for a in accession_numbers for s in statement_names]
+        frames = await asyncio.gather(
+            *(self.process_one_statement(ticker, a, s) for a, s in pairs)
+        )
+        return dict(zip(pairs, frames))
+
+
+"""
+=====================================================
+Sync façade
+=====================================================
+"""
+
+
+class _LoopThread:
+    """Event loop running on a daemon thread, for calling coroutines from synchronous code."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+class SyncEdgar(Edgar):
+    """
+    'Edgar' whose requests are made by an 'AsyncEdgar' on a background event loop.
+
+    Drop-in for 'Edgar' (ex: 'SEC(..., edgar=SyncEdgar(headers))'): every method works unchanged,
+    while calls made from several threads share one asyncio client with its per-host limit.
+    'run' calls the coroutines of 'self.aio' directly, ex:
+    'edgar.run(edgar.aio.process_statements(ticker, accession_numbers, statements))'.
+    """
+
+    def __init__(self, headers, *args, per_host: int = 8, **kwargs) -> None:
+        super().__init__(headers, *args, **kwargs)
+        self._loop_thread = _LoopThread()
+        self.aio = AsyncEdgar(headers, edgar=self, per_host=per_host)
+
+    def run(self, coroutine):
+        """Runs a coroutine on the background loop and returns its result."""
+        return self._loop_thread.run(coroutine)
+
+    def _get(self, url: str, revalidate: bool = False) -> bytes:
+        try:
+            return self.run(self.aio._get(url, revalidate))
+        except httpx.HTTPStatusError as e:
+            # Callers of 'Edgar' handle the requests exceptions.
+            raise _as_requests_error(e) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def close(self):
+        self.run(self.aio.aclose())
+        self._loop_thread.loop.call_soon_threadsafe(self._loop_thread.loop.stop)
+
+
+def _as_requests_error(error: httpx.HTTPStatusError):
+    response = requests.Response()
+    response.status_code = error.response.status_code
+    response.url = str(error.request.url)
+    response.headers.update(error.response.headers)
+    return requests.HTTPError(str(error), response=response)
@@ -0,0 +1,244 @@
+import os
+import bisect
+import pickle
+import tempfile
+import threading
+
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.registry import process_wide
+
+
+class CIKResolver:
+    """
+    In-memory index over the CIK table stored at 'SEC/Periphery/Storage/cik.csv'.
+
+    The table is parsed once and kept as dictionaries keyed by ticker and by CIK. The file's
+    modification time is checked on every lookup, so a rewrite of the csv (for example by
+    'Edgar' with update=True) is picked up without restarting the process.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._by_ticker = {}
+        self._by_cik = {}
+        self._names = []
+
+    """
+    =====================================================
+    Loading
+    =====================================================
+    """
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _ensure_loaded(self):
+        mtime = self._current_mtime()
+        if mtime is None:
+            raise FileNotFoundError(self.path)
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._load(mtime)
+
+    def _load(self, mtime):
+        if self._load_sidecar(mtime):
+            self._mtime = mtime
+            return
+        # Setting col 'cik' to str keeps the leading 0's. Ex: 0000123456 -> 123456
+        df = pd.read_csv(self.path, dtype={"cik": str}, keep_default_na=False)
+        df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
+        self.load_records(
+            zip(df["index"].to_list(), df["cik"].to_list(), df["name"].to_list())
+        )
+        self._mtime = mtime
+
+    def _load_sidecar(self, mtime) -> bool:
+        """
+        Loads the pickled index written next to the csv by 'write_cik_table'. The sidecar is
+        only trusted when it was written for the csv's current modification time.
+        """
+        try:
+            with open(sidecar_path(self.path), "rb") as f:
+                payload = pickle.load(f)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return False
+        if payload.get("csv_mtime") != mtime:
+            return False
+        self.load_records(payload["records"])
+        return True
+
+    def load_records(self, records):
+        """
+        Rebuilds the indexes from an iterable of (ticker, cik, name) tuples.
+
+        Args:
+            records (iterable): Tuples of ticker, zero padded cik and company name.
+        """
+        by_ticker = {}
+        by_cik = {}
+        names = []
+        for ticker, cik, name in records:
+            ticker = str(ticker).upper()
+            by_ticker[ticker] = (cik, name)
+            by_cik.setdefault(cik, []).append(ticker)
+            names.append((str(name).lower(), ticker))
+        names.sort()
+        self._by_ticker = by_ticker
+        self._by_cik = by_cik
+        self._names = names
+
+    def refresh(self):
+        """Forces the table to be read again on the next lookup."""
+        self._mtime = None
+
+    """
+    =====================================================
+    Lookups
+    =====================================================
+    """
+
+    def get_cik(self, ticker: str) -> str:
+        """
+        Args:
+            ticker (str): The ticker symbol of the company.
+
+        Returns:
+            str: Zero padded cik. Raises 'KeyError' if the ticker is unknown.
+        """
+        self._ensure_loaded()
+        return self._by_ticker[ticker.upper()][0]
+
+    def get_name(self, ticker: str) -> str:
+        self._ensure_loaded()
+        return self._by_ticker[ticker.upper()][1]
+
+    def get_tickers(self, cik) -> list:
+        """
+        Args:
+            cik (str | int): The cik, with or without leading 0's.
+
+        Returns:
+            list: Tickers registered under the cik. Empty if the cik is unknown.
+        """
+        self._ensure_loaded()
+        cik = str(cik).zfill(10)
+        return list(self._by_cik.get(cik, []))
+
+    def search_name(self, prefix: str, limit: int = 10) -> list:
+        """
+        Case-insensitive search of company names starting with 'prefix'.
+
+        Args:
+            prefix (str): Start of the company name.
+            limit (int): Maximum number of matches returned.
+
+        Returns:
+            list: Tuples of (ticker, cik, name) sorted by name.
+        """
+        self._ensure_loaded()
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self._names, (prefix, ""))
+        matches = []
+        for name, ticker in self._names[start:]:
+            if not name.startswith(prefix) or len(matches) >= limit:
+                break
+            cik, full_name = self._by_ticker[ticker]
+            matches.append((ticker, cik, full_name))
+        return matches
+
+    def __contains__(self, ticker: str) -> bool:
+        self._ensure_loaded()
+        return ticker.upper() in self._by_ticker
+
+
+"""
+=====================================================
+Building
+=====================================================
+"""
+
+
+def sidecar_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".pkl"
+
+
+def build_cik_table(ticker_json: dict) -> pd.DataFrame:
+    """
+    Builds the cik table from SEC's 'company_tickers.json' in a single pass.
+
+    Args:
+        ticker_json (dict): Parsed 'company_tickers.json'. Values hold 'cik_str', 'ticker' and 'title'.
+
+    Returns:
+        pd.DataFrame: Columns 'cik' and 'name', indexed by ticker and sorted.
+    """
+    df = pd.DataFrame.from_records(
+        list(ticker_json.values()), columns=["cik_str", "ticker", "title"]
+    )
+    df["cik"] = df["cik_str"].astype(str).str.zfill(10)
+    df = df.rename(columns={"title": "name"})
+    # Later entries win, the same as assigning them one at a time.
+    df = df.drop_duplicates(subset="ticker", keep="last").set_index("ticker")
+    df.index.name = None
+    return df[["cik", "name"]].sort_index()
+
+
+def atomic_write(path: str, write):
+    """
+    Writes 'path' through a temporary file in the same folder that replaces it once complete, so
+    readers see the old file or the new one but never a partial write.
+
+    Args:
+        path (str): Destination file. Its folder is created if missing.
+        write (callable): Called with the temporary path to write to. Ex: df.to_csv
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_cik_table(df: pd.DataFrame, path: str, sidecar: bool = True):
+    """
+    Atomically writes the cik table to 'path'. Readers never see a partially written file.
+
+    Args:
+        df (pd.DataFrame): Table returned by 'build_cik_table'.
+        path (str): Destination csv.
+        sidecar (bool): Also write a pickled index next to the csv so later loads skip csv parsing.
+    """
+    atomic_write(path, df.to_csv)
+    if sidecar:
+        payload = {
+            "csv_mtime": os.stat(path).st_mtime_ns,
+            "records": list(zip(df.index, df["cik"], df["name"])),
+        }
+
+        def dump(tmp_path):
+            with open(tmp_path, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        atomic_write(sidecar_path(path), dump)
+
+
+@process_wide(lambda path: os.path.abspath(path))
+def get_resolver(path: str) -> CIKResolver:
+    """
+    Resolver of the cik table at 'path', shared by every Edgar so the table is loaded once.
+    """
+    return CIKResolver(path)
@@ -0,0 +1,111 @@
+import datetime as dt
+from typing import NamedTuple
+
+
+MASTER = "master"
+FORM = "form"
+INDEX_KINDS = (MASTER, FORM)
+
+
+class IndexEntry(NamedTuple):
+    """One filing listed in a daily 'master.idx' or 'form.idx'."""
+
+    cik: str
+    company: str
+    form_type: str
+    date_filed: dt.date
+    file_name: str
+
+    @property
+    def accession_number(self) -> str:
+        """Accession number with dashes. Ex: '0000320193-24-000123'"""
+        return self.file_name.rsplit("/", 1)[-1].split(".", 1)[0]
+
+
+def index_path(date: dt.date, kind: str = MASTER) -> str:
+    """
+    Returns:
+        str: Path of a daily index under 'Archives/edgar/daily-index'. Ex: '2024/QTR3/master.20240801.idx'
+    """
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"Unknown daily index '{kind}'. Use one of {INDEX_KINDS}.")
+    quarter = (date.month - 1) // 3 + 1
+    return f"{date.year}/QTR{quarter}/{kind}.{date:%Y%m%d}.idx"
+
+
+def _parse_date(value: str) -> dt.date:
+    # Daily indexes use 'YYYYMMDD', the quarterly ones 'YYYY-MM-DD'.
+    value = value.strip().replace("-", "")
+    return dt.date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
+def _body_lines(content: bytes):
+    """Lines after the dashed separator that ends the header."""
+    lines = content.decode("latin-1").splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith("---"):
+            return lines[i - 1], lines[i + 1 :]
+    return None, []
+
+
+def parse_master_index(content: bytes) -> list:
+    """
+    Parses a pipe delimited 'master.idx': 'CIK|Company Name|Form Type|Date Filed|Filename'.
+
+    Returns:
+        list: IndexEntry per filing.
+    """
+    _, lines = _body_lines(content)
+    entries = []
+    for line in lines:
+        fields = line.split("|")
+        if len(fields) != 5:
+            continue
+        cik, company, form_type, date_filed, file_name = fields
+        entries.append(
+            IndexEntry(
+                cik.strip().zfill(10),
+                company.strip(),
+                form_type.strip(),
+                _parse_date(date_filed),
+                file_name.strip(),
+            )
+        )
+    return entries
+
+
+def parse_form_index(content: bytes) -> list:
+    """
+    Parses a fixed width 'form.idx': Form Type, Company Name, CIK, Date Filed, File Name.
+
+    Form types can contain spaces, so the form column is cut at the 'Company Name' header and the
+    last three fields are split off the right of each line.
+
+    Returns:
+        list: IndexEntry per filing.
+    """
+    header, lines = _body_lines(content)
+    if header is None:
+        return []
+    company_start = header.find("Company Name")
+    entries = []
+    for line in lines:
+        if not line.strip():
+            continue
+        fields = line[company_start:].rsplit(None, 3)
+        if len(fields) != 4:
+            continue
+        company, cik, date_filed, file_name = fields
+        entries.append(
+            IndexEntry(
+                cik.zfill(10),
+                company.strip(),
+                line[:company_start].strip(),
+                _parse_date(date_filed),
+                file_name,
+            )
+        )
+    return entries
+
+
+PARSERS = {MASTER: parse_master_index, FORM: parse_form_index}
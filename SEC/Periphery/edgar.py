@@ -1,23 +1,128 @@
 import os
+import sys
+import json
+import zipfile
+import threading
+from collections import OrderedDict
 
-import numpy as np
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
 import logging
-import calendar
 
 # Periphery
-from SEC.Periphery.mappings import statement_keys_map
+from SEC.Periphery.cik_resolver import get_resolver, build_cik_table, write_cik_table
+from SEC.Periphery.http_cache import ResponseCache, get_cache
+from SEC.Periphery.transport import Transport, get_transport
+from SEC.Periphery.filing_index import FilingIndex
+from SEC.Periphery.filing_history import FilingHistory
+from SEC.Periphery import statement_parser
+from SEC.Periphery.facts_store import CompanyFacts, FactsStore, get_facts_store
+from SEC.Periphery.frames_store import FramesStore
+from SEC.Periphery import daily_index
+from SEC.Periphery import submission_archive
+from SEC.Periphery import statement_matcher
+from SEC.Periphery import mappings
+from SEC.Periphery.statement_memo import StatementMemo, get_statement_memo, source_version
+from SEC.Periphery.metrics import metrics
 
 
 class Edgar:
-    def __init__(self, headers, save: bool = False, update: bool = False) -> None:
+    daily_index_url = "https://www.sec.gov/Archives/edgar/daily-index"
+
+    def __init__(
+        self,
+        headers,
+        save: bool = False,
+        update: bool = False,
+        cache: ResponseCache = None,
+        transport: Transport = None,
+        parser: str = statement_parser.BS4,
+        facts_store: FactsStore = None,
+        retrieval: str = submission_archive.PAGES,
+        memo: StatementMemo = None,
+        frames_store: FramesStore = None,
+    ) -> None:
+        if parser not in statement_parser.PARSERS:
+            raise ValueError(
+                f"Unknown parser '{parser}'. Expected one of {statement_parser.PARSERS}"
+            )
+        if retrieval not in submission_archive.RETRIEVALS:
+            raise ValueError(
+                f"Unknown retrieval '{retrieval}'. Expected one of {submission_archive.RETRIEVALS}"
+            )
         self.headers = headers
+        self.parser = parser
+        # 'archive' downloads each accession once and serves its R pages from the cache.
+        self.retrieval = retrieval
         self.save = save
         self.update = update
-        self.cik_path = "SEC\\Periphery\\Storage\\cik.csv"
+        self.cik_path = os.path.join("SEC", "Periphery", "Storage", "cik.csv")
+        self.cik_resolver = get_resolver(self.cik_path)
+        # Responses for filed documents are reused across runs. Pass a cache to override the shared one.
+        self.cache = cache if cache is not None else get_cache()
+        # Pooled, rate limited session shared by every Edgar with the same headers.
+        self.transport = transport if transport is not None else get_transport(headers)
+        # Parsed FilingSummary.xml per (cik, accession), most recently used last.
+        self._filing_indexes = OrderedDict()
+        self._filing_indexes_lock = threading.Lock()
+        self.max_filing_indexes = 256
+        # Parsed company facts, shared across instances unless a store is passed.
+        self.facts_store = facts_store if facts_store is not None else get_facts_store()
+        # Filing history per ticker. Loaded lazily, see 'get_filing_history'.
+        self._filing_histories = {}
+        self._filing_histories_lock = threading.Lock()
+        # Finished statement frames per (accession, statement, parser), shared unless a memo is passed.
+        self.memo = memo if memo is not None else get_statement_memo(parser_version)
+        # Framed facts of every company, filled from the bulk 'companyfacts.zip' by 'ingest'.
+        self.frames_store = frames_store if frames_store is not None else FramesStore()
+
+    """
+    =====================================================
+    HTTP
+    =====================================================
+    """
+
+    def _get(self, url: str, revalidate: bool = False) -> bytes:
+        """
+        Gets the body of 'url', serving it from the response cache when possible.
+
+        An expired cache entry, or any entry when 'revalidate' is True, is checked with a conditional
+        request. A '304 Not Modified' answer serves the stored body without downloading it again.
+
+        Args:
+            url (str): URL to request.
+            revalidate (bool): Check a fresh cache entry with the server as well.
+
+        Returns:
+            bytes: The response body. Raises 'requests.HTTPError' for unsuccessful responses.
+        """
+        if not revalidate:
+            content = self.cache.get(url)
+            if content is not None:
+                metrics.count("cache", result="hit")
+                return content
+        stale, meta = self.cache.lookup(url)
+        conditional = self.cache.validators(meta) if stale is not None else {}
+        response = self.transport.get(url, headers=conditional or None)
+        if response.status_code == 304 and stale is not None:
+            metrics.count("cache", result="revalidated")
+            self.cache.revalidate(url, response.headers)
+            return stale
+        metrics.count("cache", result="miss")
+        response.raise_for_status()
+        if response.status_code == 304:
+            # Not modified, but there is no stored body to serve.
+            raise requests.HTTPError(
+                f"304 Not Modified without a cached body for url: {url}", response=response
+            )
+        if response.status_code == 200:
+            self.cache.put(url, response.content, response.headers)
+        return response.content
+
+    def _get_json(self, url: str, revalidate: bool = False):
+        return json.loads(self._get(url, revalidate))
 
     """
     =====================================================
@@ -26,39 +131,29 @@ class Edgar:
     """
 
     def get_cik(self, ticker: str):
+        with metrics.stage("get_cik"):
+            return self._get_cik(ticker)
+
+    def _get_cik(self, ticker: str):
         ticker = ticker.upper()
 
         if self.update:
             df = self._query_cik_data()
-            df.to_csv(self.cik_path)
+            write_cik_table(df, self.cik_path)
             cik = df.loc[ticker, "cik"]
         else:
             try:
-                # Setting col 'cik' to str allows "0's" to be read in. Without this it would cut the leading 0's. Ex: 0000123456 -> 123456
-                df = pd.read_csv(self.cik_path, dtype={"cik": str})
-                df.rename(columns={"Unnamed: 0": "index"}, inplace=True)
-                df.set_index("index", inplace=True)
-                cik = df.loc[ticker, "cik"]
+                cik = self.cik_resolver.get_cik(ticker)
             except FileNotFoundError:
                 df = self._query_cik_data()
                 if self.save:
-                    df.to_csv(self.cik_path)
+                    write_cik_table(df, self.cik_path)
                 cik = df.loc[ticker, "cik"]
         return cik
 
     def _query_cik_data(self):
-        ticker_json = requests.get(
-            "https://www.sec.gov/files/company_tickers.json", headers=self.headers
-        ).json()
-        cik_df = pd.DataFrame(columns=["cik", "name"])
-        for k, v in ticker_json.items():
-            cik = str(v["cik_str"])
-            cik = cik.zfill(10)
-            ticker = v["ticker"]
-            name = v["title"]
-            cik_df.loc[ticker, "cik"] = cik
-            cik_df.loc[ticker, "name"] = name
-        cik_df = cik_df.sort_index()
+        ticker_json = self._get_json("https://www.sec.gov/files/company_tickers.json")
+        cik_df = build_cik_table(ticker_json)
         return cik_df
 
     def get_submission_data_for_ticker(self, ticker, only_filings_df=False):
@@ -71,13 +166,57 @@ class Edgar:
         Returns:
             json: The submissions for the company.
         """
-        cik = self.get_cik(ticker)
-        url = f"https://data.sec.gov/submissions/CIK{cik}.json"
-        company_json = requests.get(url, headers=self.headers).json()
+        history = self.get_filing_history(ticker)
         if only_filings_df:
-            return pd.DataFrame(company_json["filings"]["recent"])
+            return history.recent
         else:
-            return company_json
+            return history.submissions
+
+    def get_filing_history(self, ticker) -> FilingHistory:
+        """
+        Gets the filing history of a ticker. The submissions JSON is downloaded once per Edgar instance
+        and its paginated shards are merged in, so later queries don't hit the network.
+
+        Args:
+            ticker (str): The ticker symbol of the company.
+
+        Returns:
+            FilingHistory: Lazily loaded filing history.
+        """
+        ticker = ticker.upper()
+        with self._filing_histories_lock:
+            history = self._filing_histories.get(ticker)
+            if history is None:
+                history = FilingHistory(self._get_json, self.get_cik(ticker))
+                self._filing_histories[ticker] = history
+        return history
+
+    """
+    =====================================================
+    Daily Index
+    =====================================================
+    """
+
+    def get_daily_index(self, date, kind: str = daily_index.MASTER) -> list:
+        """
+        Gets the filings EDGAR listed on one day.
+
+        Args:
+            date (datetime.date): Day the filings were accepted.
+            kind (str): 'master' or 'form'. Both list the same filings.
+
+        Returns:
+            list: daily_index.IndexEntry per filing. Empty for days without an index (weekends, holidays
+                or a day that isn't published yet).
+        """
+        url = f"{self.daily_index_url}/{daily_index.index_path(date, kind)}"
+        try:
+            content = self._get(url)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (403, 404):
+                return []
+            raise
+        return daily_index.PARSERS[kind](content)
 
     """
     =====================================================
@@ -91,68 +230,71 @@ class Edgar:
         )
         return filings.iloc[0]
 
-    def get_filtered_filings(self, ticker, ten_k=True, just_accession_numbers=False):
-        company_filings_df = self.get_submission_data_for_ticker(
-            ticker, only_filings_df=True
-        )
-        if ten_k:
-            df = company_filings_df[company_filings_df["form"] == "10-K"]
-        else:
-            df = company_filings_df[company_filings_df["form"] == "10-Q"]
+    def get_filtered_filings(
+        self, ticker, ten_k=True, just_accession_numbers=False, since=None
+    ):
+        history = self.get_filing_history(ticker)
+        form = "10-K" if ten_k else "10-Q"
         if just_accession_numbers:
-            df = df.set_index("reportDate")
-            accession_df = df["accessionNumber"]
-            return accession_df
+            return history.accession_numbers(form, since=since)
         else:
-            return df
+            return history.get(form, since=since)
 
     def get_facts(self, ticker):
         cik = self.get_cik(ticker)
         url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
-        company_facts = requests.get(url, headers=self.headers).json()
+        company_facts = self._get_json(url)
         return company_facts
 
-    def facts_DF(self, ticker):
-        facts = self.get_facts(ticker)
-        us_gaap_data = facts["facts"]["us-gaap"]
-        df_data = []
-        for fact, details in us_gaap_data.items():
-            for unit in details["units"]:
-                for item in details["units"][unit]:
-                    row = item.copy()
-                    row["fact"] = fact
-                    df_data.append(row)
-
-        df = pd.DataFrame(df_data)
-        df["end"] = pd.to_datetime(df["end"])
-        df["start"] = pd.to_datetime(df["start"])
-        df = df.drop_duplicates(subset=["fact", "end", "val"])
-        df.set_index("end", inplace=True)
-        labels_dict = {fact: details["label"] for fact, details in us_gaap_data.items()}
-        return df, labels_dict
+    def get_company_facts(self, ticker) -> CompanyFacts:
+        """
+        Gets the parsed company facts of a ticker. The companyfacts JSON is downloaded and parsed once
+        and held in a shared LRU store, so labels and the annual/quarterly views share it.
+        """
+        cik = self.get_cik(ticker)
+        return self.facts_store.get(cik, lambda: self.get_facts(ticker))
+
+    def facts_DF(self, ticker, taxonomies=("us-gaap",)):
+        """
+        Gets the company facts of a ticker as a typed, columnar DataFrame indexed by 'end'. A copy
+        of the frame held by the facts store, so callers may change it.
+
+        Args:
+            ticker (str): The ticker symbol of the company.
+            taxonomies (iterable): Taxonomies to include. Ex: ('us-gaap', 'dei', 'ifrs-full', 'srt'). All when None.
+
+        Returns:
+            tuple: (DataFrame, labels_dict)
+        """
+        df, labels_dict = self.get_company_facts(ticker).frame(taxonomies)
+        return df.copy(), dict(labels_dict)
+
+    def cross_section(self, concept: str, period: str, unit: str = None) -> pd.DataFrame:
+        """
+        Gets one concept for every company in one period from the local frames store, without a
+        request per company. Empty until the store was filled with 'FramesStore.ingest'.
+
+        Args:
+            concept (str): Fact name. Ex: 'Revenues'
+            period (str): Frame. Ex: 'CY2023Q1' for a duration, 'CY2023Q1I' for an instant.
+            unit (str): Only keep values in this unit. Ex: 'USD'
+
+        Returns:
+            pd.DataFrame: One row per company, indexed by cik.
+        """
+        return self.frames_store.cross_section(concept, period, unit)
 
     def annual_facts(self, ticker):
         accession_nums = self.get_filtered_filings(
             ticker, ten_k=True, just_accession_numbers=True
         )
-        df, label_dict = self.facts_DF(ticker)
-        ten_k = df[df["accn"].isin(accession_nums)]
-        ten_k = ten_k[ten_k.index.isin(accession_nums.index)]
-        pivot = ten_k.pivot_table(values="val", columns="fact", index="end")
-        pivot.rename(columns=label_dict, inplace=True)
-        return pivot.T
+        return self.get_company_facts(ticker).annual(accession_nums).copy()
 
     def quarterly_facts(self, ticker):
         accession_nums = self.get_filtered_filings(
             ticker, ten_k=False, just_accession_numbers=True
         )
-        df, label_dict = self.facts_DF(ticker)
-        ten_q = df[df["accn"].isin(accession_nums)]
-        ten_q = ten_q[ten_q.index.isin(accession_nums.index)].reset_index(drop=False)
-        ten_q = ten_q.drop_duplicates(subset=["fact", "end"], keep="last")
-        pivot = ten_q.pivot_table(values="val", columns="fact", index="end")
-        pivot.rename(columns=label_dict, inplace=True)
-        return pivot.T
+        return self.get_company_facts(ticker).quarterly(accession_nums).copy()
 
     def save_dataframe_to_csv(
         self, dataframe, folder_name, ticker, statement_name, frequency
@@ -163,59 +305,160 @@ class Edgar:
         dataframe.to_csv(file_path)
         return None
 
-    def _get_file_name(self, report):
-        html_file_name_tag = report.find("HtmlFileName")
-        xml_file_name_tag = report.find("XmlFileName")
+    """
+    =====================================================
+    Filing Summary
+    =====================================================
+    """
+
+    def cached_filing_index(self, key):
+        """
+        Args:
+            key (tuple): (cik, accession number without dashes).
 
-        if html_file_name_tag:
-            return html_file_name_tag.text
-        elif xml_file_name_tag:
-            return xml_file_name_tag.text
-        else:
-            return ""
-
-    def _is_statement_file(self, short_name_tag, long_name_tag, file_name):
-        return (
-            short_name_tag is not None
-            and long_name_tag is not None
-            and file_name  # Check if file_name is not an empty string
-            and "Statement" in long_name_tag.text
-        )
+        Returns:
+            FilingIndex | None: The parsed filing summary kept for 'key', None when there is none.
+        """
+        with self._filing_indexes_lock:
+            filing_index = self._filing_indexes.get(key)
+            if filing_index is not None:
+                self._filing_indexes.move_to_end(key)
+            return filing_index
+
+    def remember_filing_index(self, key, filing_index: FilingIndex):
+        """
+        Keeps a parsed filing summary for 'cached_filing_index', dropping the least recently used
+        ones beyond 'max_filing_indexes'.
+        """
+        with self._filing_indexes_lock:
+            self._filing_indexes[key] = filing_index
+            self._filing_indexes.move_to_end(key)
+            while len(self._filing_indexes) > self.max_filing_indexes:
+                self._filing_indexes.popitem(last=False)
+
+    def get_filing_index(self, ticker, accession_number) -> FilingIndex:
+        """
+        Gets the parsed FilingSummary.xml of an accession. The summary is downloaded and parsed once
+        per accession and reused by every statement lookup.
+
+        Args:
+            ticker (str): The ticker symbol of the company.
+            accession_number (str): Accession number without dashes.
+
+        Returns:
+            FilingIndex: Reports listed in the filing summary.
+        """
+        cik = self.get_cik(ticker)
+        key = (cik, accession_number)
+        filing_index = self.cached_filing_index(key)
+        if filing_index is not None:
+            return filing_index
+
+        base_link = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
+        summary_link = f"{base_link}/FilingSummary.xml"
+        with metrics.stage("filing_summary"):
+            if (
+                self.retrieval == submission_archive.ARCHIVE
+                and self.cache.get(summary_link) is None
+            ):
+                self._load_archive(base_link, accession_number)
+            content = self._get(summary_link)
+            filing_index = FilingIndex.from_xml(base_link, content)
+
+        self.remember_filing_index(key, filing_index)
+        return filing_index
+
+    def _load_archive(self, base_link: str, accession_number: str) -> bool:
+        """
+        Downloads an accession's archive in one request and stores its FilingSummary.xml and R pages
+        in the response cache under their own URLs, so the page lookups that follow are cache hits.
+        The archive is streamed, only the rendered documents are held in memory.
+
+        Returns:
+            bool: Whether an archive with a filing summary was found. When False the pages are
+                requested one by one.
+        """
+        for source in submission_archive.SOURCES:
+            url = submission_archive.archive_url(base_link, accession_number, source)
+            try:
+                response = self.transport.get(url, stream=True)
+            except requests.RequestException as e:
+                logging.error(f"Could not download {url}: {e}")
+                continue
+            try:
+                if response.status_code != 200:
+                    continue
+                documents = submission_archive.read_documents(source, response)
+            except (requests.RequestException, ValueError, zipfile.BadZipFile) as e:
+                logging.error(f"Could not read {url}: {e}")
+                continue
+            finally:
+                response.close()
+            if "FilingSummary.xml" not in documents:
+                continue
+            for name, content in documents.items():
+                self.cache.put(f"{base_link}/{name}", content)
+            return True
+        return False
 
     def get_statement_file_names_in_filing_summary(
         self, ticker, accession_number, external: bool = False
     ):
         try:
-            session = requests.Session()
-            cik = self.get_cik(ticker)
-            base_link = (
-                f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
-            )
-            filing_summary_link = f"{base_link}/FilingSummary.xml"
-            filing_summary_response = session.get(
-                filing_summary_link, headers=self.headers
-            ).content.decode("utf-8")
-
-            filing_summary_soup = BeautifulSoup(filing_summary_response, "lxml-xml")
-            statement_file_names_dict = {}
-            ext = []
-            for report in filing_summary_soup.find_all("Report"):
-                file_name = self._get_file_name(report)
-                short_name, long_name = report.find("ShortName"), report.find(
-                    "LongName"
-                )
-                if external:
-                    statement_file_names_dict[short_name.text.lower()] = file_name
-                elif not external:
-                    if self._is_statement_file(short_name, long_name, file_name):
-                        statement_file_names_dict[short_name.text.lower()] = file_name
-
-            return statement_file_names_dict
+            filing_index = self.get_filing_index(ticker, accession_number)
+            return filing_index.statement_file_names(external=external)
 
         except requests.RequestException as e:
             print(f"An error occurred: {e}")
             return {}
 
+    def _find_statement_link(
+        self, filing_index: FilingIndex, statement_name: str, external: bool = False
+    ):
+        match = filing_index.find(statement_name, external=external)
+        if match is None:
+            return None
+        return filing_index.link(match.report.file_name)
+
+    def _get_content(self, statement_link: str) -> bytes:
+        try:
+            with metrics.stage("statement_fetch"):
+                return self._get(statement_link)
+        except requests.RequestException as e:
+            raise ValueError(f"Error fetching the statement: {e}")
+
+    def _make_soup(self, statement_link: str, statement_content: bytes) -> BeautifulSoup:
+        return statement_parser.make_soup(statement_link, statement_content)
+
+    def _get_soup(self, statement_link: str) -> BeautifulSoup:
+        return self._make_soup(statement_link, self._get_content(statement_link))
+
+    def get_statement_link(self, ticker, accession_number, statement_name) -> str:
+        """
+        Finds the link of a statement's R page in the filing summary. Raises 'ValueError' if the
+        statement can't be found.
+        """
+        try:
+            filing_index = self.get_filing_index(ticker, accession_number)
+        except requests.RequestException as e:
+            print(f"An error occurred: {e}")
+            raise ValueError(f"Could not find statement file name for {statement_name}")
+        print(f"[Base]: {filing_index.base_link}")
+
+        statement_link = self._find_statement_link(filing_index, statement_name.lower())
+
+        if not statement_link:
+            raise ValueError(f"Could not find statement file name for {statement_name}")
+        return statement_link
+
+    def get_statement_content(self, ticker, accession_number, statement_name):
+        """
+        Returns:
+            tuple: The statement's link and the raw bytes of its R page.
+        """
+        statement_link = self.get_statement_link(ticker, accession_number, statement_name)
+        return statement_link, self._get_content(statement_link)
+
     def get_statement_soup(
         self,
         ticker,
@@ -228,147 +471,47 @@ class Edgar:
         'income_statement'
         'cash_flow_statement'
         """
-        session = requests.Session()
-
-        cik = self.get_cik(ticker)
-        base_link = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
-        print(f"[Base]: {base_link}")
-        statement_file_name_dict = self.get_statement_file_names_in_filing_summary(
-            ticker, accession_number
-        )
-
-        statement_link = None
-        for possible_key in statement_keys_map.get(statement_name.lower(), []):
-            file_name = statement_file_name_dict.get(possible_key.lower())
-            if file_name:
-                statement_link = f"{base_link}/{file_name}"
-                break
-
-        if not statement_link:
-            raise ValueError(f"Could not find statement file name for {statement_name}")
-
-        try:
-            statement_response = session.get(statement_link, headers=self.headers)
-            statement_response.raise_for_status()  # Check if the request was successful
-
-            if statement_link.endswith(".xml"):
-                return BeautifulSoup(
-                    statement_response.content, "lxml-xml", from_encoding="utf-8"
-                )
-            else:
-                return BeautifulSoup(statement_response.content, "lxml")
-
-        except requests.RequestException as e:
-            raise ValueError(f"Error fetching the statement: {e}")
+        statement_link = self.get_statement_link(ticker, accession_number, statement_name)
+        return self._get_soup(statement_link)
 
     def get_external_soup(
         self, ticker: str, accession_number: str, statement_name: str
     ):
-        session = requests.Session()
-        cik = self.get_cik(ticker)
-        base_link = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}"
-        statement_file_name_dict = self.get_statement_file_names_in_filing_summary(
-            ticker, accession_number, external=True
-        )
-        # print(statement_file_name_dict)
+        try:
+            filing_index = self.get_filing_index(ticker, accession_number)
+        except requests.RequestException as e:
+            print(f"An error occurred: {e}")
+            raise ValueError(f"Could not find statement file name for {statement_name}")
 
-        statement_link = None
-        for possible_key in statement_keys_map.get(statement_name, []):
-            file_name = statement_file_name_dict.get(possible_key.lower())
-            if file_name:
-                statement_link = f"{base_link}/{file_name}"
-                print(f"Statement: {statement_link}")
-                break
+        statement_link = self._find_statement_link(
+            filing_index, statement_name, external=True
+        )
+        if statement_link:
+            print(f"Statement: {statement_link}")
 
         if not statement_link:
             raise ValueError(f"Could not find statement file name for {statement_name}")
 
-        try:
-            statement_response = session.get(statement_link, headers=self.headers)
-            statement_response.raise_for_status()  # Check if the request was successful
+        return self._get_soup(statement_link)
 
-            if statement_link.endswith(".xml"):
-                return BeautifulSoup(
-                    statement_response.content, "lxml-xml", from_encoding="utf-8"
-                )
-            else:
-                return BeautifulSoup(statement_response.content, "lxml")
+    def extract_statement(self, statement_link: str, content: bytes):
+        """
+        Extracts columns, values and dates from the raw bytes of a statement page with the parser
+        engine selected for this instance. Legacy '.xml' statements always use BeautifulSoup.
 
-        except requests.RequestException as e:
-            raise ValueError(f"Error fetching the statement: {e}")
+        Returns:
+            tuple: Tuple containing columns, values_set, and date_time_index.
+        """
+        return statement_parser.extract_statement(statement_link, content, self.parser)
 
     def extract_columns_values_and_dates_from_statement(self, soup: BeautifulSoup):
         """
-        Extracts columns, values, and dates from an HTML soup object representing a financial statement.
-
-        Args:
-            soup (BeautifulSoup): The BeautifulSoup object of the HTML document.
+        BeautifulSoup engine, see 'statement_parser.extract_columns_values_and_dates_from_soup'.
 
         Returns:
             tuple: Tuple containing columns, values_set, and date_time_index.
         """
-        columns = []
-        values_set = []
-        date_time_index = self.get_datetime_index_dates_from_statement(soup)
-
-        for table in soup.find_all("table"):
-            unit_multiplier = 1
-            special_case = False
-
-            # Check table headers for unit multipliers and special cases
-            table_header = table.find("th")
-            if table_header:
-                header_text = table_header.get_text()
-                # Determine unit multiplier based on header text
-                if "in Thousands" in header_text:
-                    unit_multiplier = 1
-                elif "in Millions" in header_text:
-                    unit_multiplier = 1000
-                # Check for special case scenario
-                if "unless otherwise specified" in header_text:
-                    special_case = True
-
-            # Process each row of the table
-            for row in table.select("tr"):
-                onclick_elements = row.select("td.pl a, td.pl.custom a")
-                if not onclick_elements:
-                    continue
-
-                # Extract column title from 'onclick' attribute
-                onclick_attr = onclick_elements[0]["onclick"]
-                column_title = onclick_attr.split("defref_")[-1].split("',")[0]
-                columns.append(column_title)
-
-                # Initialize values array with NaNs
-                values = [np.nan] * len(date_time_index)
-
-                # Process each cell in the row
-                for i, cell in enumerate(row.select("td.text, td.nump, td.num")):
-                    if "text" in cell.get("class"):
-                        continue
-
-                    # Clean and parse cell value
-                    value = self.keep_numbers_and_decimals_only_in_string(
-                        cell.text.replace("$", "")
-                        .replace(",", "")
-                        .replace("(", "")
-                        .replace(")", "")
-                        .strip()
-                    )
-                    if value:
-                        value = float(value)
-                        # Adjust value based on special case and cell class
-                        if special_case:
-                            value /= 1000
-                        else:
-                            if "nump" in cell.get("class"):
-                                values[i] = value * unit_multiplier
-                            else:
-                                values[i] = -value * unit_multiplier
-
-                values_set.append(values)
-
-        return columns, values_set, date_time_index
+        return statement_parser.extract_columns_values_and_dates_from_soup(soup)
 
     def get_datetime_index_dates_from_statement(
         self,
@@ -383,11 +526,7 @@ class Edgar:
         Returns:
             pd.DatetimeIndex: A Pandas DatetimeIndex object containing the extracted dates.
         """
-        table_headers = soup.find_all("th", {"class": "th"})
-        dates = [str(th.div.string) for th in table_headers if th.div and th.div.string]
-        dates = [self.standardize_date(date).replace(".", "") for date in dates]
-        index_dates = pd.to_datetime(dates)
-        return index_dates
+        return statement_parser.get_soup_dates(soup)
 
     def standardize_date(self, date: str) -> str:
         """
@@ -399,41 +538,7 @@ class Edgar:
         Returns:
             str: The standardized date string.
         """
-        for abbr, full in zip(calendar.month_abbr[1:], calendar.month_name[1:]):
-            date = date.replace(abbr, full)
-        return date
-
-    def keep_numbers_and_decimals_only_in_string(self, mixed_string: str):
-        """
-        Filters a string to keep only numbers and decimal points.
-
-        Args:
-            mixed_string (str): The string containing mixed characters.
-
-        Returns:
-            str: String containing only numbers and decimal points.
-        """
-        num = "1234567890."
-        allowed = list(filter(lambda x: x in num, mixed_string))
-        return "".join(allowed)
-
-    def create_dataframe_of_statement_values_columns_dates(
-        self, values_set, columns, index_dates
-    ) -> pd.DataFrame:
-        """
-        Creates a DataFrame from statement values, columns, and index dates.
-
-        Args:
-            values_set (list): List of values for each column.
-            columns (list): List of column names.
-            index_dates (pd.DatetimeIndex): DatetimeIndex for the DataFrame index.
-
-        Returns:
-            pd.DataFrame: DataFrame constructed from the given data.
-        """
-        transposed_values_set = list(zip(*values_set))
-        df = pd.DataFrame(transposed_values_set, columns=columns, index=index_dates)
-        return df
+        return statement_parser.standardize_date(date)
 
     def process_one_statement(
         self, ticker, accession_number, statement_name, external: bool = False
@@ -449,8 +554,18 @@ class Edgar:
         Returns:
             pd.DataFrame or None: DataFrame of the processed statement or None if an error occurs.
         """
+        key = self.memo.key(accession_number, statement_name, self.parser)
+        df = self.memo.get(key)
+        if df is not None:
+            return df
+        df = self._process_one_statement(ticker, accession_number, statement_name)
+        if df is not None:
+            self.memo.put(key, df)
+        return df
+
+    def _process_one_statement(self, ticker, accession_number, statement_name):
         try:
-            soup = self.get_statement_soup(
+            statement_link, content = self.get_statement_content(
                 ticker,
                 accession_number,
                 statement_name,
@@ -461,41 +576,30 @@ class Edgar:
             )
             return None
 
-        if soup:
-            try:
-                # Extract data and create DataFrame
-                columns, values, dates = (
-                    self.extract_columns_values_and_dates_from_statement(soup)
-                )
-                df = self.create_dataframe_of_statement_values_columns_dates(
-                    values, columns, dates
-                )
-
-                if not df.empty:
-                    # Remove duplicate columns
-                    df = df.T.drop_duplicates()
-                else:
-                    logging.warning(
-                        f"Empty DataFrame for accession number: {accession_number}"
-                    )
-                    return None
-
-                return df
-            except Exception as e:
-                logging.error(f"Error processing statement: {e}")
-                return None
+        return self.statement_frame(statement_link, content, accession_number)
+
+    def statement_frame(self, statement_link: str, content: bytes, accession_number: str):
+        """
+        Builds the statement frame from the raw bytes of its R page. CPU only, no I/O.
+
+        Returns:
+            pd.DataFrame or None: Line items x period dates, or None if the page has no values.
+        """
+        with metrics.stage("extract"):
+            return self._statement_frame(statement_link, content, accession_number)
+
+    def _statement_frame(self, statement_link: str, content: bytes, accession_number: str):
+        return statement_parser.page_frame(statement_link, content, self.parser, accession_number)
 
     def get_label_dictionary(self, ticker):
-        facts = self.get_facts(ticker)
-        us_gaap_data = facts["facts"]["us-gaap"]
-        labels_dict = {fact: details["label"] for fact, details in us_gaap_data.items()}
-        return labels_dict
+        return dict(self.get_company_facts(ticker).labels)
 
     def rename_statement(self, statement, label_dictionary):
-        # Extract the part after the first "_" and then map it using the label dictionary
-        statement.index = statement.index.map(
-            lambda x: label_dictionary.get(x.split("_", 1)[-1], x)
-        )
+        with metrics.stage("rename_statement"):
+            # Extract the part after the first "_" and then map it using the label dictionary
+            statement.index = statement.index.map(
+                lambda x: label_dictionary.get(x.split("_", 1)[-1], x)
+            )
         return statement
 
     """
@@ -523,3 +627,15 @@ class Edgar:
         cols = soup.find_all("td")
 
         print(f"Headers: {headers}   Cols: {cols}")
+
+
+# Code that decides which report is read and how it becomes a frame. Memoized statements written by
+# any other version of it are ignored; edits to the rest of Edgar keep them.
+parser_version = source_version(
+    sys.modules[FilingIndex.__module__],
+    statement_parser,
+    statement_matcher,
+    mappings,
+    Edgar._find_statement_link,
+    Edgar.get_statement_link,
+)
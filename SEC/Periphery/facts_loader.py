@@ -0,0 +1,137 @@
+from array import array
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+
+# Fields of a company-facts item, besides 'val', 'fy' and the period dates. All are categoricals,
+# 'filed' included: it keeps its 'YYYY-MM-DD' strings, as the row-dict loader did.
+_string_fields = ("accn", "fp", "form", "filed", "frame")
+# Fields present on every item. The others ('start', 'fy', 'fp', 'frame') can be missing or null.
+_required_fields = ("end", "val", "accn", "form", "filed")
+_getters = {field: itemgetter(field) for field in _required_fields}
+
+
+def _to_datetime(values: list) -> np.ndarray:
+    # numpy parses ISO dates in C. Missing dates become NaT.
+    return np.array(values, dtype="datetime64[D]").astype("datetime64[ns]")
+
+
+def _to_categorical(values: list) -> pd.Categorical:
+    codes, categories = pd.factorize(np.array(values, dtype=object), sort=True)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _codes_to_categorical(codes: array, names: list) -> pd.Categorical:
+    # Sorted categories keep groupby/pivot output in the same order as plain string columns.
+    order = np.argsort(np.array(names, dtype=object), kind="stable")
+    remap = np.empty(len(names), dtype=np.int32)
+    remap[order] = np.arange(len(names), dtype=np.int32)
+    return pd.Categorical.from_codes(
+        remap[np.frombuffer(codes, dtype=np.int32)],
+        categories=[names[i] for i in order],
+    )
+
+
+def load_facts_frame(facts: dict, taxonomies=None):
+    """
+    Builds a columnar DataFrame from a parsed 'companyfacts/CIK##########.json'.
+
+    Every item is appended straight into per-field arrays instead of being copied into a row dict, so
+    the only per-item Python objects are the ones already held by the parsed JSON. Repetitive string
+    fields ('filed' included) become categoricals, 'start' and 'end' become datetime64 and 'val' is
+    float64.
+
+    Args:
+        facts (dict): Parsed company facts JSON.
+        taxonomies (iterable): Taxonomies to load. Ex: ('us-gaap', 'dei'). All of them when None.
+
+    Returns:
+        tuple: (DataFrame, labels_dict). The DataFrame has one row per reported value with the columns
+            'taxonomy', 'fact', 'unit', 'start', 'end', 'val', 'accn', 'fy', 'fp', 'form', 'filed'
+            and 'frame'. labels_dict maps every fact name to its label.
+    """
+    all_facts = facts.get("facts", {})
+    if taxonomies is None:
+        taxonomies = list(all_facts)
+
+    taxonomy_names = []
+    fact_names = []
+    unit_names = []
+    fact_codes_by_name = {}
+    unit_codes_by_name = {}
+    labels_dict = {}
+
+    taxonomy_codes = array("i")
+    fact_codes = array("i")
+    unit_codes = array("i")
+    vals = array("d")
+    fys = array("d")
+    starts = []
+    ends = []
+    strings = {field: [] for field in _string_fields}
+
+    for taxonomy in taxonomies:
+        taxonomy_data = all_facts.get(taxonomy)
+        if not taxonomy_data:
+            continue
+        taxonomy_code = len(taxonomy_names)
+        taxonomy_names.append(taxonomy)
+        for fact, details in taxonomy_data.items():
+            # The same fact name can appear in more than one taxonomy.
+            fact_code = fact_codes_by_name.get(fact)
+            if fact_code is None:
+                fact_code = fact_codes_by_name[fact] = len(fact_names)
+                fact_names.append(fact)
+            labels_dict.setdefault(fact, details.get("label"))
+            for unit, items in details.get("units", {}).items():
+                unit_code = unit_codes_by_name.get(unit)
+                if unit_code is None:
+                    unit_code = unit_codes_by_name[unit] = len(unit_names)
+                    unit_names.append(unit)
+                count = len(items)
+                taxonomy_codes.extend([taxonomy_code] * count)
+                fact_codes.extend([fact_code] * count)
+                unit_codes.extend([unit_code] * count)
+                # One pass per field keeps the per-item work in C for the required fields.
+                vals.extend(map(_getters["val"], items))
+                fys.extend([item.get("fy") or np.nan for item in items])
+                starts.extend([item.get("start") for item in items])
+                ends.extend(map(_getters["end"], items))
+                for field in _string_fields:
+                    if field in _getters:
+                        strings[field].extend(map(_getters[field], items))
+                    else:
+                        strings[field].extend([item.get(field) for item in items])
+
+    columns = {
+        "taxonomy": _codes_to_categorical(taxonomy_codes, taxonomy_names),
+        "fact": _codes_to_categorical(fact_codes, fact_names),
+        "unit": _codes_to_categorical(unit_codes, unit_names),
+        "start": _to_datetime(starts),
+        "end": _to_datetime(ends),
+        "val": np.frombuffer(vals, dtype=np.float64),
+        "fy": pd.array(np.frombuffer(fys, dtype=np.float64), dtype="Int64"),
+    }
+    for field in _string_fields:
+        columns[field] = _to_categorical(strings.pop(field))
+
+    df = pd.DataFrame(
+        columns,
+        columns=[
+            "taxonomy",
+            "fact",
+            "unit",
+            "start",
+            "end",
+            "val",
+            "accn",
+            "fy",
+            "fp",
+            "form",
+            "filed",
+            "frame",
+        ],
+    )
+    return df, labels_dict
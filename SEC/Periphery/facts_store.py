@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.registry import process_wide
+from SEC.Periphery.facts_loader import load_facts_frame
+
+
+# Columns of a company-facts item as the SEC lists them, then the fact name.
+facts_columns = ("start", "val", "accn", "fy", "fp", "form", "filed", "frame", "fact")
+
+
+class CompanyFacts:
+    """
+    Company facts of one company, parsed once. Labels, the facts frame and the annual/quarterly pivots
+    are derived views that are computed on first use and then reused.
+    """
+
+    def __init__(self, facts: dict) -> None:
+        """
+        Args:
+            facts (dict): Parsed 'companyfacts/CIK##########.json'. It is not kept after construction.
+        """
+        self._frame, _ = load_facts_frame(facts)
+        self.labels_by_taxonomy = {
+            taxonomy: {fact: details.get("label") for fact, details in data.items()}
+            for taxonomy, data in facts.get("facts", {}).items()
+        }
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def _view(self, key, build):
+        with self._lock:
+            view = self._views.get(key)
+        if view is None:
+            view = build()
+            with self._lock:
+                self._views[key] = view
+        return view
+
+    @property
+    def labels(self) -> dict:
+        """us-gaap fact name -> label."""
+        return self.labels_by_taxonomy.get("us-gaap", {})
+
+    def frame(self, taxonomies=("us-gaap",)):
+        """
+        Args:
+            taxonomies (iterable): Taxonomies to include. All when None.
+
+        Returns:
+            tuple: (DataFrame indexed by 'end', labels_dict). The columns of the row-dict frame
+                'Edgar.facts_DF' used to build, in the same order. Shared, treat it as read-only.
+        """
+        key = ("frame", None if taxonomies is None else tuple(taxonomies))
+
+        def build():
+            df = self._frame
+            if taxonomies is not None:
+                df = df[df["taxonomy"].isin(taxonomies)]
+            df = df.drop_duplicates(subset=["fact", "end", "val"])
+            df = df.set_index("end")[list(facts_columns)]
+            labels_dict = {}
+            for taxonomy, labels in self.labels_by_taxonomy.items():
+                if taxonomies is None or taxonomy in taxonomies:
+                    for fact, label in labels.items():
+                        labels_dict.setdefault(fact, label)
+            return df, labels_dict
+
+        return self._view(key, build)
+
+    def annual(self, accession_nums: pd.Series) -> pd.DataFrame:
+        """
+        Args:
+            accession_nums (pd.Series): 10-K accession numbers indexed by report date.
+
+        Returns:
+            pd.DataFrame: Facts x period end of the 10-K values.
+        """
+        key = ("annual", tuple(accession_nums.to_list()), tuple(accession_nums.index))
+
+        def build():
+            df, label_dict = self.frame()
+            ten_k = df[df["accn"].isin(accession_nums)]
+            ten_k = ten_k[ten_k.index.isin(pd.to_datetime(accession_nums.index))]
+            pivot = ten_k.pivot_table(values="val", columns="fact", index="end")
+            pivot.rename(columns=label_dict, inplace=True)
+            return pivot.T
+
+        return self._view(key, build)
+
+    def quarterly(self, accession_nums: pd.Series) -> pd.DataFrame:
+        """
+        Args:
+            accession_nums (pd.Series): 10-Q accession numbers indexed by report date.
+
+        Returns:
+            pd.DataFrame: Facts x period end of the 10-Q values.
+        """
+        key = ("quarterly", tuple(accession_nums.to_list()), tuple(accession_nums.index))
+
+        def build():
+            df, label_dict = self.frame()
+            ten_q = df[df["accn"].isin(accession_nums)]
+            report_dates = pd.to_datetime(accession_nums.index)
+            ten_q = ten_q[ten_q.index.isin(report_dates)].reset_index(drop=False)
+            ten_q = ten_q.drop_duplicates(subset=["fact", "end"], keep="last")
+            pivot = ten_q.pivot_table(values="val", columns="fact", index="end")
+            pivot.rename(columns=label_dict, inplace=True)
+            return pivot.T
+
+        return self._view(key, build)
+
+
+class FactsStore:
+    """
+    Least recently used store of 'CompanyFacts' keyed by cik. Each company's facts are downloaded and
+    parsed once while they stay in the store; at most 'max_companies' are held in memory.
+    """
+
+    def __init__(self, max_companies: int = 8) -> None:
+        self.max_companies = max_companies
+        self._companies = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def get(self, cik: str, fetch) -> CompanyFacts:
+        """
+        Args:
+            cik (str): Zero padded cik.
+            fetch (callable): Returns the parsed company facts JSON. Only called on a miss.
+
+        Returns:
+            CompanyFacts: The company's facts.
+        """
+        with self._lock:
+            company = self._companies.get(cik)
+            if company is not None:
+                self._companies.move_to_end(cik)
+                return company
+            # One lock per cik so concurrent callers for the same company share one download.
+            loading = self._loading.setdefault(cik, threading.Lock())
+
+        with loading:
+            with self._lock:
+                company = self._companies.get(cik)
+            if company is None:
+                company = CompanyFacts(fetch())
+                with self._lock:
+                    self._companies[cik] = company
+                    while len(self._companies) > self.max_companies:
+                        self._companies.popitem(last=False)
+        with self._lock:
+            self._loading.pop(cik, None)
+        return company
+
+    def evict(self, cik: str):
+        with self._lock:
+            self._companies.pop(cik, None)
+
+    def clear(self):
+        with self._lock:
+            self._companies.clear()
+
+
+@process_wide(lambda max_companies: max_companies)
+def get_facts_store(max_companies: int = 8) -> FactsStore:
+    """
+    Facts store holding at most 'max_companies', shared by every Edgar.
+    """
+    return FactsStore(max_companies)
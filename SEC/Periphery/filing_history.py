@@ -0,0 +1,181 @@
+import threading
+
+import pandas as pd
+
+
+class FilingHistory:
+    """
+    Filing history of one company, built from 'submissions/CIK##########.json'.
+
+    The submissions JSON is downloaded on first use only. 'filings.recent' holds at most the latest
+    1000 filings, so the older pages listed under 'filings.files' are merged in as well. Filings are
+    indexed by form type so later queries don't do any I/O.
+    """
+
+    submissions_url = "https://data.sec.gov/submissions"
+
+    def __init__(self, get_json, cik: str, include_history: bool = True) -> None:
+        """
+        Args:
+            get_json (callable): Fetches and decodes a JSON URL. Normally 'Edgar._get_json'.
+            cik (str): Zero padded cik.
+            include_history (bool): Merge the paginated 'filings.files' shards.
+        """
+        self._get_json = get_json
+        self.cik = cik
+        self.include_history = include_history
+        self._lock = threading.RLock()
+        self._submissions = None
+        # (filings, {form: filings of that form}) built from '_submissions', None until first use.
+        # Replaced as a whole, so a reader never pairs the filings of one download with the forms
+        # of another.
+        self._index = None
+
+    """
+    =====================================================
+    Loading
+    =====================================================
+    """
+
+    @property
+    def submissions(self) -> dict:
+        if self._submissions is None:
+            with self._lock:
+                if self._submissions is None:
+                    self._submissions = self._get_json(
+                        f"{self.submissions_url}/CIK{self.cik}.json"
+                    )
+        return self._submissions
+
+    def refresh(self):
+        """
+        Checks the submissions JSON with the server (a conditional request when it is cached) and
+        rebuilds the filings from it on next use.
+        """
+        with self._lock:
+            submissions = self._get_json(
+                f"{self.submissions_url}/CIK{self.cik}.json", revalidate=True
+            )
+            self._submissions, self._index = submissions, None
+
+    @property
+    def recent(self) -> pd.DataFrame:
+        """Filings listed under 'filings.recent', as the SEC returns them."""
+        return pd.DataFrame(self.submissions["filings"]["recent"])
+
+    @property
+    def filings(self) -> pd.DataFrame:
+        """
+        Every known filing, newest first. 'reportDate' and 'filingDate' stay strings, their parsed
+        values are in 'reportDate_dt' and 'filingDate_dt'.
+        """
+        return self._filing_index()[0]
+
+    def _filing_index(self) -> tuple:
+        index = self._index
+        if index is None:
+            with self._lock:
+                index = self._index
+                if index is None:
+                    index = self._index = self._build_index(self.submissions)
+        return index
+
+    def _build_index(self, submissions: dict) -> tuple:
+        filings = submissions["filings"]
+        frames = [pd.DataFrame(filings["recent"])]
+        if self.include_history:
+            for shard in filings.get("files", []):
+                frames.append(
+                    pd.DataFrame(self._get_json(f"{self.submissions_url}/{shard['name']}"))
+                )
+        df = pd.concat(frames, ignore_index=True)
+        if df.empty:
+            return df, {}
+        df = df.drop_duplicates(subset="accessionNumber", keep="first")
+        df["reportDate_dt"] = pd.to_datetime(df["reportDate"], errors="coerce")
+        df["filingDate_dt"] = pd.to_datetime(df["filingDate"], errors="coerce")
+        df = df.sort_values(
+            ["filingDate_dt", "accessionNumber"], ascending=False, kind="stable"
+        ).reset_index(drop=True)
+        return df, {form: group for form, group in df.groupby("form", sort=False)}
+
+    """
+    =====================================================
+    Queries
+    =====================================================
+    """
+
+    def get(self, form: str, since=None, until=None) -> pd.DataFrame:
+        """
+        Args:
+            form (str): Form type. Ex: '10-K', '10-Q'
+            since (str | datetime): Only filings whose report date is on or after this date.
+            until (str | datetime): Only filings whose report date is on or before this date.
+
+        Returns:
+            pd.DataFrame: Matching filings, newest first.
+        """
+        filings, by_form = self._filing_index()
+        if filings.empty:
+            return filings
+        df = by_form.get(form)
+        if df is None:
+            return filings.iloc[0:0]
+        if since is not None:
+            df = df[df["reportDate_dt"] >= pd.Timestamp(since)]
+        if until is not None:
+            df = df[df["reportDate_dt"] <= pd.Timestamp(until)]
+        return df
+
+    def accession_numbers(self, form: str, since=None, until=None) -> pd.Series:
+        """
+        Returns:
+            pd.Series: Accession numbers (with dashes) indexed by 'reportDate', newest first.
+        """
+        df = self.get(form, since, until)
+        if df.empty:
+            return pd.Series(dtype=str)
+        return df.set_index("reportDate")["accessionNumber"]
+
+    def accession_numbers_after(self, form: str, after) -> pd.Series:
+        """
+        Filings of 'form' whose report date is after 'after'.
+
+        A filing is filed after the period it reports on, so when 'filings.recent' reaches back past
+        'after' it holds every such filing and the paginated shards aren't downloaded.
+
+        Returns:
+            pd.Series: Accession numbers (with dashes) indexed by 'reportDate', newest first.
+        """
+        after = pd.Timestamp(after)
+        recent = self.recent
+        if not recent.empty:
+            filing_dates = pd.to_datetime(recent["filingDate"], errors="coerce")
+            if filing_dates.min() <= after:
+                report_dates = pd.to_datetime(recent["reportDate"], errors="coerce")
+                df = recent.assign(filingDate_dt=filing_dates)
+                df = df[(df["form"] == form) & (report_dates > after)]
+                df = df.sort_values(
+                    ["filingDate_dt", "accessionNumber"], ascending=False, kind="stable"
+                )
+                return df.set_index("reportDate")["accessionNumber"]
+        df = self.get(form, since=after)
+        if df.empty:
+            return pd.Series(dtype=str)
+        df = df[df["reportDate_dt"] > after]
+        return df.set_index("reportDate")["accessionNumber"]
+
+    def latest(self, form: str):
+        """
+        Returns:
+            str | None: Accession number (with dashes) of the newest filing of 'form'.
+        """
+        df = self.get(form)
+        if df.empty:
+            return None
+        return df["accessionNumber"].iloc[0]
+
+    @property
+    def fiscal_year_end(self) -> str:
+        """Fiscal year end as 'MMDD'. Ex: '0930'"""
+        return self.submissions.get("fiscalYearEnd")
@@ -0,0 +1,113 @@
+from typing import NamedTuple
+
+from lxml import etree
+
+# Periphery
+from SEC.Periphery.statement_matcher import default_matcher
+
+
+class Report(NamedTuple):
+    """One <Report> entry of a filing's FilingSummary.xml."""
+
+    position: int
+    short_name: str
+    long_name: str
+    file_name: str
+    menu_category: str
+
+    @property
+    def is_statement(self) -> bool:
+        return bool(self.file_name) and "Statement" in self.long_name
+
+
+class FilingIndex:
+    """
+    Parsed FilingSummary.xml of one accession. The summary is parsed once and every statement
+    lookup for that accession, including the external tables, reads from it.
+    """
+
+    def __init__(self, base_link: str, reports: list) -> None:
+        self.base_link = base_link
+        self.reports = reports
+        self._file_names = None
+        self._external_file_names = None
+        self._matches = {}
+
+    @classmethod
+    def from_xml(cls, base_link: str, content: bytes):
+        """
+        Args:
+            base_link (str): Archive folder of the accession. Ex: 'https://www.sec.gov/Archives/edgar/data/{cik}/{accession}'
+            content (bytes): Body of FilingSummary.xml.
+
+        Returns:
+            FilingIndex: Index of every report in the summary.
+        """
+        parser = etree.XMLParser(recover=True, huge_tree=True)
+        root = etree.fromstring(content, parser=parser)
+        reports = []
+        if root is not None:
+            for position, report in enumerate(root.iter("Report")):
+                short_name = report.find("ShortName")
+                if short_name is None:
+                    continue
+                long_name = report.find("LongName")
+                reports.append(
+                    Report(
+                        position=position,
+                        short_name=(short_name.text or "").strip(),
+                        long_name=(long_name.text or "") if long_name is not None else "",
+                        file_name=cls._get_file_name(report),
+                        menu_category=report.findtext("MenuCategory") or "",
+                    )
+                )
+        return cls(base_link, reports)
+
+    @staticmethod
+    def _get_file_name(report) -> str:
+        html_file_name = report.findtext("HtmlFileName")
+        if html_file_name:
+            return html_file_name
+        return report.findtext("XmlFileName") or ""
+
+    def statement_file_names(self, external: bool = False) -> dict:
+        """
+        Args:
+            external (bool): Include every report, not just the ones whose long name marks them as a statement.
+
+        Returns:
+            dict: Lowercased short name -> file name.
+        """
+        if external:
+            if self._external_file_names is None:
+                self._external_file_names = {
+                    r.short_name.lower(): r.file_name for r in self.reports
+                }
+            return self._external_file_names
+        if self._file_names is None:
+            self._file_names = {
+                r.short_name.lower(): r.file_name
+                for r in self.reports
+                if r.is_statement
+            }
+        return self._file_names
+
+    def find(self, statement_name: str, external: bool = False, matcher=default_matcher):
+        """
+        Finds the report of a statement. Resolved once per statement name and reused.
+
+        Args:
+            statement_name (str): Ex: 'balance_sheet', 'income_statement', 'cash_flow', 'segments'
+            external (bool): Consider every report, not just statements.
+            matcher (StatementMatcher): Resolves names to reports.
+
+        Returns:
+            statement_matcher.Match | None: The report and how it was matched.
+        """
+        key = (statement_name.lower(), external, id(matcher))
+        if key not in self._matches:
+            self._matches[key] = matcher.match(statement_name, self.reports, external)
+        return self._matches[key]
+
+    def link(self, file_name: str) -> str:
+        return f"{self.base_link}/{file_name}"
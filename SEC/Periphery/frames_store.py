@@ -0,0 +1,198 @@
+import os
+import json
+import uuid
+import shutil
+import logging
+import zipfile
+
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.facts_loader import load_facts_frame
+
+
+default_frames_dir = os.path.join("SEC", "Periphery", "Storage", "frames")
+
+
+class FramesStore:
+    """
+    Local cross-sectional store of XBRL facts, built from SEC's bulk 'companyfacts.zip'.
+
+    Only values that carry a 'frame' (Ex: 'CY2023Q1', 'CY2023Q4I') are kept. Those are the values SEC
+    aligns to calendar periods for its frames API, one per company, concept, unit and period. They
+    are written as Parquet, one partition per period with rows sorted by concept, so a lookup such as
+    'Revenues' for 'CY2023Q1' across every company reads only the row groups holding 'Revenues' in
+    that period's partition.
+    """
+
+    def __init__(self, directory: str = default_frames_dir, row_group_size: int = 8192) -> None:
+        self.directory = directory
+        self.row_group_size = row_group_size
+
+    """
+    =====================================================
+    Ingestion
+    =====================================================
+    """
+
+    @staticmethod
+    def _iter_source(source: str):
+        """Yields parsed company facts from a 'companyfacts.zip' or a folder of CIK##########.json files."""
+        if os.path.isdir(source):
+            for name in sorted(os.listdir(source)):
+                if name.endswith(".json"):
+                    with open(os.path.join(source, name), "rb") as f:
+                        yield name, json.load(f)
+            return
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.infolist():
+                if member.is_dir() or not member.filename.endswith(".json"):
+                    continue
+                # Members are read one at a time, so only one company is held in memory.
+                with archive.open(member) as f:
+                    yield member.filename, json.load(f)
+
+    @staticmethod
+    def company_frame(facts: dict, taxonomies=("us-gaap",)) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: The framed values of one company with its 'cik' and 'entity' name.
+        """
+        df, _ = load_facts_frame(facts, taxonomies)
+        df = df[df["frame"].notna()]
+        df.insert(0, "cik", str(facts.get("cik", "")).zfill(10))
+        df.insert(1, "entity", facts.get("entityName"))
+        return df
+
+    def ingest(
+        self,
+        source: str,
+        taxonomies=("us-gaap",),
+        flush_rows: int = 1_000_000,
+        overwrite: bool = True,
+    ) -> dict:
+        """
+        Streams every company of 'source' into the store.
+
+        Args:
+            source (str): Path to 'companyfacts.zip' or to a folder mirroring its members.
+            taxonomies (iterable): Taxonomies to ingest. All when None.
+            flush_rows (int): Rows buffered in memory before they are written out.
+            overwrite (bool): Remove what is already in the store first.
+
+        Returns:
+            dict: Number of companies, skipped members and rows written.
+        """
+        if overwrite:
+            self.clear()
+        buffer = []
+        buffered = 0
+        summary = {"companies": 0, "skipped": 0, "rows": 0}
+        for name, facts in self._iter_source(source):
+            try:
+                df = self.company_frame(facts, taxonomies)
+            except (KeyError, TypeError, ValueError) as e:
+                logging.warning(f"Skipping {name}: {e}")
+                summary["skipped"] += 1
+                continue
+            summary["companies"] += 1
+            if df.empty:
+                continue
+            buffer.append(df)
+            buffered += len(df)
+            if buffered >= flush_rows:
+                summary["rows"] += self._flush(buffer)
+                buffer, buffered = [], 0
+        summary["rows"] += self._flush(buffer)
+        return summary
+
+    def _flush(self, frames: list) -> int:
+        if not frames:
+            return 0
+        df = pd.concat(frames, ignore_index=True)
+        # Categories differ between companies, so string columns are written as plain strings.
+        strings = ("entity", "taxonomy", "fact", "unit", "accn", "fp", "form", "filed", "frame")
+        for column in strings:
+            df[column] = df[column].astype(str)
+        df.sort_values(["frame", "fact", "cik"], inplace=True, kind="stable")
+        for period, group in df.groupby("frame", sort=False):
+            path = self._partition(period)
+            os.makedirs(path, exist_ok=True)
+            # Each flush adds a part file. The leading underscore hides it from readers until it is complete.
+            temp_path = os.path.join(path, f"_{uuid.uuid4().hex}.tmp")
+            group.drop(columns="frame").to_parquet(
+                temp_path, index=False, engine="pyarrow", row_group_size=self.row_group_size
+            )
+            os.replace(temp_path, os.path.join(path, f"part-{uuid.uuid4().hex}.parquet"))
+        return len(df)
+
+    def compact(self):
+        """
+        Rewrites every period written by more than one flush as a single file sorted by concept.
+
+        The compacted file is in place before the parts it replaces are removed, so a crash in
+        between never loses values. It only leaves them twice until the next 'compact', which drops
+        the repeated rows.
+        """
+        for period in self.periods():
+            path = self._partition(period)
+            parts = [name for name in os.listdir(path) if name.endswith(".parquet")]
+            if len(parts) < 2:
+                continue
+            df = pd.read_parquet(path, engine="pyarrow").drop_duplicates(ignore_index=True)
+            df.sort_values(["fact", "cik"], inplace=True, kind="stable")
+            temp_path = os.path.join(path, f"_{uuid.uuid4().hex}.tmp")
+            df.to_parquet(temp_path, index=False, engine="pyarrow", row_group_size=self.row_group_size)
+            os.replace(temp_path, os.path.join(path, f"part-{uuid.uuid4().hex}.parquet"))
+            for part in parts:
+                os.remove(os.path.join(path, part))
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    """
+    =====================================================
+    Queries
+    =====================================================
+    """
+
+    def _partition(self, period: str) -> str:
+        return os.path.join(self.directory, f"frame={period}")
+
+    def periods(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name.split("=", 1)[1]
+            for name in os.listdir(self.directory)
+            if name.startswith("frame=")
+        )
+
+    def concepts(self, period: str) -> list:
+        path = self._partition(period)
+        if not os.path.isdir(path):
+            return []
+        return sorted(pd.read_parquet(path, columns=["fact"], engine="pyarrow")["fact"].unique())
+
+    def cross_section(self, concept: str, period: str, unit: str = None) -> pd.DataFrame:
+        """
+        Gets one concept for every company in one period.
+
+        Args:
+            concept (str): Fact name. Ex: 'Revenues'
+            period (str): Frame. Ex: 'CY2023Q1' for a duration, 'CY2023Q1I' for an instant.
+            unit (str): Only keep values in this unit. Ex: 'USD'
+
+        Returns:
+            pd.DataFrame: One row per company, indexed by cik.
+        """
+        path = self._partition(period)
+        if not os.path.isdir(path):
+            return pd.DataFrame()
+        filters = [("fact", "==", concept)]
+        if unit is not None:
+            filters.append(("unit", "==", unit))
+        # Parts are sorted by concept, so row group statistics skip everything but 'concept'.
+        df = pd.read_parquet(path, engine="pyarrow", filters=filters)
+        return df.set_index("cik").sort_index()
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Periphery
+from SEC.Periphery.registry import process_wide
+from SEC.Periphery.cik_resolver import atomic_write
+
+
+default_cache_dir = os.path.join("SEC", "Periphery", "Storage", "http_cache")
+
+# Filed documents never change once they are on EDGAR.
+IMMUTABLE = "immutable"
+
+
+class ResponseCache:
+    """
+    On-disk cache of EDGAR responses keyed by URL.
+
+    Each entry is stored as '<sha256(url)>.body' with a '.json' metadata file next to it. Archive
+    documents ('/Archives/edgar/data/...') are kept forever, 'submissions' and 'companyfacts'
+    responses expire after 'ttl' seconds, and every other URL is not cached. Expired entries keep their
+    'ETag'/'Last-Modified' so they can be revalidated with a conditional request. The total size of the
+    bodies is capped at 'max_bytes'; when it is exceeded the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        directory: str = default_cache_dir,
+        max_bytes: int = 2 * 1024**3,
+        ttl: float = 24 * 60 * 60,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._size = None
+
+    """
+    =====================================================
+    Policy
+    =====================================================
+    """
+
+    def policy(self, url: str):
+        """
+        Args:
+            url (str): Requested URL.
+
+        Returns:
+            str | float | None: IMMUTABLE, a ttl in seconds or None if the URL is not cached.
+        """
+        if "/Archives/edgar/data/" in url:
+            return IMMUTABLE
+        if "data.sec.gov/submissions/" in url or "/api/xbrl/companyfacts/" in url:
+            return self.ttl
+        return None
+
+    """
+    =====================================================
+    Entries
+    =====================================================
+    """
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _paths(self, url: str):
+        key = self._key(url)
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, f"{key}.body"), os.path.join(folder, f"{key}.json")
+
+    def _read_meta(self, meta_path: str):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def is_fresh(self, meta: dict) -> bool:
+        expires = meta.get("expires")
+        return expires is None or expires > time.time()
+
+    def get(self, url: str):
+        """
+        Args:
+            url (str): Requested URL.
+
+        Returns:
+            bytes | None: Cached body, or None on a miss or an expired entry.
+        """
+        if self.policy(url) is None:
+            return None
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if meta is None or not self.is_fresh(meta):
+            return None
+        try:
+            with open(body_path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        # Touch the entry so eviction treats it as recently used.
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return content
+
+    def lookup(self, url: str):
+        """
+        Gets an entry whether or not it expired, for revalidation.
+
+        Returns:
+            tuple: (body, metadata), or (None, None) when nothing is stored for 'url'.
+        """
+        if self.policy(url) is None:
+            return None, None
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if meta is None:
+            return None, None
+        try:
+            with open(body_path, "rb") as f:
+                return f.read(), meta
+        except FileNotFoundError:
+            return None, None
+
+    @staticmethod
+    def validators(meta: dict) -> dict:
+        """
+        Returns:
+            dict: Conditional request headers for a stored entry. Empty if it has no validators.
+        """
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def revalidate(self, url: str, headers: dict = None):
+        """
+        Marks a stored entry as fresh again after the server answered '304 Not Modified'.
+
+        Args:
+            url (str): Requested URL.
+            headers (dict): Headers of the 304 response. Updated validators replace the stored ones.
+        """
+        policy = self.policy(url)
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path)
+        if policy is None or meta is None:
+            return
+        headers = headers or {}
+        meta["stored"] = time.time()
+        meta["expires"] = None if policy == IMMUTABLE else time.time() + policy
+        meta["etag"] = headers.get("ETag") or meta.get("etag")
+        meta["last_modified"] = headers.get("Last-Modified") or meta.get("last_modified")
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def put(self, url: str, content: bytes, headers: dict = None):
+        """
+        Stores 'content' for 'url' if the URL is cacheable.
+
+        Args:
+            url (str): Requested URL.
+            content (bytes): Response body.
+            headers (dict): Response headers. 'ETag' and 'Last-Modified' are kept with the entry.
+        """
+        policy = self.policy(url)
+        if policy is None:
+            return
+        headers = headers or {}
+        body_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "stored": time.time(),
+            "expires": None if policy == IMMUTABLE else time.time() + policy,
+            "size": len(content),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        previous = self._read_meta(meta_path)
+        self._write(body_path, content)
+        self._write(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            if self._size is not None:
+                self._size += len(content) - (previous["size"] if previous else 0)
+        self._evict_if_needed()
+
+    def _write(self, path: str, data: bytes):
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+
+        atomic_write(path, write)
+
+    def delete(self, url: str):
+        body_path, meta_path = self._paths(url)
+        self._remove_entry(body_path, meta_path)
+
+    def _remove_entry(self, body_path: str, meta_path: str):
+        size = 0
+        try:
+            size = os.path.getsize(body_path)
+            os.remove(body_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    """
+    =====================================================
+    Eviction
+    =====================================================
+    """
+
+    def _entries(self):
+        """Yields (last_used, size, body_path) for every stored body."""
+        if not os.path.isdir(self.directory):
+            return
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".body"):
+                    stat = entry.stat()
+                    yield stat.st_mtime, stat.st_size, entry.path
+
+    def size(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            return self._size
+
+    def _evict_if_needed(self):
+        if self.size() <= self.max_bytes:
+            return
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            # Evict down to 90% of the cap so a full cache doesn't rescan on every put.
+            target = int(self.max_bytes * 0.9)
+            evicted = []
+            for _, size, body_path in entries:
+                if total <= target:
+                    break
+                evicted.append(body_path)
+                total -= size
+            self._size = None
+        for body_path in evicted:
+            self._remove_entry(body_path, body_path[: -len(".body")] + ".json")
+
+    def clear(self):
+        for _, _, body_path in list(self._entries()):
+            self._remove_entry(body_path, body_path[: -len(".body")] + ".json")
+        with self._lock:
+            self._size = 0
+
+
+@process_wide(lambda directory: os.path.abspath(directory))
+def get_cache(directory: str = default_cache_dir) -> ResponseCache:
+    """
+    Response cache shared by every Edgar using 'directory'.
+    """
+    return ResponseCache(directory)
@@ -0,0 +1,318 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import nullcontext
+
+
+# Upper bounds in seconds. The last bucket catches everything slower.
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")
+)
+
+# Stages timed across SEC and Edgar, in pipeline order.
+STAGES = (
+    "get_cik",
+    "filing_summary",
+    "statement_fetch",
+    "extract",
+    "process_statement",
+    "rename_statement",
+    "export",
+)
+
+_null_timer = nullcontext()
+
+
+class Histogram:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound if bound != float("inf") else self.max
+        return self.max
+
+    def copy(self):
+        other = Histogram(self.buckets)
+        other.counts = list(self.counts)
+        other.count, other.sum, other.max = self.count, self.sum, self.max
+        return other
+
+    def minus(self, earlier):
+        """
+        Observations made after 'earlier', a copy of this histogram.
+
+        Single observations aren't kept, so the 'max' of the difference is an upper bound: the bound
+        of the highest bucket that got observations since 'earlier', or this histogram's max when
+        that is lower or the bucket is unbounded.
+        """
+        other = self.copy()
+        if earlier is not None:
+            other.counts = [a - b for a, b in zip(self.counts, earlier.counts)]
+            other.count -= earlier.count
+            other.sum -= earlier.sum
+            other.max = 0.0
+            for bound, count in zip(reversed(self.buckets), reversed(other.counts)):
+                if count:
+                    other.max = min(bound, self.max)
+                    break
+        return other
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name: str, labels: tuple) -> None:
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics._observe(self.name, self.labels, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Process-wide counters and latency histograms for requests, the response cache and the stages
+    of statement processing.
+
+    Disabled by default, or enabled by setting the 'SEC_METRICS' environment variable to 1, true,
+    yes or on. While disabled every call returns right after checking 'enabled', and 'timer' hands
+    back one shared no-op context manager, so instrumented code costs a method call per event.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    """
+    =====================================================
+    Recording
+    =====================================================
+    """
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Adds 'value' to the counter 'name' with 'labels'. Ex: count('cache', result='hit')"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Records one duration in the histogram 'name' with 'labels'."""
+        if not self.enabled:
+            return
+        self._observe(name, tuple(sorted(labels.items())), seconds)
+
+    def _observe(self, name: str, labels: tuple, seconds: float):
+        key = (name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name: str, **labels):
+        """Context manager recording the duration of its block in the histogram 'name'."""
+        if not self.enabled:
+            return _null_timer
+        return _Timer(self, name, tuple(sorted(labels.items())))
+
+    def stage(self, stage: str):
+        """Times one of 'STAGES'."""
+        if not self.enabled:
+            return _null_timer
+        return _Timer(self, "stage_seconds", (("stage", stage),))
+
+    def request(self, url: str, status: int, seconds: float, size: int):
+        """Records one HTTP response: count by status, bytes and latency, all per host."""
+        if not self.enabled:
+            return
+        host = url.split("/", 3)[2] if "://" in url else url
+        self.count("requests", host=host, status=status)
+        self.count("response_bytes", size, host=host)
+        self.observe("request_seconds", seconds, host=host)
+
+    """
+    =====================================================
+    Reports
+    =====================================================
+    """
+
+    def snapshot(self) -> dict:
+        """Copy of every counter and histogram, to report on what happens after it."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {k: h.copy() for k, h in self._histograms.items()},
+            }
+
+    def report(self, since: dict = None) -> dict:
+        """
+        Args:
+            since (dict): A 'snapshot'. Only what was recorded after it is reported.
+
+        Returns:
+            dict: 'requests', 'cache' and 'stages' sections. Durations are in seconds.
+        """
+        current = self.snapshot()
+        earlier = since or {"counters": {}, "histograms": {}}
+        counters = {
+            key: value - earlier["counters"].get(key, 0)
+            for key, value in current["counters"].items()
+        }
+        histograms = {
+            key: histogram.minus(earlier["histograms"].get(key))
+            for key, histogram in current["histograms"].items()
+        }
+
+        requests_by_host = {}
+        for (name, labels), value in counters.items():
+            labels = dict(labels)
+            if name == "requests":
+                host = requests_by_host.setdefault(labels["host"], {"statuses": {}})
+                host["statuses"][str(labels["status"])] = value
+            elif name == "response_bytes":
+                requests_by_host.setdefault(labels["host"], {"statuses": {}})["bytes"] = value
+        for (name, labels), histogram in histograms.items():
+            if name == "request_seconds":
+                host = requests_by_host.setdefault(dict(labels)["host"], {"statuses": {}})
+                host["latency"] = _summary(histogram)
+
+        cache = {
+            dict(labels)["result"]: value
+            for (name, labels), value in counters.items()
+            if name == "cache"
+        }
+        lookups = sum(cache.values())
+        stages = {
+            dict(labels)["stage"]: _summary(histogram)
+            for (name, labels), histogram in histograms.items()
+            if name == "stage_seconds" and histogram.count
+        }
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return {
+            "requests": requests_by_host,
+            "cache": dict(cache, hit_rate=cache.get("hit", 0) / lookups if lookups else 0.0),
+            "stages": dict(sorted(stages.items(), key=lambda s: order.get(s[0], len(order)))),
+        }
+
+    def to_json(self, since: dict = None) -> str:
+        return json.dumps(self.report(since), indent=2)
+
+    def to_prometheus(self, prefix: str = "sec_") -> str:
+        """
+        Every counter and histogram in the Prometheus text exposition format.
+        """
+        lines = []
+        snapshot = self.snapshot()
+        for name in sorted({name for name, _ in snapshot["counters"]}):
+            lines.append(f"# TYPE {prefix}{name}_total counter")
+            for (n, labels), value in sorted(snapshot["counters"].items()):
+                if n == name:
+                    lines.append(f"{prefix}{name}_total{_labels(labels)} {value}")
+        for name in sorted({name for name, _ in snapshot["histograms"]}):
+            lines.append(f"# TYPE {prefix}{name} histogram")
+            for (n, labels), histogram in sorted(snapshot["histograms"].items()):
+                if n != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    bucket_labels = _labels(labels + (("le", le),))
+                    lines.append(f"{prefix}{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{_labels(labels)} {histogram.sum}")
+                lines.append(f"{prefix}{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _summary(histogram: Histogram) -> dict:
+    return {
+        "count": histogram.count,
+        "total": histogram.sum,
+        "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+        "p50": histogram.quantile(0.5),
+        "p95": histogram.quantile(0.95),
+        "max": histogram.max,
+    }
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def format_report(report: dict, title: str = "Metrics") -> str:
+    """
+    Returns:
+        str: 'report' as the lines 'print_report' prints.
+    """
+    lines = [f"[{title}]"]
+    for host, stats in report["requests"].items():
+        statuses = ", ".join(f"{s}: {c:,.0f}" for s, c in stats["statuses"].items())
+        latency = stats.get("latency", {})
+        lines.append(
+            f"    {host}: {statuses}  {stats.get('bytes', 0) / 1e6:,.2f} MB  "
+            f"p50 {latency.get('p50', 0) * 1e3:,.0f} ms  p95 {latency.get('p95', 0) * 1e3:,.0f} ms"
+        )
+    cache = report["cache"]
+    if len(cache) > 1:
+        counts = ", ".join(f"{k}: {v:,.0f}" for k, v in cache.items() if k != "hit_rate")
+        lines.append(f"    Cache: {counts}  (hit rate {cache['hit_rate']:.0%})")
+    for stage, stats in report["stages"].items():
+        lines.append(
+            f"    {stage}: {stats['count']:,} calls  {stats['total']:.3f}s  "
+            f"(mean {stats['mean'] * 1e3:,.2f} ms)"
+        )
+    return "\n".join(lines)
+
+
+def print_report(report: dict, title: str = "Metrics"):
+    print(format_report(report, title))
+
+
+metrics = Metrics(
+    enabled=os.environ.get("SEC_METRICS", "").lower() in ("1", "true", "yes", "on")
+)
@@ -0,0 +1,201 @@
+import os
+import time
+import queue
+import logging
+import threading
+from typing import NamedTuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.edgar import Edgar
+from SEC.Periphery import statement_parser
+from SEC.Periphery.metrics import metrics
+
+
+class ParsedStatement(NamedTuple):
+    """
+    Statement frame as plain arrays, which pickle far smaller and faster than a DataFrame or soup.
+    """
+
+    items: np.ndarray
+    periods: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        return cls(np.asarray(df.index, dtype=str), df.columns.to_numpy(), df.to_numpy())
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.values, index=pd.Index(self.items), columns=pd.DatetimeIndex(self.periods)
+        )
+
+
+"""
+=====================================================
+Worker processes
+=====================================================
+"""
+
+# Parser engine of each worker process. Workers only parse, they hold no session, cache or memo.
+_worker_parser = statement_parser.BS4
+
+
+def _init_worker(parser: str):
+    global _worker_parser
+    _worker_parser = parser
+
+
+def parse_page(statement_link: str, content: bytes, accession_number: str):
+    """
+    Parses one R page in a worker process.
+
+    Returns:
+        tuple: (ParsedStatement or None if the page has no values, seconds spent parsing).
+    """
+    start = time.perf_counter()
+    df = statement_parser.page_frame(statement_link, content, _worker_parser, accession_number)
+    parsed = None if df is None else ParsedStatement.from_frame(df)
+    return parsed, time.perf_counter() - start
+
+
+"""
+=====================================================
+Pipeline
+=====================================================
+"""
+
+_done = object()
+
+
+class ParsePipeline:
+    """
+    Two stage statement processing: threads download R pages, processes parse them.
+
+    The I/O threads put raw page bytes on a queue of at most 'queue_size' pages and block while it
+    is full; pages are handed to the process pool with at most two per process in flight, and each
+    parsed page is turned into its frame as soon as it completes. Memory is thus bounded by about
+    'queue_size + 2 * processes' pages however many filings are processed, plus the frames
+    returned, and parsing runs on every core instead of behind the GIL of the downloading threads.
+    """
+
+    def __init__(
+        self,
+        edgar: Edgar,
+        io_workers: int = 4,
+        processes: int = None,
+        queue_size: int = 16,
+    ) -> None:
+        """
+        Args:
+            edgar (Edgar): Fetches the pages and holds the statement memo.
+            io_workers (int): Threads downloading pages. All share the Edgar rate limiter.
+            processes (int): Parsing processes. Defaults to the number of cores.
+            queue_size (int): Pages downloaded ahead of the parsers.
+        """
+        self.edgar = edgar
+        self.io_workers = io_workers
+        self.processes = processes or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(self.edgar.parser,),
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _fetch(self, ticker: str, accession_number: str, statement_name: str):
+        try:
+            return self.edgar.get_statement_content(ticker, accession_number, statement_name)
+        except Exception as e:
+            logging.error(
+                f"Failed to get statement soup: {e} for accession number: {accession_number}"
+            )
+            return None, None
+
+    def run(self, ticker: str, tasks: list) -> dict:
+        """
+        Processes (accession number, statement name) pairs of one company.
+
+        Returns:
+            dict: Pair -> statement DataFrame, or None for statements that failed to process. Same
+                frames as 'Edgar.process_one_statement', and stored in its memo the same way.
+        """
+        memo = self.edgar.memo
+        results = {}
+        missing = []
+        for task in tasks:
+            df = memo.get(memo.key(*task, self.edgar.parser))
+            if df is not None:
+                results[task] = df
+            else:
+                missing.append(task)
+        if not missing:
+            return results
+
+        pages = queue.Queue(maxsize=self.queue_size)
+
+        def produce():
+            def fetch(task):
+                # Blocks while the parsers are behind.
+                pages.put((task, *self._fetch(ticker, *task)))
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.io_workers) as io:
+                    list(io.map(fetch, missing))
+            finally:
+                pages.put(_done)
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        def finish(done):
+            for future in done:
+                task = in_flight.pop(future)
+                try:
+                    parsed, seconds = future.result()
+                    # Workers have their own metrics, their parse time is recorded here.
+                    metrics.observe("stage_seconds", seconds, stage="extract")
+                except Exception as e:
+                    logging.error(f"Error processing statement: {e}")
+                    parsed = None
+                df = None if parsed is None else parsed.to_frame()
+                if df is not None:
+                    memo.put(memo.key(*task, self.edgar.parser), df)
+                results[task] = df
+
+        # Future -> task of the pages being parsed.
+        in_flight = {}
+        while True:
+            item = pages.get()
+            if item is _done:
+                break
+            task, statement_link, content = item
+            if content is None:
+                results[task] = None
+                continue
+            if len(in_flight) >= 2 * self.processes:
+                finish(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            in_flight[self.pool.submit(parse_page, statement_link, content, task[0])] = task
+        producer.join()
+        finish(wait(in_flight).done)
+        return results
@@ -0,0 +1,40 @@
+import inspect
+import threading
+import functools
+
+
+def process_wide(key):
+    """
+    Turns a factory into a 'get_X' function returning one shared instance per key, created by the
+    factory on first use. Thread-safe: concurrent first calls create a single instance.
+
+    Args:
+        key (callable): Called with the factory's arguments, defaults filled in, by name. Returns
+            the hashable key instances are shared by. Ex: lambda path: os.path.abspath(path)
+
+    Ex:
+        @process_wide(lambda directory: os.path.abspath(directory))
+        def get_cache(directory: str = default_cache_dir) -> ResponseCache:
+            return ResponseCache(directory)
+    """
+
+    def decorate(factory):
+        signature = inspect.signature(factory)
+        instances = {}
+        lock = threading.Lock()
+
+        @functools.wraps(factory)
+        def get(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            instance_key = key(**bound.arguments)
+            with lock:
+                instance = instances.get(instance_key)
+                if instance is None:
+                    instance = instances[instance_key] = factory(*args, **kwargs)
+            return instance
+
+        get.instances = instances
+        return get
+
+    return decorate
@@ -0,0 +1,171 @@
+import re
+import logging
+from typing import NamedTuple
+
+# Periphery
+from SEC.Periphery.mappings import statement_keys_map
+
+
+# Statement names used by callers that differ from the keys of 'statement_keys_map'.
+statement_aliases = {"cash_flow": "cash_flow_statement"}
+
+# Applied to normalized short names, in order of preference, when no listed name matches.
+statement_patterns = {
+    "balance_sheet": [r"\bbalance sheet\b|\bfinancial (position|condition)\b"],
+    "income_statement": [
+        r"\b(operations|earnings|income statement|statement of income)\b(?!.*comprehensive)",
+        r"\b(operations|earnings|income)\b",
+    ],
+    "cash_flow_statement": [r"\bcash flow\b"],
+}
+
+# Ordinal of each statement among the 'Statements' reports of a filing summary, used as a last resort.
+# Filers almost always list the balance sheet first, then operations, and the cash flows last.
+statement_positions = {"balance_sheet": 0, "income_statement": 1, "cash_flow_statement": -1}
+
+EXACT = "exact"
+NORMALIZED = "normalized"
+PATTERN = "pattern"
+POSITION = "position"
+TIERS = (EXACT, NORMALIZED, PATTERN, POSITION)
+
+_noise = re.compile(r"\((un)?audited\)|\bunaudited\b|\bcondensed\b|\bconsolidated\b|\bcombined\b")
+_non_word = re.compile(r"[^a-z0-9()]+")
+_singular = {"statements": "statement", "sheets": "sheet", "flows": "flow"}
+# Reports that name a statement but aren't one.
+_excluded = re.compile(
+    r"parenthetical|\((tables|details|policies)\)|changes in|equity|stockholders|shareholders|partners"
+)
+
+
+def normalize_name(name: str) -> str:
+    """
+    Reduces a report name to the words that identify the statement.
+
+    Lowercases, drops '(unaudited)', 'condensed', 'consolidated', 'combined', a trailing company or
+    segment suffix ('- southern') and punctuation other than parentheses, and makes plural nouns
+    singular. Ex: 'CONDENSED CONSOLIDATED BALANCE SHEETS (Unaudited) - Southern' -> 'balance sheet'
+    """
+    name = name.lower().replace("&", " and ")
+    head, dash, tail = name.partition(" - ")
+    if dash and "parenthetical" not in tail:
+        name = head
+    name = _noise.sub(" ", name)
+    words = _non_word.sub(" ", name).split()
+    return " ".join(_singular.get(word, word) for word in words)
+
+
+class Match(NamedTuple):
+    report: object
+    tier: str
+
+
+class StatementMatcher:
+    """
+    Finds the report of a statement in a filing summary.
+
+    The lists of 'statement_keys_map' are compiled once into a rank per name, so a filing summary is
+    resolved in one pass over its reports with a dict lookup for each. Reports are matched by, in
+    order:
+
+    - exact: the lowercased short name is listed. The earliest listed name wins, as before.
+    - normalized: the normalized short name equals a normalized listed name.
+    - pattern: the normalized short name matches one of 'statement_patterns'.
+    - position: the statement's usual ordinal among the 'Statements' reports.
+    """
+
+    def __init__(
+        self,
+        keys_map: dict = statement_keys_map,
+        patterns: dict = statement_patterns,
+        positions: dict = statement_positions,
+        aliases: dict = statement_aliases,
+    ) -> None:
+        self.aliases = aliases
+        self.positions = positions
+        self._exact = {}
+        self._normalized = {}
+        for statement_name, keys in keys_map.items():
+            self._exact[statement_name] = {}
+            self._normalized[statement_name] = {}
+            for rank, key in enumerate(keys):
+                self._exact[statement_name].setdefault(key.lower(), rank)
+                self._normalized[statement_name].setdefault(normalize_name(key), rank)
+        self._patterns = {
+            statement_name: [re.compile(p) for p in statement_patterns]
+            for statement_name, statement_patterns in patterns.items()
+        }
+
+    def canonical(self, statement_name: str) -> str:
+        statement_name = statement_name.lower()
+        return self.aliases.get(statement_name, statement_name)
+
+    def match(self, statement_name: str, reports: list, external: bool = False):
+        """
+        Args:
+            statement_name (str): Ex: 'balance_sheet', 'income_statement', 'cash_flow', 'segments'
+            reports (list): filing_index.Report entries of a filing summary.
+            external (bool): Consider every report, not just statements. Only the listed names are
+                used then, since tables and notes don't follow statement naming.
+
+        Returns:
+            Match | None: The best report and the tier it matched in.
+        """
+        statement_name = self.canonical(statement_name)
+        exact = self._exact.get(statement_name, {})
+        normalized = self._normalized.get(statement_name, {})
+        patterns = [] if external else self._patterns.get(statement_name, [])
+
+        best = {}
+        candidates = []
+        for report in reports:
+            if not report.file_name or not (external or report.is_statement):
+                continue
+            candidates.append(report)
+            rank = exact.get(report.short_name.lower())
+            if rank is not None:
+                # A repeated short name resolves to its last report, like the short name dict did.
+                if EXACT not in best or rank <= best[EXACT][0]:
+                    best[EXACT] = (rank, report)
+                continue
+            name = normalize_name(report.short_name)
+            rank = normalized.get(name)
+            if rank is not None:
+                if NORMALIZED not in best or rank < best[NORMALIZED][0]:
+                    best[NORMALIZED] = (rank, report)
+                continue
+            if not patterns or _excluded.search(name):
+                continue
+            for rank, pattern in enumerate(patterns):
+                if pattern.search(name):
+                    if PATTERN not in best or rank < best[PATTERN][0]:
+                        best[PATTERN] = (rank, report)
+                    break
+
+        for tier in (EXACT, NORMALIZED, PATTERN):
+            if tier in best:
+                return Match(best[tier][1], tier)
+        if external:
+            return None
+        return self._match_position(statement_name, candidates)
+
+    def _match_position(self, statement_name: str, reports: list):
+        ordinal = self.positions.get(statement_name)
+        if ordinal is None:
+            return None
+        statements = [
+            r
+            for r in reports
+            if r.menu_category.lower() == "statements"
+            and not _excluded.search(normalize_name(r.short_name))
+        ]
+        if not statements or ordinal >= len(statements):
+            return None
+        report = statements[ordinal]
+        logging.warning(
+            f"Matched {statement_name} by position to '{report.short_name}' ({report.file_name})"
+        )
+        return Match(report, POSITION)
+
+
+default_matcher = StatementMatcher()
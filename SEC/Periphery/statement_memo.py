@@ -0,0 +1,152 @@
+import os
+import shutil
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Periphery
+from SEC.Periphery.cik_resolver import atomic_write
+from SEC.Periphery.registry import process_wide
+
+
+default_memo_dir = os.path.join("SEC", "Periphery", "Storage", "statement_memo")
+
+
+def source_version(*sources) -> str:
+    """
+    Hash of the source code of 'sources'. Any edit to them gives a new version.
+
+    Args:
+        sources: Imported modules, classes or functions whose code shapes a parsed statement.
+
+    Returns:
+        str: First 16 hex digits of the sha256 of the sources.
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(inspect.getsource(source).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class StatementMemo:
+    """
+    Cache of finished statement frames keyed by (accession number, statement, parser engine).
+
+    Sits above the response cache: a hit skips finding the report, reading the page, parsing it and
+    building the frame. The most recent 'max_entries' frames are held in memory, every frame is
+    also pickled under 'directory/<version>/<accession>/'. 'version' is a hash of the parsing code, so
+    frames written by older code are never read, and their folders are removed on the first write.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        directory: str = default_memo_dir,
+        max_entries: int = 512,
+    ) -> None:
+        """
+        Args:
+            version (str): Parser version, see 'source_version'.
+            directory (str): Folder of the on-disk tier. None keeps frames in memory only.
+            max_entries (int): Frames held in memory. 0 disables the memory tier.
+        """
+        self.version = version
+        self.directory = directory
+        self.max_entries = max_entries
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned = False
+
+    def _path(self, key: tuple) -> str:
+        accession_number, statement_name, engine = key
+        return os.path.join(
+            self.directory,
+            self.version,
+            accession_number.replace("-", ""),
+            f"{statement_name}-{engine}.pkl",
+        )
+
+    @staticmethod
+    def key(accession_number: str, statement_name: str, engine: str) -> tuple:
+        return accession_number.replace("-", ""), statement_name.lower(), engine
+
+    def _remember(self, key: tuple, df: pd.DataFrame):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._frames[key] = df
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+
+    def get(self, key: tuple):
+        """
+        Returns:
+            pd.DataFrame | None: A copy of the stored frame, or None on a miss.
+        """
+        with self._lock:
+            df = self._frames.get(key)
+            if df is not None:
+                self._frames.move_to_end(key)
+                return df.copy()
+        if self.directory is None:
+            return None
+        try:
+            df = pd.read_pickle(self._path(key))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Unreadable memoized statement {key}: {e}")
+            return None
+        self._remember(key, df)
+        return df.copy()
+
+    def put(self, key: tuple, df: pd.DataFrame):
+        """Stores a copy of 'df' in both tiers."""
+        df = df.copy()
+        self._remember(key, df)
+        if self.directory is None:
+            return
+        if not self._pruned:
+            self.prune()
+        atomic_write(self._path(key), df.to_pickle)
+
+    def prune(self):
+        """Removes the frames written by other parser versions."""
+        self._pruned = True
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name != self.version:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def evict(self, accession_number: str):
+        """Drops every statement of an accession from both tiers."""
+        accession_number = accession_number.replace("-", "")
+        with self._lock:
+            for key in [k for k in self._frames if k[0] == accession_number]:
+                del self._frames[key]
+        if self.directory is not None:
+            shutil.rmtree(
+                os.path.join(self.directory, self.version, accession_number), ignore_errors=True
+            )
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+        if self.directory is not None:
+            shutil.rmtree(os.path.join(self.directory, self.version), ignore_errors=True)
+
+
+@process_wide(
+    lambda version, directory: (version, None if directory is None else os.path.abspath(directory))
+)
+def get_statement_memo(version: str, directory: str = default_memo_dir) -> StatementMemo:
+    """
+    Memo of the statement frames parsed by parser 'version', shared by every Edgar.
+    """
+    return StatementMemo(version, directory)
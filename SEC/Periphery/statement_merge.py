@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+
+class StatementAccumulator:
+    """
+    Collects the statement of each accession and joins them once at the end.
+
+    Statements are added newest first, the same order 'SEC.process_all_statements' walks the filings.
+    A period already taken from a newer filing is not taken again from an older one. Each statement is
+    kept as plain line item names and a float matrix, and 'result' places all of them into a single
+    preallocated matrix, so building a history costs one pass over the data instead of one 'pd.concat'
+    per new column.
+
+    Duplicate line items are handled like the 'pd.concat' merge this replaces: they stay separate
+    rows, lined up by position, while every statement lists exactly the line items collected so
+    far. A statement whose line items differ has its duplicates summed into one row (see
+    'consolidate') before it is joined.
+    """
+
+    def __init__(self, max_new_columns: int = None, taken=None) -> None:
+        """
+        Args:
+            max_new_columns (int): Only the first 'max_new_columns' columns of every statement after the
+                first one are considered. 10-Q statements use 2 so year-to-date columns are skipped.
+            taken (iterable): Periods already held elsewhere, Ex: in a statement store. They are never
+                taken again and every added statement is treated as one after the first.
+        """
+        self.max_new_columns = max_new_columns
+        # (row keys, column names, values) per added statement. A row key is (line item name, n)
+        # for the n-th row carrying that name.
+        self._parts = []
+        # Row key -> row of the result, in order of first appearance.
+        self._rows = {}
+        self._seen = set()
+        self._continues = False
+        if taken is not None and len(taken):
+            self._seen.update(pd.to_datetime(list(taken)).strftime("%Y-%m-%d"))
+            self._continues = True
+
+    @property
+    def empty(self) -> bool:
+        return not self._parts
+
+    @staticmethod
+    def _format_columns(statement: pd.DataFrame) -> list:
+        if isinstance(statement.columns, pd.DatetimeIndex):
+            return list(statement.columns.strftime("%Y-%m-%d"))
+        return list(statement.columns)
+
+    @staticmethod
+    def consolidate(names: list, values: np.ndarray):
+        """
+        Consolidates duplicate rows. Puts their sum into a single row, the same as
+        'statement.groupby(statement.index).sum()' (missing values count as 0).
+
+        Returns:
+            tuple: Unique names in order of first appearance and their values.
+        """
+        positions = {}
+        for name in names:
+            positions.setdefault(name, len(positions))
+        if len(positions) == len(names):
+            return names, values
+        inverse = np.fromiter((positions[n] for n in names), dtype=np.intp, count=len(names))
+        summed = np.zeros((len(positions), values.shape[1]))
+        np.add.at(summed, inverse, np.nan_to_num(values, nan=0.0))
+        return list(positions), summed
+
+    def add(self, statement: pd.DataFrame):
+        """
+        Args:
+            statement (pd.DataFrame): Line items x periods. Periods may be timestamps or 'YYYY-MM-DD' strings.
+        """
+        if statement is None or statement.empty:
+            return
+        columns = self._format_columns(statement)
+        values = statement.to_numpy(dtype=float, na_value=np.nan)
+
+        if self._parts or self._continues:
+            if self.max_new_columns is not None:
+                columns = columns[: self.max_new_columns]
+            keep = [i for i, c in enumerate(columns) if c not in self._seen]
+            if not keep:
+                return
+            columns = [columns[i] for i in keep]
+            values = values[:, keep]
+
+        self._seen.update(columns)
+        names = statement.index.tolist()
+        if not self._aligns(names):
+            names, values = self.consolidate(names, values)
+        counts = {}
+        keys = []
+        for name in names:
+            keys.append((name, counts.get(name, 0)))
+            counts[name] = keys[-1][1] + 1
+        for key in keys:
+            self._rows.setdefault(key, len(self._rows))
+        self._parts.append((keys, columns, values))
+
+    def _aligns(self, names: list) -> bool:
+        # Whether 'names' can be joined row by row without summing duplicates: there are none, or
+        # they are exactly the line items collected so far ('pd.concat' only aligns those).
+        if len(set(names)) == len(names):
+            return True
+        if self._continues:
+            return False
+        return not self._parts or names == [name for name, _ in self._rows]
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: Every collected period joined on the line items, newest filing first.
+        """
+        if not self._parts:
+            return pd.DataFrame()
+
+        # Line items in order of first appearance, the same order an outer 'pd.concat' produces.
+        rows = self._rows
+        columns = [c for _, part_columns, _ in self._parts for c in part_columns]
+        matrix = np.full((len(rows), len(columns)), np.nan)
+        start = 0
+        for keys, part_columns, values in self._parts:
+            positions = np.fromiter((rows[k] for k in keys), dtype=np.intp, count=len(keys))
+            width = len(part_columns)
+            matrix[positions, start : start + width] = values
+            start += width
+        return pd.DataFrame(matrix, index=[name for name, _ in rows], columns=columns)
@@ -0,0 +1,359 @@
+import re
+import sys
+import logging
+import calendar
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+from lxml import etree, html
+
+
+"""
+=====================================================
+Parser engines selectable on 'Edgar(parser=...)'
+=====================================================
+"""
+
+BS4 = "bs4"
+LXML = "lxml"
+PARSERS = (BS4, LXML)
+
+_non_numeric = re.compile(r"[^0-9.]")
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_date_headers = etree.XPath(f"//th[{_has_class('th')}]")
+_tables = etree.XPath("//table")
+_first_header = etree.XPath("(.//th)[1]")
+_rows = etree.XPath(".//tr")
+_row_links = etree.XPath(f".//td[{_has_class('pl')}]//a")
+_value_cells = etree.XPath(
+    f".//td[{_has_class('text')} or {_has_class('nump')} or {_has_class('num')}]"
+)
+
+
+"""
+=====================================================
+Statement matrix
+=====================================================
+"""
+
+
+class StatementMatrix:
+    """
+    Line item values of one statement as they are extracted: a float64 matrix of line items x
+    dates, preallocated with NaN, and the concept name of each row.
+
+    Each table reserves room for all of its rows up front, so extraction allocates a handful of
+    arrays instead of one list of floats per line item. Concept names are interned, the same
+    name extracted from many filings is one string object.
+    """
+
+    def __init__(self, date_count: int, capacity: int = 0) -> None:
+        self.date_count = date_count
+        self.values = np.full((capacity, date_count), np.nan)
+        self.concepts = []
+
+    def reserve(self, rows: int):
+        """Makes room for 'rows' more line items."""
+        needed = len(self.concepts) + rows
+        if needed > len(self.values):
+            grown = np.full((max(needed, 2 * len(self.values)), self.date_count), np.nan)
+            grown[: len(self.concepts)] = self.values[: len(self.concepts)]
+            self.values = grown
+
+    def add(self, concept: str) -> np.ndarray:
+        """
+        Appends a line item.
+
+        Returns:
+            np.ndarray: The item's row of NaN, to be filled in place.
+        """
+        if len(self.concepts) == len(self.values):
+            self.reserve(1)
+        row = self.values[len(self.concepts)]
+        self.concepts.append(sys.intern(concept))
+        return row
+
+    def result(self):
+        """
+        Returns:
+            tuple: (concept names, values). 'values' is a line items x dates float64 matrix.
+        """
+        return self.concepts, self.values[: len(self.concepts)]
+
+
+def unique_rows(values: np.ndarray) -> np.ndarray:
+    """
+    Mask of the first occurrence of every distinct row. Each row is viewed as one opaque bytes
+    value, so 'np.unique' sorts and compares whole rows at once.
+
+    Rows compare like 'DataFrame.drop_duplicates': NaN equals NaN and 0.0 equals -0.0.
+
+    Returns:
+        np.ndarray: Boolean mask, True for the rows to keep.
+    """
+    keep = np.zeros(len(values), dtype=bool)
+    if values.ndim != 2 or values.shape[1] == 0:
+        keep[:1] = True
+        return keep
+    # Adding 0.0 turns -0.0 into 0.0, and every NaN gets the same bit pattern.
+    canonical = np.where(np.isnan(values), np.nan, values + 0.0)
+    canonical = np.ascontiguousarray(canonical, dtype=np.float64)
+    rows = canonical.view(np.dtype((np.void, canonical.dtype.itemsize * canonical.shape[1])))
+    _, first = np.unique(rows.ravel(), return_index=True)
+    keep[first] = True
+    return keep
+
+
+def statement_frame(columns: list, values: np.ndarray, dates: pd.DatetimeIndex):
+    """
+    Line items x dates frame of an extracted statement, without the line items whose values repeat
+    an earlier item's.
+
+    Returns:
+        pd.DataFrame or None: None if the statement has no line items or no dates.
+    """
+    values = np.asarray(values, dtype=float).reshape(len(columns), len(dates))
+    if values.size == 0:
+        return None
+    keep = unique_rows(values)
+    return pd.DataFrame(
+        values[keep], index=pd.Index(columns)[keep], columns=dates, copy=False
+    )
+
+
+def standardize_date(date: str) -> str:
+    """
+    Standardizes date strings by replacing abbreviations with full month names.
+    """
+    for abbr, full in zip(calendar.month_abbr[1:], calendar.month_name[1:]):
+        date = date.replace(abbr, full)
+    return date
+
+
+def _single_string(element):
+    """
+    Text of an element that holds nothing but one string, possibly nested in single-child tags.
+    Mirrors BeautifulSoup's 'Tag.string'.
+    """
+    while True:
+        children = len(element)
+        if children == 0:
+            return element.text
+        if children > 1 or element.text or element[0].tail:
+            return None
+        element = element[0]
+
+
+def get_dates(root) -> pd.DatetimeIndex:
+    dates = []
+    for th in _date_headers(root):
+        div = th.find(".//div")
+        if div is None:
+            continue
+        string = _single_string(div)
+        if string:
+            dates.append(standardize_date(string).replace(".", ""))
+    return pd.to_datetime(dates)
+
+
+def _classes(element) -> list:
+    return (element.get("class") or "").split()
+
+
+def extract_columns_values_and_dates(content: bytes):
+    """
+    lxml implementation of 'extract_columns_values_and_dates_from_soup'. It works on the
+    raw bytes of an R page and returns the same (columns, values_set, date_time_index).
+
+    Args:
+        content (bytes): Body of an R*.htm page.
+
+    Returns:
+        tuple: Tuple containing columns, values_set, and date_time_index. 'values_set' is a line
+            items x dates float64 matrix, see 'StatementMatrix'.
+    """
+    root = html.fromstring(content)
+    date_time_index = get_dates(root)
+    matrix = StatementMatrix(len(date_time_index))
+
+    for table in _tables(root):
+        unit_multiplier = 1
+        special_case = False
+
+        table_header = _first_header(table)
+        if table_header:
+            header_text = table_header[0].text_content()
+            if "in Thousands" in header_text:
+                unit_multiplier = 1
+            elif "in Millions" in header_text:
+                unit_multiplier = 1000
+            if "unless otherwise specified" in header_text:
+                special_case = True
+
+        rows = _rows(table)
+        matrix.reserve(len(rows))
+        for row in rows:
+            onclick_elements = _row_links(row)
+            if not onclick_elements:
+                continue
+
+            onclick_attr = onclick_elements[0].get("onclick")
+            if onclick_attr is None:
+                raise KeyError("onclick")
+            column_title = onclick_attr.split("defref_")[-1].split("',")[0]
+            values = matrix.add(column_title)
+
+            for i, cell in enumerate(_value_cells(row)):
+                classes = _classes(cell)
+                if "text" in classes:
+                    continue
+
+                value = _non_numeric.sub("", cell.text_content())
+                if value:
+                    value = float(value)
+                    # Special case values are not stored, matching the BeautifulSoup engine.
+                    if not special_case:
+                        if "nump" in classes:
+                            values[i] = value * unit_multiplier
+                        else:
+                            values[i] = -value * unit_multiplier
+
+    columns, values_set = matrix.result()
+    return columns, values_set, date_time_index
+
+
+"""
+=====================================================
+BeautifulSoup engine
+=====================================================
+"""
+
+
+def make_soup(statement_link: str, content: bytes) -> BeautifulSoup:
+    if statement_link.endswith(".xml"):
+        return BeautifulSoup(content, "lxml-xml", from_encoding="utf-8")
+    return BeautifulSoup(content, "lxml")
+
+
+def get_soup_dates(soup: BeautifulSoup) -> pd.DatetimeIndex:
+    """
+    Extracts the period dates from the header cells of a statement soup.
+    """
+    table_headers = soup.find_all("th", {"class": "th"})
+    dates = [str(th.div.string) for th in table_headers if th.div and th.div.string]
+    dates = [standardize_date(date).replace(".", "") for date in dates]
+    return pd.to_datetime(dates)
+
+
+def extract_columns_values_and_dates_from_soup(soup: BeautifulSoup):
+    """
+    Extracts columns, values, and dates from an HTML soup object representing a financial statement.
+
+    Args:
+        soup (BeautifulSoup): The BeautifulSoup object of the HTML document.
+
+    Returns:
+        tuple: Tuple containing columns, values_set, and date_time_index. 'values_set' is a line
+            items x dates float64 matrix, see 'StatementMatrix'.
+    """
+    date_time_index = get_soup_dates(soup)
+    matrix = StatementMatrix(len(date_time_index))
+
+    for table in soup.find_all("table"):
+        unit_multiplier = 1
+        special_case = False
+
+        # Check table headers for unit multipliers and special cases
+        table_header = table.find("th")
+        if table_header:
+            header_text = table_header.get_text()
+            # Determine unit multiplier based on header text
+            if "in Thousands" in header_text:
+                unit_multiplier = 1
+            elif "in Millions" in header_text:
+                unit_multiplier = 1000
+            # Check for special case scenario
+            if "unless otherwise specified" in header_text:
+                special_case = True
+
+        # Process each row of the table
+        rows = table.select("tr")
+        matrix.reserve(len(rows))
+        for row in rows:
+            onclick_elements = row.select("td.pl a, td.pl.custom a")
+            if not onclick_elements:
+                continue
+
+            # Extract column title from 'onclick' attribute
+            onclick_attr = onclick_elements[0]["onclick"]
+            column_title = onclick_attr.split("defref_")[-1].split("',")[0]
+            # Row of NaNs in the statement matrix
+            values = matrix.add(column_title)
+
+            # Process each cell in the row
+            for i, cell in enumerate(row.select("td.text, td.nump, td.num")):
+                if "text" in cell.get("class"):
+                    continue
+
+                # Clean and parse cell value, keeping only digits and decimal points
+                value = _non_numeric.sub("", cell.text)
+                if value:
+                    value = float(value)
+                    # Adjust value based on special case and cell class
+                    if special_case:
+                        value /= 1000
+                    else:
+                        if "nump" in cell.get("class"):
+                            values[i] = value * unit_multiplier
+                        else:
+                            values[i] = -value * unit_multiplier
+
+    columns, values_set = matrix.result()
+    return columns, values_set, date_time_index
+
+
+"""
+=====================================================
+Pages
+=====================================================
+"""
+
+
+def extract_statement(statement_link: str, content: bytes, parser: str = BS4):
+    """
+    Extracts columns, values and dates from the raw bytes of a statement page with the 'parser'
+    engine. Legacy '.xml' statements always use BeautifulSoup.
+
+    Returns:
+        tuple: Tuple containing columns, values_set, and date_time_index.
+    """
+    if parser == LXML and not statement_link.endswith(".xml"):
+        return extract_columns_values_and_dates(content)
+    return extract_columns_values_and_dates_from_soup(make_soup(statement_link, content))
+
+
+def page_frame(statement_link: str, content: bytes, parser: str, accession_number: str = None):
+    """
+    Builds the statement frame of an R page. CPU only, no I/O, so it runs in worker processes
+    with nothing but the parser engine.
+
+    Returns:
+        pd.DataFrame or None: Line items x period dates without duplicate items, or None if the page
+            has no values or can't be parsed.
+    """
+    if not content:
+        return None
+    try:
+        df = statement_frame(*extract_statement(statement_link, content, parser))
+    except Exception as e:
+        logging.error(f"Error processing statement: {e}")
+        return None
+    if df is None:
+        logging.warning(f"Empty DataFrame for accession number: {accession_number}")
+    return df
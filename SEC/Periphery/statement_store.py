@@ -0,0 +1,471 @@
+import os
+import re
+import abc
+import uuid
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import feather
+
+# Periphery
+from SEC.Periphery.cik_resolver import atomic_write
+from SEC.Periphery.registry import process_wide
+
+
+default_companies_dir = os.path.join("Filings", "Companies")
+
+STATEMENTS = ("income_statement", "balance_sheet", "cash_flow")
+# Statement file prefix per form type. Ex: 'AAPL_A_income_statement'
+FILE_CODES = {"10-K": "A", "10-Q": "Q"}
+
+CSV = "csv"
+PARQUET = "parquet"
+FEATHER = "feather"
+
+
+"""
+=====================================================
+Long format
+=====================================================
+"""
+
+
+def to_long(statement: pd.DataFrame, orders: np.ndarray = None) -> pd.DataFrame:
+    """
+    Converts a statement (line items x periods) to one row per reported value.
+
+    Args:
+        statement (pd.DataFrame): Line items x periods.
+        orders (np.ndarray): Position of each line item. Defaults to the row number.
+
+    Returns:
+        pd.DataFrame: Columns 'item' (line item), 'order' (row position), 'period' (datetime64) and
+            'value' (float64). Missing values are dropped.
+    """
+    values = statement.to_numpy(dtype=float, na_value=np.nan)
+    rows, columns = np.nonzero(~np.isnan(values))
+    items = np.asarray(statement.index, dtype=object)
+    if orders is None:
+        orders = np.arange(len(items))
+    periods = pd.to_datetime(statement.columns).to_numpy(dtype="datetime64[ns]")
+    return pd.DataFrame(
+        {
+            "item": items[rows],
+            "order": np.asarray(orders, dtype=np.int32)[rows],
+            "period": periods[columns],
+            "value": values[rows, columns],
+        }
+    )
+
+
+def to_wide(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    Inverse of 'to_long'. Rows are identified by 'order' (line item names can repeat) and periods are
+    sorted oldest first. When the same row and period appear more than once the last one wins.
+    """
+    return _wide_from_arrays(
+        long["item"].to_numpy(dtype=object),
+        long["order"].to_numpy(dtype=np.int64),
+        long["period"].to_numpy(dtype="datetime64[ns]"),
+        long["value"].to_numpy(dtype=float),
+    )
+
+
+def _wide_from_arrays(items, orders, periods, values) -> pd.DataFrame:
+    # Works on plain arrays: pandas indexing costs more than the data itself for statement sized frames.
+    if len(values) == 0:
+        return pd.DataFrame()
+    row_orders, row_first, row_positions = np.unique(orders, return_index=True, return_inverse=True)
+    unique_periods, period_positions = np.unique(periods, return_inverse=True)
+    matrix = np.full((len(row_orders), len(unique_periods)), np.nan)
+    # Fancy assignment keeps the last write for repeated positions, so later parts win.
+    matrix[row_positions, period_positions] = values
+    return pd.DataFrame(
+        matrix,
+        index=items[row_first].tolist(),
+        columns=pd.DatetimeIndex(unique_periods),
+    )
+
+
+def _occurrences(items) -> list:
+    # (name, n) for the n-th time a line item name appears, so repeated names stay distinct rows.
+    seen = {}
+    keys = []
+    for item in items:
+        n = seen.get(item, 0)
+        seen[item] = n + 1
+        keys.append((item, n))
+    return keys
+
+
+def new_periods(stored: pd.DataFrame, df: pd.DataFrame):
+    """
+    The periods of 'df' missing from 'stored', in long format.
+
+    Args:
+        stored (pd.DataFrame): Stored statement in long format.
+        df (pd.DataFrame): Line items x periods.
+
+    Returns:
+        pd.DataFrame | None: Long format rows to add, None when every period is already stored. Line
+            items already stored keep their 'order', new ones go after them.
+    """
+    columns = pd.to_datetime(df.columns)
+    new = df.loc[:, ~columns.isin(stored["period"].unique())]
+    if new.shape[1] == 0:
+        return None
+    rows = stored.drop_duplicates(subset="order").sort_values("order")
+    known = dict(zip(_occurrences(rows["item"]), rows["order"]))
+    next_order = int(rows["order"].max()) + 1 if len(rows) else 0
+    orders = []
+    for key in _occurrences(new.index):
+        order = known.get(key)
+        if order is None:
+            order = next_order
+            next_order += 1
+        orders.append(order)
+    return to_long(new, np.array(orders))
+
+
+"""
+=====================================================
+Stores
+=====================================================
+"""
+
+
+class StatementStore(abc.ABC):
+    """
+    Where 'SEC.process_all_statements' saves statements and 'Asset' loads them from.
+
+    Statements are line items x periods DataFrames. 'read' always returns the periods as a sorted
+    DatetimeIndex, whatever the format on disk.
+    """
+
+    format = None
+
+    def __init__(self, directory: str = default_companies_dir) -> None:
+        self.directory = directory
+
+    def statement_path(self, ticker: str, form_type: str, statement: str) -> str:
+        """
+        Returns:
+            str: Path of the statement without extension. Ex: 'Filings/Companies/AAPL/10-K/AAPL_A_income_statement'
+        """
+        ticker = ticker.upper()
+        form_type = form_type.upper()
+        return os.path.join(
+            self.directory,
+            ticker,
+            form_type,
+            f"{ticker}_{FILE_CODES[form_type]}_{statement}",
+        )
+
+    @abc.abstractmethod
+    def read(self, ticker: str, form_type: str, statement: str) -> pd.DataFrame:
+        """
+        Raises:
+            FileNotFoundError: The statement was never written.
+        """
+
+    @abc.abstractmethod
+    def write(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        """
+        Replaces the stored statement with 'df'.
+        """
+
+    @abc.abstractmethod
+    def append(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        """
+        Adds the periods of 'df' that are not stored yet. Periods already stored are left as they are.
+        """
+
+    @abc.abstractmethod
+    def exists(self, ticker: str, form_type: str, statement: str) -> bool:
+        """
+        Whether the statement was written.
+        """
+
+    def periods(self, ticker: str, form_type: str, statement: str) -> pd.DatetimeIndex:
+        try:
+            return self.read(ticker, form_type, statement).columns
+        except FileNotFoundError:
+            return pd.DatetimeIndex([])
+
+    def latest_period(self, ticker: str, form_type: str, statement: str):
+        """
+        Returns:
+            pd.Timestamp | None: Most recent stored period.
+        """
+        periods = self.periods(ticker, form_type, statement)
+        return periods.max() if len(periods) else None
+
+
+class CSVStatementStore(StatementStore):
+    """
+    The original layout: one wide csv per statement, periods as 'YYYY-MM-DD' column headers.
+    """
+
+    format = CSV
+
+    def _path(self, ticker: str, form_type: str, statement: str) -> str:
+        return f"{self.statement_path(ticker, form_type, statement)}.csv"
+
+    def exists(self, ticker: str, form_type: str, statement: str) -> bool:
+        return os.path.exists(self._path(ticker, form_type, statement))
+
+    def read(self, ticker: str, form_type: str, statement: str) -> pd.DataFrame:
+        df = pd.read_csv(self._path(ticker, form_type, statement), index_col=0)
+        df.index.name = None
+        df.columns = pd.to_datetime(df.columns)
+        return df.reindex(sorted(df.columns), axis=1)
+
+    def write(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        df = df.copy()
+        df.columns = pd.to_datetime(df.columns).strftime("%Y-%m-%d")
+        atomic_write(self._path(ticker, form_type, statement), df.to_csv)
+
+    def append(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        # A csv can't grow by columns, so the whole statement is rewritten.
+        try:
+            stored = self.read(ticker, form_type, statement)
+        except FileNotFoundError:
+            self.write(ticker, form_type, statement, df)
+            return
+        stored = to_long(stored)
+        new = new_periods(stored, df)
+        if new is None:
+            return
+        merged = to_wide(pd.concat([stored, new], ignore_index=True))
+        self.write(ticker, form_type, statement, merged)
+
+
+class ParquetStatementStore(StatementStore):
+    """
+    Compressed columnar store. Each statement is a folder of long format part files (item, order,
+    period, value). 'write' replaces the parts with a single one and 'append' adds a part holding only
+    the new periods, so an update never rewrites what is already stored.
+
+    'write' and 'compact' add a base part, which holds the whole statement, before removing the
+    parts it replaces. Reads start at the last base part, so a crash in between leaves the statement
+    as the new part alone, and the next write, append or compact removes the parts left behind.
+
+    Statements that only exist as csv files of the original layout are read from the csv, and the
+    first 'append' to one carries the csv over before adding the new periods.
+    """
+
+    format = PARQUET
+    extension = ".parquet"
+
+    def __init__(self, directory: str = default_companies_dir, compression: str = "zstd") -> None:
+        super().__init__(directory)
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._legacy = CSVStatementStore(directory)
+
+    def _folder(self, ticker: str, form_type: str, statement: str) -> str:
+        return self.statement_path(ticker, form_type, statement)
+
+    def _all_parts(self, folder: str) -> list:
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return []
+        # Part names start with a zero padded sequence number, so sorting keeps them in write order.
+        return sorted(name for name in names if name.endswith(self.extension))
+
+    def _is_base(self, part: str) -> bool:
+        return part.endswith(f"-base{self.extension}")
+
+    def _base_position(self, parts: list) -> int:
+        # Parts before the last base part are superseded by it. Without one, every part counts.
+        bases = [i for i, part in enumerate(parts) if self._is_base(part)]
+        return bases[-1] if bases else 0
+
+    def _parts(self, folder: str) -> list:
+        """Parts holding the statement, in write order."""
+        parts = self._all_parts(folder)
+        return parts[self._base_position(parts):]
+
+    def _remove_superseded(self, folder: str):
+        parts = self._all_parts(folder)
+        for part in parts[: self._base_position(parts)]:
+            os.remove(os.path.join(folder, part))
+
+    def _next_sequence(self, folder: str) -> int:
+        parts = self._all_parts(folder)
+        return int(parts[-1].split("-", 1)[0]) + 1 if parts else 0
+
+    def _read_part(self, path: str) -> pa.Table:
+        # ParquetFile skips the dataset discovery 'pq.read_table' does, most of the cost of a small file.
+        with pq.ParquetFile(path) as f:
+            return f.read()
+
+    def _write_part(self, long: pd.DataFrame, path: str):
+        long.to_parquet(path, index=False, engine="pyarrow", compression=self.compression)
+
+    def _new_part(self, folder: str, long: pd.DataFrame, sequence: int, base: bool = False) -> str:
+        name = f"{sequence:06d}-{uuid.uuid4().hex[:8]}{'-base' if base else ''}{self.extension}"
+        path = os.path.join(folder, name)
+        atomic_write(path, lambda tmp_path: self._write_part(long, tmp_path))
+        return name
+
+    def _read_table(self, folder: str) -> pa.Table:
+        parts = self._parts(folder)
+        if not parts:
+            raise FileNotFoundError(folder)
+        tables = [self._read_part(os.path.join(folder, part)) for part in parts]
+        return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+    def _read_long(self, folder: str) -> pd.DataFrame:
+        return self._read_table(folder).to_pandas()
+
+    def exists(self, ticker: str, form_type: str, statement: str) -> bool:
+        return bool(self._parts(self._folder(ticker, form_type, statement))) or self._legacy.exists(
+            ticker, form_type, statement
+        )
+
+    def read(self, ticker: str, form_type: str, statement: str) -> pd.DataFrame:
+        try:
+            table = self._read_table(self._folder(ticker, form_type, statement))
+        except FileNotFoundError:
+            return self._legacy.read(ticker, form_type, statement)
+        return _wide_from_arrays(
+            table["item"].to_numpy(),
+            table["order"].to_numpy(),
+            table["period"].to_numpy(),
+            table["value"].to_numpy(),
+        )
+
+    def periods(self, ticker: str, form_type: str, statement: str) -> pd.DatetimeIndex:
+        try:
+            table = self._read_table(self._folder(ticker, form_type, statement))
+        except FileNotFoundError:
+            return self._legacy.periods(ticker, form_type, statement)
+        return pd.DatetimeIndex(np.unique(table["period"].to_numpy()))
+
+    def write(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        folder = self._folder(ticker, form_type, statement)
+        with self._lock:
+            self._new_part(folder, to_long(df), self._next_sequence(folder), base=True)
+            self._remove_superseded(folder)
+
+    def append(self, ticker: str, form_type: str, statement: str, df: pd.DataFrame):
+        folder = self._folder(ticker, form_type, statement)
+        with self._lock:
+            self._remove_superseded(folder)
+            if not self._parts(folder):
+                if not self._legacy.exists(ticker, form_type, statement):
+                    self._new_part(folder, to_long(df), 0, base=True)
+                    return
+                legacy = to_long(self._legacy.read(ticker, form_type, statement))
+                self._new_part(folder, legacy, 0, base=True)
+            long = new_periods(self._read_long(folder), df)
+            if long is None:
+                return
+            self._new_part(folder, long, self._next_sequence(folder))
+
+    def compact(self, ticker: str, form_type: str, statement: str):
+        """
+        Merges the part files of a statement into one.
+        """
+        folder = self._folder(ticker, form_type, statement)
+        with self._lock:
+            if len(self._parts(folder)) < 2:
+                self._remove_superseded(folder)
+                return
+            long = self._read_long(folder)
+            long = long.drop_duplicates(subset=["order", "period"], keep="last")
+            self._new_part(folder, long, self._next_sequence(folder), base=True)
+            self._remove_superseded(folder)
+
+
+class FeatherStatementStore(ParquetStatementStore):
+    """
+    Same layout as 'ParquetStatementStore' with Arrow IPC (Feather) part files. Faster to read,
+    somewhat larger on disk.
+    """
+
+    format = FEATHER
+    extension = ".feather"
+
+    def _read_part(self, path: str) -> pa.Table:
+        return feather.read_table(path)
+
+    def _write_part(self, long: pd.DataFrame, path: str):
+        long.to_feather(path, compression=self.compression)
+
+
+STORES = {
+    CSV: CSVStatementStore,
+    PARQUET: ParquetStatementStore,
+    FEATHER: FeatherStatementStore,
+}
+
+
+@process_wide(lambda format, directory: (format, os.path.abspath(directory)))
+def get_statement_store(format: str = PARQUET, directory: str = default_companies_dir):
+    """
+    Store of 'format' rooted at 'directory', shared by 'SEC' and 'Asset'.
+    """
+    if format not in STORES:
+        raise ValueError(f"Unknown statement store '{format}'. Use one of {tuple(STORES)}.")
+    return STORES[format](directory)
+
+
+"""
+=====================================================
+Migration
+=====================================================
+"""
+
+_csv_name = re.compile(
+    r"^(?P<ticker>.+)_(?P<code>[AQ])_(?P<statement>" + "|".join(STATEMENTS) + r")\.csv$"
+)
+
+
+def migrate_csv_tree(
+    target: StatementStore,
+    directory: str = default_companies_dir,
+    remove_csv: bool = False,
+) -> dict:
+    """
+    Copies every statement csv under 'directory' ('{T}/{10-K|10-Q}/{T}_{A|Q}_{statement}.csv') into
+    'target'.
+
+    Args:
+        target (StatementStore): Store the statements are written to.
+        directory (str): Root of the csv tree.
+        remove_csv (bool): Delete each csv once it is migrated.
+
+    Returns:
+        dict: Number of statements migrated and the paths that failed with their error.
+    """
+    source = CSVStatementStore(directory)
+    forms = {code: form_type for form_type, code in FILE_CODES.items()}
+    summary = {"migrated": 0, "failed": {}}
+    if not os.path.isdir(directory):
+        return summary
+    for ticker in sorted(os.listdir(directory)):
+        for form_type in FILE_CODES:
+            folder = os.path.join(directory, ticker, form_type)
+            if not os.path.isdir(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                match = _csv_name.match(name)
+                if match is None or forms[match["code"]] != form_type:
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    df = source.read(match["ticker"], form_type, match["statement"])
+                    target.write(match["ticker"], form_type, match["statement"], df)
+                except (ValueError, KeyError, OSError) as e:
+                    summary["failed"][path] = str(e)
+                    continue
+                summary["migrated"] += 1
+                if remove_csv:
+                    os.remove(path)
+    return summary
@@ -0,0 +1,198 @@
+import re
+import zipfile
+import binascii
+import tempfile
+
+
+"""
+=====================================================
+Retrieval engines selectable on 'Edgar(retrieval=...)'
+=====================================================
+"""
+
+# One request per R page and one for FilingSummary.xml.
+PAGES = "pages"
+# One archive download per accession, split locally.
+ARCHIVE = "archive"
+RETRIEVALS = (PAGES, ARCHIVE)
+
+XBRL_ZIP = "xbrl_zip"
+SUBMISSION_TXT = "txt"
+# SEC renders the R pages and FilingSummary.xml after a filing is accepted. The '-xbrl.zip' carries
+# them; the complete submission '.txt' is the filing as submitted, so it is only the fallback.
+SOURCES = (XBRL_ZIP, SUBMISSION_TXT)
+
+_rendered_document = re.compile(r"^(FilingSummary\.xml|R\d+\.(htm|xml))$", re.IGNORECASE)
+
+
+def is_rendered_document(name: str) -> bool:
+    """FilingSummary.xml and the R pages, the only documents statement extraction reads."""
+    return bool(_rendered_document.match(name.rsplit("/", 1)[-1]))
+
+
+def dashed_accession(accession_number: str) -> str:
+    """Ex: '000032019324000081' -> '0000320193-24-000081'"""
+    accession_number = accession_number.replace("-", "")
+    return f"{accession_number[:10]}-{accession_number[10:12]}-{accession_number[12:]}"
+
+
+def archive_url(base_link: str, accession_number: str, source: str) -> str:
+    """
+    Args:
+        base_link (str): Folder of the filing. Ex: 'https://www.sec.gov/Archives/edgar/data/{cik}/{accession}'
+        accession_number (str): Accession number, with or without dashes.
+        source (str): XBRL_ZIP or SUBMISSION_TXT.
+    """
+    dashed = dashed_accession(accession_number)
+    if source == XBRL_ZIP:
+        return f"{base_link}/{dashed}-xbrl.zip"
+    if source == SUBMISSION_TXT:
+        return f"{base_link}/{dashed}.txt"
+    raise ValueError(f"Unknown archive source '{source}'. Use one of {SOURCES}.")
+
+
+"""
+=====================================================
+Complete submission (.txt)
+=====================================================
+"""
+
+_filename_tag = re.compile(rb"^<FILENAME>\s*(.+?)\s*$")
+
+
+def _uudecode(lines: list) -> bytes:
+    # Binary documents are uuencoded between 'begin <mode> <name>' and 'end'.
+    decoded = []
+    for line in lines[1:]:
+        if line.strip() in (b"end", b"`"):
+            break
+        if not line:
+            continue
+        try:
+            decoded.append(binascii.a2b_uu(line))
+        except binascii.Error:
+            # Some encoders pad lines short. Decode with the length byte only.
+            nbytes = (((line[0] - 32) & 63) * 4 + 5) // 3
+            decoded.append(binascii.a2b_uu(line[:nbytes]))
+    return b"".join(decoded)
+
+
+def iter_sgml_documents(lines, wanted=is_rendered_document):
+    """
+    Splits a complete submission '.txt' into its documents while reading it.
+
+    Only the lines of documents whose file name passes 'wanted' are kept, so memory is bounded by the
+    largest wanted document, not by the size of the submission.
+
+    Args:
+        lines (iterable): Lines of the submission as bytes, with or without line endings.
+        wanted (callable): Takes a document's file name, returns whether it is kept.
+
+    Yields:
+        tuple: (file name, content bytes) of each wanted document.
+    """
+    in_document = False
+    in_text = False
+    filename = None
+    keep = False
+    text = []
+    for line in lines:
+        line = line.rstrip(b"\r\n")
+        if not in_document:
+            if line.startswith(b"<DOCUMENT>"):
+                in_document = True
+                filename = None
+                keep = False
+            continue
+        if in_text:
+            if line.startswith(b"</TEXT>"):
+                in_text = False
+                if keep:
+                    yield filename, _document_content(text)
+                text = []
+            elif keep:
+                text.append(line)
+            continue
+        if line.startswith(b"</DOCUMENT>"):
+            in_document = False
+        elif line.startswith(b"<TEXT>"):
+            in_text = True
+        else:
+            match = _filename_tag.match(line)
+            if match:
+                filename = match.group(1).decode("latin-1")
+                keep = wanted(filename)
+
+
+def _document_content(lines: list) -> bytes:
+    # Text documents may be wrapped in <XBRL>/<XML> tags inside <TEXT>.
+    while lines and not lines[0].strip():
+        lines = lines[1:]
+    if lines and lines[0].startswith(b"begin ") and len(lines[0].split()) >= 3:
+        return _uudecode(lines)
+    if lines and lines[0].strip() in (b"<XBRL>", b"<XML>"):
+        closing = b"</" + lines[0].strip()[1:]
+        lines = lines[1:]
+        if lines and lines[-1].strip() == closing:
+            lines = lines[:-1]
+    return b"\n".join(lines) + b"\n"
+
+
+"""
+=====================================================
+XBRL archive (-xbrl.zip)
+=====================================================
+"""
+
+
+def read_zip_documents(
+    chunks, wanted=is_rendered_document, spool_bytes: int = 32 * 1024**2
+) -> dict:
+    """
+    Reads the wanted members of a zip that arrives in chunks.
+
+    The archive is spooled to memory up to 'spool_bytes' and to a temporary file beyond that, so a
+    very large archive doesn't have to fit in memory. Members are then read one at a time.
+
+    Args:
+        chunks (iterable): Bytes of the archive.
+        wanted (callable): Takes a member's file name, returns whether it is read.
+        spool_bytes (int): Size kept in memory before spilling to disk.
+
+    Returns:
+        dict: File name -> content of each wanted member.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=spool_bytes) as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+        documents = {}
+        with zipfile.ZipFile(spool) as archive:
+            for member in archive.infolist():
+                name = member.filename.rsplit("/", 1)[-1]
+                if member.is_dir() or not wanted(name):
+                    continue
+                with archive.open(member) as f:
+                    documents[name] = f.read()
+        return documents
+
+
+def read_documents(
+    source: str, response, wanted=is_rendered_document, chunk_size: int = 1024**2
+) -> dict:
+    """
+    Reads the wanted documents of a streamed archive response.
+
+    Args:
+        source (str): XBRL_ZIP or SUBMISSION_TXT.
+        response (requests.Response): Response requested with 'stream=True'.
+        wanted (callable): Takes a document's file name, returns whether it is kept.
+
+    Returns:
+        dict: File name -> content of each wanted document.
+    """
+    if source == XBRL_ZIP:
+        return read_zip_documents(response.iter_content(chunk_size), wanted)
+    if source == SUBMISSION_TXT:
+        return dict(iter_sgml_documents(response.iter_lines(chunk_size), wanted))
+    raise ValueError(f"Unknown archive source '{source}'. Use one of {SOURCES}.")
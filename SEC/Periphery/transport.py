@@ -0,0 +1,157 @@
+import time
+import random
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Periphery
+from SEC.Periphery.metrics import metrics
+from SEC.Periphery.registry import process_wide
+
+
+# EDGAR's fair access policy allows at most 10 requests per second per host.
+SEC_REQUESTS_PER_SECOND = 10
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket. 'rate' tokens are added per second up to 'capacity'.
+    """
+
+    def __init__(self, rate: float, capacity: float = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes one token, going into debt if the bucket is empty.
+
+        Returns:
+            float: Seconds the caller must wait before using the token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Blocks until a token is available."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by every transport in the process so side-by-side 'SEC' objects stay under the limit together.
+sec_rate_limiter = RateLimiter(SEC_REQUESTS_PER_SECOND)
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after=None) -> float:
+    """
+    Full-jitter exponential backoff. A numeric 'Retry-After' header takes priority.
+    """
+    if retry_after:
+        try:
+            return min(cap, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class Transport:
+    """
+    Pooled keep-alive HTTP client for EDGAR.
+
+    Every request waits on the rate limiter, and 429/5xx responses or connection errors are retried
+    with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        rate_limiter: RateLimiter = None,
+        pool_size: int = 16,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        timeout: float = 30.0,
+    ) -> None:
+        self.rate_limiter = rate_limiter if rate_limiter is not None else sec_rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        self.session.headers.update(headers)
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        """
+        Args:
+            url (str): URL to request.
+            headers (dict): Extra headers for this request only.
+            stream (bool): Don't read the body up front.
+
+        Returns:
+            requests.Response: The final response. Only 'requests.RequestException' from the last
+            attempt is raised; retryable status codes are returned once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    url, headers=headers, stream=stream, timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap))
+                attempt += 1
+                continue
+            if metrics.enabled:
+                if stream:
+                    size = response.headers.get("Content-Length", 0)
+                else:
+                    size = len(response.content)
+                metrics.request(url, response.status_code, time.perf_counter() - start, int(size))
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = backoff_delay(
+                    attempt,
+                    self.backoff_base,
+                    self.backoff_cap,
+                    response.headers.get("Retry-After"),
+                )
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+            return response
+
+    def close(self):
+        self.session.close()
+
+
+@process_wide(lambda headers: tuple(sorted(headers.items())))
+def get_transport(headers: dict) -> Transport:
+    """
+    Session pool shared by every Edgar sending 'headers', so they share connections.
+    """
+    return Transport(headers)
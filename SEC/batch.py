@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from SEC.sec import SEC
+
+# Periphery
+from SEC.Periphery.cik_resolver import atomic_write
+
+
+default_checkpoint_path = os.path.join("Filings", "Batch", "checkpoint.json")
+
+
+def job_key(ticker: str, form_type: str) -> str:
+    """
+    Key of a (ticker, form type) job in the checkpoint. Ex: 'AAPL|10-K'
+    """
+    return f"{ticker}|{form_type}"
+
+
+class BatchRunner:
+    """
+    Runs 'SEC.process_all_statements' for many tickers and form types.
+
+    Jobs are (ticker, form type) pairs spread over a thread pool. Every 'SEC' object uses the
+    process-wide Edgar transport and response cache, so all workers share one rate limiter and one
+    disk cache. Progress is checkpointed to a JSON file after every job, so a crashed run started
+    again with the same checkpoint skips the jobs that already finished. Statements are only saved
+    once a job merged all of its filings, so an interrupted job is run again from its first
+    accession; the pages it already fetched are served from the response cache.
+    """
+
+    def __init__(
+        self,
+        tickers: list,
+        form_types: list = ("10-K", "10-Q"),
+        workers: int = 4,
+        accession_workers: int = 1,
+        depth: int = 11,
+        checkpoint_path: str = default_checkpoint_path,
+        retry_failed: bool = True,
+        incremental: bool = False,
+        jobs: list = None,
+        edgar=None,
+        store=None,
+    ) -> None:
+        """
+        Args:
+            tickers (list): Ticker symbols to process.
+            form_types (list): Form types processed for every ticker.
+            workers (int): Number of jobs processed at the same time.
+            accession_workers (int): 'workers' passed to 'SEC.process_all_statements' for each job.
+            depth (int): Number of recent filings processed per job.
+            checkpoint_path (str): JSON file the progress is written to.
+            retry_failed (bool): Run jobs that failed in a previous run again.
+            incremental (bool): Only process filings newer than the stored statements.
+            jobs (list): (ticker, form type) pairs to run instead of every ticker with every form type.
+            edgar (Edgar): Client every job uses. A new 'Edgar' per job, all sharing the process-wide
+                transport and cache, when None.
+            store (StatementStore): Where the statements are saved. The shared store when None.
+        """
+        if jobs is None:
+            jobs = [(t, f) for t in tickers for f in form_types]
+        self.jobs = [(t.upper(), f.upper()) for t, f in jobs]
+        self.workers = workers
+        self.accession_workers = accession_workers
+        self.depth = depth
+        self.checkpoint_path = checkpoint_path
+        self.retry_failed = retry_failed
+        self.incremental = incremental
+        self.edgar = edgar
+        self.store = store
+        self._lock = threading.Lock()
+        self.progress = self._load_checkpoint()
+
+    """
+    =====================================================
+    Checkpoint
+    =====================================================
+    """
+
+    def _load_checkpoint(self) -> dict:
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logging.error(f"Unreadable checkpoint, starting over: {self.checkpoint_path}")
+            return {}
+
+    def _save_checkpoint(self):
+        # Called with '_lock' held, so checkpoints are written in the order of the updates and an
+        # older one never replaces a newer one.
+        data = json.dumps(self.progress, indent=2)
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+
+        atomic_write(self.checkpoint_path, write)
+
+    def _update(self, key: str, **fields):
+        with self._lock:
+            self.progress.setdefault(key, {}).update(fields)
+            self._save_checkpoint()
+
+    def pending_jobs(self) -> list:
+        pending = []
+        for ticker, form_type in self.jobs:
+            status = self.progress.get(job_key(ticker, form_type), {}).get("status")
+            if status == "done" or (status == "failed" and not self.retry_failed):
+                continue
+            pending.append((ticker, form_type))
+        return pending
+
+    """
+    =====================================================
+    Run
+    =====================================================
+    """
+
+    def _run_job(self, ticker: str, form_type: str) -> bool:
+        key = job_key(ticker, form_type)
+        self._update(key, status="running", accessions=0, error=None)
+        start = time.perf_counter()
+        try:
+            sec = SEC(ticker, form_type, store=self.store, edgar=self.edgar)
+            accession_numbers = sec.process_all_statements(
+                depth=self.depth,
+                workers=self.accession_workers,
+                incremental=self.incremental,
+            )
+        except Exception as e:
+            logging.error(f"Batch job failed for {ticker} {form_type}: {e}")
+            self._update(
+                key, status="failed", error=str(e), seconds=time.perf_counter() - start
+            )
+            return False
+        self._update(
+            key,
+            status="done",
+            accessions=len(accession_numbers),
+            seconds=time.perf_counter() - start,
+        )
+        return True
+
+    def run(self) -> dict:
+        """
+        Processes every pending job and prints a summary.
+
+        Returns:
+            dict: Summary of the run. See 'summary'.
+        """
+        pending = self.pending_jobs()
+        skipped = len(self.jobs) - len(pending)
+        start = time.perf_counter()
+        succeeded = 0
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._run_job, t, f): (t, f) for t, f in pending}
+            for future in as_completed(futures):
+                if future.result():
+                    succeeded += 1
+                else:
+                    failed.append(futures[future])
+        elapsed = time.perf_counter() - start
+        summary = self.summary(succeeded, failed, skipped, elapsed)
+        self.print_summary(summary)
+        return summary
+
+    def summary(self, succeeded: int, failed: list, skipped: int, elapsed: float) -> dict:
+        with self._lock:
+            accessions = sum(
+                self.progress.get(job_key(t, f), {}).get("accessions", 0)
+                for t, f in self.jobs
+            )
+        processed = succeeded + len(failed)
+        return {
+            "jobs": len(self.jobs),
+            "succeeded": succeeded,
+            "failed": len(failed),
+            "failed_jobs": [job_key(t, f) for t, f in failed],
+            "skipped": skipped,
+            "accessions": accessions,
+            "seconds": elapsed,
+            "jobs_per_minute": processed / elapsed * 60 if elapsed > 0 else 0.0,
+        }
+
+    def print_summary(self, summary: dict):
+        print("[Batch Summary]")
+        print(
+            f"    Jobs: {summary['jobs']}  Succeeded: {summary['succeeded']}  "
+            f"Failed: {summary['failed']}  Skipped: {summary['skipped']}"
+        )
+        print(f"    Accessions merged: {summary['accessions']}")
+        print(
+            f"    Elapsed: {summary['seconds']:.1f}s  ({summary['jobs_per_minute']:.1f} jobs/min)"
+        )
+        for job in summary["failed_jobs"]:
+            print(f"    Failed: {job}")
@@ -1,12 +1,15 @@
-import os
-import numpy as np
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
 # Periphery
-from SEC.Periphery.mappings import statement_keys_map
 from SEC.Periphery.edgar import Edgar
+from SEC.Periphery.statement_merge import StatementAccumulator
+from SEC.Periphery.statement_store import get_statement_store
+from SEC.Periphery import submission_archive
+from SEC.Periphery.parse_pipeline import ParsePipeline
+from SEC.Periphery.metrics import metrics, format_report
 
 pd.options.display.float_format = lambda x: (
     "{:,.0f}".format(x) if int(x) == x else "{:,.2f}".format(x)
@@ -17,21 +20,45 @@ headers = {"User-Agent": "hederatracker@gmail.com"}
 
 class SEC:
     def __init__(
-        self, ticker: str, form_type: str, save: bool = True, update: bool = False
+        self,
+        ticker: str,
+        form_type: str,
+        save: bool = True,
+        update: bool = False,
+        store=None,
+        retrieval: str = submission_archive.PAGES,
+        edgar: Edgar = None,
     ) -> None:
+        """
+        Args:
+            store (StatementStore): Where processed statements are saved. Defaults to the shared
+                Parquet store under 'Filings/Companies'.
+            retrieval (str): 'pages' requests each R page, 'archive' downloads each filing once.
+            edgar (Edgar): Client to use instead of a new 'Edgar', ex: an 'async_edgar.SyncEdgar'.
+        """
         self.ticker = ticker.upper()
         self.form_type = form_type.upper()
-        if form_type == "10-K":
+        if self.form_type == "10-K":
             self.ten_k = True
             self.file = "A"
-        elif form_type == "10-Q":
+        elif self.form_type == "10-Q":
             self.ten_k = False
             self.file = "Q"
+        else:
+            raise ValueError(f"Unsupported form type {form_type!r}, expected '10-K' or '10-Q'")
 
         self.save = save
         self.update = update
 
-        self.edgar = Edgar(headers, self.save, self.update)
+        self.edgar = (
+            edgar
+            if edgar is not None
+            else Edgar(headers, self.save, self.update, retrieval=retrieval)
+        )
+        self.store = store if store is not None else get_statement_store()
+        # Metrics of the last 'process_all_statements' or 'update_statements', when enabled. Also
+        # logged at INFO level; 'metrics.print_report' prints it.
+        self.metrics_report = None
 
     """
     =====================================================
@@ -39,11 +66,18 @@ class SEC:
     =====================================================
     """
 
+    @property
+    def filing_history(self):
+        return self.edgar.get_filing_history(self.ticker)
+
+    def _latest_accession_number(self):
+        accession_number = self.filing_history.latest(self.form_type)
+        if accession_number is None:
+            raise ValueError(f"{self.ticker} has no {self.form_type} filing")
+        return accession_number.replace("-", "")
+
     def get_filings(self):
-        acc = self.edgar.get_filtered_filings(
-            self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-        )
-        acc_num = acc.iloc[0].replace("-", "")
+        acc_num = self._latest_accession_number()
         filings = self.edgar.get_statement_file_names_in_filing_summary(
             self.ticker, acc_num
         )
@@ -55,66 +89,195 @@ class SEC:
     =====================================================
     """
 
-    def process_all_statements(self):
-        filings_path = f"Filings\\Companies\\{self.ticker.upper()}"
-        if self.form_type.upper() == "10-Q":
-            folder_path = f"{filings_path}\\10-Q"
-            os.makedirs(folder_path, exist_ok=True)
-            ten_k = False
-        elif self.form_type.upper() == "10-K":
-            folder_path = f"{filings_path}\\10-K"
-            os.makedirs(folder_path, exist_ok=True)
-            ten_k = True
+    def process_all_statements(
+        self,
+        depth: int = 11,
+        workers: int = 1,
+        on_accession=None,
+        incremental: bool = False,
+        processes: int = 0,
+    ):
+        """
+        Processes the income statement, balance sheet and cash flow of the latest filings and saves them
+        to 'self.store'.
+
+        Args:
+            depth (int): Number of most recent filings to process.
+            workers (int): Number of filings fetched and parsed concurrently. All workers share the
+                Edgar rate limiter, so this raises throughput without exceeding EDGAR's request limit.
+            on_accession (callable): Called with each accession number once its statements are merged.
+            incremental (bool): When the statements are already stored, only process the filings
+                newer than them and append those. See 'update_statements'.
+            processes (int): When > 0, pages are parsed by that many processes while 'workers'
+                threads download them. See 'parse_pipeline.ParsePipeline'.
+
+        Returns:
+            list: Accession numbers processed.
+        """
+        if incremental:
+            latest = self._stored_latest_period()
+            if latest is not None:
+                return self.update_statements(latest, workers, on_accession, processes)
+        since = metrics.snapshot() if metrics.enabled else None
         acc = self.edgar.get_filtered_filings(
             self.ticker, ten_k=self.ten_k, just_accession_numbers=True
         )
-        index = 0
-        income_statement = pd.DataFrame()
-        balance_sheet = pd.DataFrame()
-        cash_flow = pd.DataFrame()
-        for a in acc:
-            # Format acc number
-            a = a.replace("-", "")
-            income_statement = self.process_statement(
-                income_statement, a, income_statement=True
+        # Format acc numbers
+        accession_numbers = [a.replace("-", "") for a in acc.iloc[:depth]]
+        fetched = self._fetch_statements(accession_numbers, workers, processes)
+
+        accumulators = {kind: self._new_accumulator() for kind in self.statement_kinds}
+        self._merge_statements(accession_numbers, fetched, accumulators, on_accession)
+
+        statements = self._finish_statements(accumulators)
+        # Save statements.
+        with metrics.stage("export"):
+            for kind in self.statement_kinds:
+                self.store.write(self.ticker, self.form_type, kind, statements[kind])
+        self._report_metrics(since)
+        return accession_numbers
+
+    def update_statements(
+        self, latest=None, workers: int = 1, on_accession=None, processes: int = 0
+    ) -> list:
+        """
+        Processes only the filings reported after the stored statements and appends them to the store.
+
+        The submissions JSON is revalidated with a single conditional request. When nothing new was
+        filed no statement is fetched, so an up to date company costs that request and a store read.
+
+        Args:
+            latest (datetime): Latest stored period. Read from the store when None.
+            workers (int): Number of filings fetched and parsed concurrently.
+            on_accession (callable): Called with each accession number once its statements are merged.
+            processes (int): Parsing processes, see 'process_all_statements'.
+
+        Returns:
+            list: Accession numbers processed. Empty when the store was already up to date.
+        """
+        if latest is None:
+            latest = self._stored_latest_period()
+            if latest is None:
+                return self.process_all_statements(
+                    workers=workers, on_accession=on_accession, processes=processes
+                )
+        since = metrics.snapshot() if metrics.enabled else None
+        history = self.filing_history
+        history.refresh()
+        acc = history.accession_numbers_after(self.form_type, latest)
+        if acc.empty:
+            self._report_metrics(since)
+            return []
+        accession_numbers = [a.replace("-", "") for a in acc]
+        fetched = self._fetch_statements(accession_numbers, workers, processes)
+
+        # Stored periods are never taken again, so only the columns new filings add are appended.
+        accumulators = {
+            kind: self._new_accumulator(
+                taken=self.store.periods(self.ticker, self.form_type, kind)
             )
-            balance_sheet = self.process_statement(balance_sheet, a, balance_sheet=True)
-            cash_flow = self.process_statement(cash_flow, a, cash_flow=True)
-
-            if index == 10:
-                break
-            index += 1
-
-        # Reverse dataframes so newest filings are on the right side.
-        income_statement = income_statement[income_statement.columns[::-1]]
-        balance_sheet = balance_sheet[balance_sheet.columns[::-1]]
-        cash_flow = cash_flow[cash_flow.columns[::-1]]
-        # Rename indexes
-        label_dict = self.edgar.get_label_dictionary(self.ticker)
-        income_statement = self.edgar.rename_statement(income_statement, label_dict)
-        balance_sheet = self.edgar.rename_statement(balance_sheet, label_dict)
-        cash_flow = self.edgar.rename_statement(cash_flow, label_dict)
-        # Sort by dates
-        income_statement = self._sort_df_by_date(income_statement)
-        balance_sheet = self._sort_df_by_date(balance_sheet)
-        cash_flow = self._sort_df_by_date(cash_flow)
-        # Export to csv files.
-        income_statement.to_csv(
-            f"{folder_path}\\{self.ticker}_{self.file}_income_statement.csv"
-        )
-        balance_sheet.to_csv(
-            f"{folder_path}\\{self.ticker}_{self.file}_balance_sheet.csv"
-        )
-        cash_flow.to_csv(f"{folder_path}\\{self.ticker}_{self.file}_cash_flow.csv")
+            for kind in self.statement_kinds
+        }
+        self._merge_statements(accession_numbers, fetched, accumulators, on_accession)
+
+        statements = self._finish_statements(accumulators)
+        with metrics.stage("export"):
+            for kind in self.statement_kinds:
+                if not statements[kind].empty:
+                    self.store.append(self.ticker, self.form_type, kind, statements[kind])
+        self._report_metrics(since)
+        return accession_numbers
+
+    def _report_metrics(self, since):
+        if since is None:
+            return
+        self.metrics_report = metrics.report(since)
+        logging.info(format_report(self.metrics_report, f"Metrics {self.ticker} {self.form_type}"))
+
+    def _stored_latest_period(self):
+        """
+        Returns:
+            pd.Timestamp | None: Oldest of the latest stored periods of each statement, None when a
+                statement was never stored.
+        """
+        latest = [
+            self.store.latest_period(self.ticker, self.form_type, kind)
+            for kind in self.statement_kinds
+        ]
+        if any(period is None for period in latest):
+            return None
+        return min(latest)
+
+    def _merge_statements(self, accession_numbers, fetched, accumulators, on_accession=None):
+        # Merge in filing order (newest first) regardless of which fetch finished first.
+        for a in accession_numbers:
+            for kind in self.statement_kinds:
+                with metrics.stage("process_statement"):
+                    accumulators[kind].add(fetched[(a, kind)])
+            if on_accession is not None:
+                on_accession(a)
+
+    def _finish_statements(self, accumulators) -> dict:
+        """
+        Returns:
+            dict: Statement kind -> merged statement with labeled line items and periods oldest first.
+        """
+        statements = {}
+        label_dict = None
+        for kind in self.statement_kinds:
+            with metrics.stage("process_statement"):
+                statement = accumulators[kind].result()
+            if statement.empty:
+                statements[kind] = statement
+                continue
+            # Reverse dataframes so newest filings are on the right side.
+            statement = statement[statement.columns[::-1]]
+            # Rename indexes
+            if label_dict is None:
+                label_dict = self.edgar.get_label_dictionary(self.ticker)
+            statement = self.edgar.rename_statement(statement, label_dict)
+            # Sort by dates
+            statements[kind] = self._sort_df_by_date(statement)
+        return statements
+
+    statement_kinds = ("income_statement", "balance_sheet", "cash_flow")
+
+    def _fetch_statements(
+        self, accession_numbers: list, workers: int = 1, processes: int = 0
+    ) -> dict:
+        """
+        Queries every statement of every accession, concurrently when workers > 1. With processes > 0
+        the pages are parsed in a process pool fed by 'workers' downloading threads.
+
+        Returns:
+            dict: (accession number, statement kind) -> statement DataFrame. Statements that failed
+                to process are empty so they aren't queried again while merging.
+        """
+        tasks = [(a, kind) for a in accession_numbers for kind in self.statement_kinds]
+
+        def query(task):
+            a, kind = task
+            return self._query_statement(a, **{kind: True})
+
+        if processes > 0:
+            with ParsePipeline(self.edgar, io_workers=workers, processes=processes) as pipeline:
+                parsed = pipeline.run(self.ticker, tasks)
+            results = [parsed[task] for task in tasks]
+        elif workers <= 1:
+            results = [query(task) for task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(query, tasks))
+        return {
+            task: result if result is not None else pd.DataFrame()
+            for task, result in zip(tasks, results)
+        }
 
     """--------------- Balance Sheet ---------------"""
 
     def get_balance_sheet(self, acc_num: int = 0):
         if acc_num == 0:
-            acc = self.edgar.get_filtered_filings(
-                self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-            )
-            acc_num = acc.iloc[0].replace("-", "")
+            acc_num = self._latest_accession_number()
 
         statement = self.edgar.process_one_statement(
             self.ticker, acc_num, "balance_sheet"
@@ -125,10 +288,7 @@ class SEC:
 
     def get_income_statement(self, acc_num: int = 0):
         if acc_num == 0:
-            acc = self.edgar.get_filtered_filings(
-                self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-            )
-            acc_num = acc.iloc[0].replace("-", "")
+            acc_num = self._latest_accession_number()
 
         statement = self.edgar.process_one_statement(
             self.ticker, acc_num, "income_statement"
@@ -139,33 +299,23 @@ class SEC:
 
     def get_cash_flow(self, acc_num: int = 0):
         if acc_num == 0:
-            acc = self.edgar.get_filtered_filings(
-                self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-            )
-            acc_num = acc.iloc[0].replace("-", "")
+            acc_num = self._latest_accession_number()
 
-        statement = self.edgar.process_one_statement(
-            self.ticker, acc_num, "income_statement"
-        )
+        # Same key '_fetch_statements' uses, so both paths return the cash flow statement.
+        statement = self.edgar.process_one_statement(self.ticker, acc_num, "cash_flow")
         return statement
 
     """--------------- Revenues ---------------"""
 
     def get_revenues(self, acc_num: int = 0):
         if acc_num == 0:
-            acc = self.edgar.get_filtered_filings(
-                self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-            )
-            acc_num = acc.iloc[0].replace("-", "")
+            acc_num = self._latest_accession_number()
 
         self.edgar.get_revenues_table(self.ticker, acc_num)
 
     def get_segments(self, acc_num: int = 0):
         if acc_num == 0:
-            acc = self.edgar.get_filtered_filings(
-                self.ticker, ten_k=self.ten_k, just_accession_numbers=True
-            )
-            acc_num = acc.iloc[0].replace("-", "")
+            acc_num = self._latest_accession_number()
 
         self.edgar.get_segments_table(self.ticker, acc_num)
 
@@ -178,122 +328,26 @@ class SEC:
         income_statement: bool = False,
         balance_sheet: bool = False,
         cash_flow: bool = False,
+        fetched_statement: pd.DataFrame = None,
     ):
-        if self.ten_k:
-            if statement.empty:
-                statement = self._query_statement(
-                    acc_num, income_statement, balance_sheet, cash_flow
-                )
-                cols = statement.columns
-                statement.columns = [ts.strftime("%Y-%m-%d") for ts in cols]
+        """
+        Merges the statement of 'acc_num' into 'statement'. When 'fetched_statement' is given it is
+        used as the statement of 'acc_num' instead of querying it again.
+
+        To build a history from many filings use a 'StatementAccumulator', which joins them in one pass.
+        """
+        new_statement = self._resolve_statement(
+            fetched_statement, acc_num, income_statement, balance_sheet, cash_flow
+        )
+        with metrics.stage("process_statement"):
+            accumulator = self._new_accumulator()
+            accumulator.add(statement)
+            accumulator.add(new_statement)
+            return accumulator.result()
 
-            else:
-                new_statement = self._query_statement(
-                    acc_num, income_statement, balance_sheet, cash_flow
-                )
-                # Get columns
-                new_cols = new_statement.columns
-                prev_cols = statement.columns
-                # Convert to strings
-                new_cols = [ts.strftime("%Y-%m-%d") for ts in new_cols]
-                try:
-                    prev_cols = [ts.strftime("%Y-%m-%d") for ts in prev_cols]
-                except AttributeError:
-                    pass
-                for c in new_cols:
-                    if c not in prev_cols:
-                        try:
-                            new_statement = new_statement[c].to_frame(name=c)
-                        except AttributeError:
-                            new_statement = new_statement[c]
-                        try:
-                            statement = pd.concat([statement, new_statement], axis=1)
-                        except pd.errors.InvalidIndexError:
-                            # Get indexes in new dataframe that are not present in old.
-                            diff_index = [
-                                item
-                                for item in new_statement.index.to_list()
-                                if item not in statement.index.to_list()
-                            ]
-                            # Fill previous dataframe with "nan" values for indexes that are new.
-                            for p in prev_cols:
-                                for d in diff_index:
-                                    statement.loc[d, p] = np.nan
-
-                            new_indexes = set(new_statement.index.to_list())
-                            new_statement = new_statement.loc[list(new_indexes)]
-                            # Consolidate duplicate rows. Put their sum into a single row.
-                            consolidated_df = new_statement.groupby(
-                                new_statement.index
-                            ).sum()
-                            # Merge dataframe with new indexes.
-                            statement = pd.concat([statement, consolidated_df], axis=1)
-
-        elif not self.ten_k:
-            if statement.empty:
-                statement = self._query_statement(
-                    acc_num, income_statement, balance_sheet, cash_flow
-                )
-                cols = statement.columns
-                statement.columns = [ts.strftime("%Y-%m-%d") for ts in cols]
-
-            else:
-                new_statement = self._query_statement(
-                    acc_num, income_statement, balance_sheet, cash_flow
-                )
-                try:
-                    new_statement.columns = [
-                        ts.strftime("%Y-%m-%d") for ts in new_statement.columns
-                    ]
-                # Typically raises if no new statements are found.
-                except AttributeError:
-                    return statement
-
-                # Get columns
-                new_cols = new_statement.columns
-                prev_cols = statement.columns.to_list()
-
-                try:
-                    prev_cols = [ts.strftime("%Y-%m-%d") for ts in prev_cols]
-                except AttributeError:
-                    pass
-
-                if len(new_cols) > 2:
-                    new_statement = new_statement.iloc[:, :2]
-                    new_cols = new_statement.columns  # Reassign new columns
-
-                for c in new_cols:
-                    if c not in prev_cols:
-                        try:
-                            new_slice = new_statement[c].to_frame(name=c)
-                        except AttributeError:
-                            print(f"Attribute: {new_statement}    [{c}]")
-                            new_slice = new_statement[c]
-                        try:
-                            statement = pd.concat([statement, new_slice], axis=1)
-                        except pd.errors.InvalidIndexError:
-                            # Get indexes in new dataframe that are not present in old.
-                            diff_index = [
-                                item
-                                for item in new_statement.index.to_list()
-                                if item not in statement.index.to_list()
-                            ]
-                            # Fill previous dataframe with "nan" values for indexes that are new.
-                            for p in prev_cols:
-                                for d in diff_index:
-                                    statement.loc[d, p] = np.nan
-
-                            new_indexes = set(new_statement.index.to_list())
-                            new_statement = new_statement.loc[list(new_indexes)]
-                            # Consolidate duplicate rows. Put their sum into a single row.
-                            consolidated_df = new_statement.groupby(
-                                new_statement.index
-                            ).sum()
-                            # Merge dataframe with new indexes.
-                            statement = pd.concat(
-                                [statement, consolidated_df[c]], axis=1
-                            )
-        return statement
+    def _new_accumulator(self, taken=None) -> StatementAccumulator:
+        # 10-Q statements also carry year-to-date columns. Only the first two periods of each are kept.
+        return StatementAccumulator(max_new_columns=None if self.ten_k else 2, taken=taken)
 
     def _sort_df_by_date(self, df: pd.DataFrame):
 
@@ -305,6 +359,18 @@ class SEC:
             exit()
         return df
 
+    def _resolve_statement(
+        self,
+        fetched_statement,
+        acc_num,
+        income_statement: bool = False,
+        balance_sheet: bool = False,
+        cash_flow: bool = False,
+    ):
+        if fetched_statement is not None:
+            return fetched_statement
+        return self._query_statement(acc_num, income_statement, balance_sheet, cash_flow)
+
     def _query_statement(
         self,
         acc_num,
@@ -0,0 +1,194 @@
+import os
+import json
+import logging
+import datetime as dt
+
+from SEC.sec import headers
+from SEC.batch import BatchRunner, job_key
+
+# Periphery
+from SEC.Periphery.cik_resolver import atomic_write
+from SEC.Periphery.edgar import Edgar
+from SEC.Periphery import daily_index
+
+
+default_state_path = os.path.join("Filings", "Watcher", "state.json")
+
+
+def base_form(form_type: str) -> str:
+    """
+    Form type an amendment restates, the form type itself otherwise. Ex: '10-K/A' -> '10-K'
+    """
+    return form_type[:-2] if form_type.endswith("/A") else form_type
+
+
+class FilingWatcher:
+    """
+    Finds the companies that filed from EDGAR's daily indexes and re-scrapes only those.
+
+    Each poll reads one 'master.idx' (or 'form.idx') per day since the last poll, keeps the filings of
+    'form_types', maps their CIKs to tickers through the CIK table and hands the (ticker, form type)
+    jobs to a 'BatchRunner' in incremental mode. The last day read and any failed jobs are kept in a
+    JSON state file, so the next poll starts where this one stopped and retries the failures.
+    """
+
+    def __init__(
+        self,
+        form_types: list = ("10-K", "10-Q"),
+        tickers: list = None,
+        kind: str = daily_index.MASTER,
+        state_path: str = default_state_path,
+        edgar: Edgar = None,
+        workers: int = 4,
+        accession_workers: int = 1,
+        lookback_days: int = 7,
+    ) -> None:
+        """
+        Args:
+            form_types (list): Form types that trigger a job. Amendments ('10-K/A') only when
+                listed, they re-scrape the statements of their base form ('10-K').
+            tickers (list): Only enqueue these tickers. When None, every company in the CIK table is
+                watched and its first ticker is enqueued.
+            kind (str): Daily index read, 'master' or 'form'.
+            state_path (str): JSON file holding the last day read and the jobs still pending.
+            edgar (Edgar): Used to download the indexes and resolve CIKs.
+            workers (int): 'workers' of the BatchRunner.
+            accession_workers (int): 'accession_workers' of the BatchRunner.
+            lookback_days (int): Days read on the first poll, when there is no state yet.
+        """
+        self.form_types = {f.upper() for f in form_types}
+        self.tickers = None if tickers is None else {t.upper() for t in tickers}
+        self.kind = kind
+        self.state_path = state_path
+        self.edgar = edgar if edgar is not None else Edgar(headers)
+        self.workers = workers
+        self.accession_workers = accession_workers
+        self.lookback_days = lookback_days
+        self.state = self._load_state()
+
+    """
+    =====================================================
+    State
+    =====================================================
+    """
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logging.error(f"Unreadable watcher state, starting over: {self.state_path}")
+            return {}
+
+    def _save_state(self):
+        text = json.dumps(self.state, indent=2)
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        atomic_write(self.state_path, write)
+
+    @property
+    def last_date(self):
+        value = self.state.get("last_date")
+        return dt.date.fromisoformat(value) if value else None
+
+    """
+    =====================================================
+    Scan
+    =====================================================
+    """
+
+    def _dates(self, until: dt.date) -> list:
+        start = self.last_date
+        if start is None:
+            start = until - dt.timedelta(days=self.lookback_days)
+        return [
+            start + dt.timedelta(days=i) for i in range(1, (until - start).days + 1)
+        ]
+
+    def _tickers_for(self, cik: str) -> list:
+        tickers = self.edgar.cik_resolver.get_tickers(cik)
+        if self.tickers is None:
+            return tickers[:1]
+        return [t for t in tickers if t in self.tickers]
+
+    def scan(self, until: dt.date = None):
+        """
+        Reads the daily indexes after the last poll up to 'until'.
+
+        Args:
+            until (datetime.date): Last day read. Defaults to yesterday, the latest complete index.
+
+        Returns:
+            tuple: ({(ticker, form type): [accession numbers]}, last day with a published index or None).
+        """
+        if until is None:
+            until = dt.date.today() - dt.timedelta(days=1)
+        jobs = {}
+        last_found = None
+        for date in self._dates(until):
+            entries = self.edgar.get_daily_index(date, self.kind)
+            if not entries:
+                continue
+            last_found = date
+            for entry in entries:
+                if entry.form_type not in self.form_types:
+                    continue
+                for ticker in self._tickers_for(entry.cik):
+                    jobs.setdefault((ticker, base_form(entry.form_type)), []).append(
+                        entry.accession_number
+                    )
+        return jobs, last_found
+
+    """
+    =====================================================
+    Poll
+    =====================================================
+    """
+
+    def poll(self, until: dt.date = None, run: bool = True) -> dict:
+        """
+        Scans the new daily indexes and re-scrapes the companies that filed.
+
+        Args:
+            until (datetime.date): Last day read. Defaults to yesterday.
+            run (bool): Run the jobs. When False the jobs are only returned and the state is kept.
+
+        Returns:
+            dict: 'jobs' found (ticker|form type -> accession numbers), and the BatchRunner 'summary'
+                when the jobs ran.
+        """
+        found, last_found = self.scan(until)
+        jobs = {job_key(t, f): accessions for (t, f), accessions in found.items()}
+        # Jobs that failed on an earlier poll are tried again.
+        for key in self.state.get("pending", []):
+            jobs.setdefault(key, [])
+        result = {"jobs": jobs}
+        if not run:
+            return result
+
+        summary = None
+        if jobs:
+            runner = BatchRunner(
+                [],
+                jobs=[key.split("|", 1) for key in jobs],
+                workers=self.workers,
+                accession_workers=self.accession_workers,
+                incremental=True,
+                checkpoint_path=os.path.join(
+                    os.path.dirname(self.state_path) or ".",
+                    f"checkpoint_{last_found or dt.date.today()}.json",
+                ),
+            )
+            summary = runner.run()
+            self.state["pending"] = summary["failed_jobs"]
+        # Days after the last published index are read again next time, they may not be out yet.
+        if last_found is not None:
+            self.state["last_date"] = last_found.isoformat()
+        self._save_state()
+        result["summary"] = summary
+        return result